@@ -141,7 +141,9 @@ void loop() {
   // Variável para decisão de irrigação
   bool irrigate = false;
 
-  // Lógica de decisão:
+  // Lógica de decisão (a mesma cascata está em src/python/services/irrigation_rules.py,
+  // usada pelo backend, pelos rótulos do modelo de ML e pelo gerador de dados;
+  // alterações nas regras devem ser feitas nos dois lugares):
 
   // 1. Não irrigar se houver previsão de chuva detectada
   if (rain_forecast) {
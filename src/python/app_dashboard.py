@@ -3,7 +3,9 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime
+from datetime import date, datetime, time, timedelta
+import os
+import tempfile
 
 from services.climate_service import ClimateService
 from services.component_service import ComponentService
@@ -12,18 +14,200 @@ from services.application_service import ApplicationService
 from services.crops_service import CropService
 from services.producer_service import ProducerService
 from services.ml_service import MLService
-
-from database.oracle import get_session
-
-session = get_session()
-
-application_service = ApplicationService(session)
-component_service = ComponentService(session)
-crop_service = CropService(session)
-producer_service = ProducerService(session)
-sensor_service = SensorRecordService(session)
-climate_service = ClimateService(session)
-ml_service = MLService(session)
+from services.irrigation_service import IrrigationDecisionService
+from services.asof_join import asof_join, DEFAULT_TOLERANCE
+from services.exporter import COMPRESSIONS, EXPORT_FORMATS, export_file_name
+from services.state_cache import data_versions
+from database.repositories.time_buckets import choose_bucket
+
+from database import IrrigationDecisionRepository, open_session, session_scope
+
+# Validade (s) das consultas em cache: escritas feitas por este processo invalidam
+# o cache na hora (data_versions); as de outros processos aparecem após o TTL
+CACHE_TTL = int(os.getenv("DASHBOARD_CACHE_TTL", "30"))
+# Acima deste número de leituras no período, os gráficos usam a série agregada por bucket
+MAX_PLOT_POINTS = int(os.getenv("DASHBOARD_MAX_POINTS", "5000"))
+# Período inicial dos filtros: os últimos N dias até a leitura mais recente
+DEFAULT_WINDOW_DAYS = int(os.getenv("DASHBOARD_WINDOW_DAYS", "7"))
+# Registros oferecidos para edição: os N mais recentes dentro dos filtros
+MAX_EDIT_OPTIONS = int(os.getenv("DASHBOARD_MAX_EDIT_OPTIONS", "500"))
+
+
+def user_services() -> dict:
+    """
+    Serviços do usuário: cada sessão do navegador tem sua própria sessão do
+    banco, criada na primeira execução e guardada em st.session_state.
+    """
+    if "services" not in st.session_state:
+        session = open_session()
+        ml = MLService(session)
+        st.session_state["db_session"] = session
+        st.session_state["services"] = {
+            "application": ApplicationService(session),
+            "component": ComponentService(session),
+            "crop": CropService(session),
+            "producer": ProducerService(session),
+            "sensor": SensorRecordService(session),
+            "climate": ClimateService(session),
+            "ml": ml,
+            "irrigation": IrrigationDecisionService(session, ml),
+        }
+    return st.session_state["services"]
+
+
+services = user_services()
+application_service = services["application"]
+component_service = services["component"]
+crop_service = services["crop"]
+producer_service = services["producer"]
+sensor_service = services["sensor"]
+climate_service = services["climate"]
+ml_service = services["ml"]
+irrigation_service = services["irrigation"]
+
+
+# Consultas compartilhadas entre os usuários. A versão da tabela faz parte da
+# chave do cache: uma escrita pelos serviços gera uma nova versão e a próxima
+# execução consulta o banco de novo, com uma sessão de vida curta.
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def load_sensor_frame(version: int, start_date=None, end_date=None, sensor_id=None) -> pd.DataFrame:
+    with session_scope() as session:
+        return SensorRecordService(session).get_sensor_records_frame(
+            sensor_id=sensor_id, start_date=start_date, end_date=end_date)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def load_sensor_count(version: int, start_date=None, end_date=None, sensor_id=None) -> int:
+    with session_scope() as session:
+        return SensorRecordService(session).count_sensor_records(sensor_id, start_date, end_date)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def load_sensor_series(version: int, bucket: str, start_date=None, end_date=None, sensor_id=None) -> list:
+    with session_scope() as session:
+        return SensorRecordService(session).get_sensor_series(bucket, sensor_id, start_date, end_date)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def load_climate_frame(version: int, start_date=None, end_date=None) -> pd.DataFrame:
+    with session_scope() as session:
+        return ClimateService(session).get_climate_data_frame(start_date=start_date, end_date=end_date)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def load_climate_count(version: int, start_date=None, end_date=None) -> int:
+    with session_scope() as session:
+        return ClimateService(session).count_climate_data(start_date, end_date)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def load_climate_series(version: int, bucket: str, start_date=None, end_date=None) -> list:
+    with session_scope() as session:
+        return ClimateService(session).get_climate_series(bucket, start_date, end_date)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def load_crops(version: int) -> list:
+    with session_scope() as session:
+        return CropService(session).list_crops()
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def load_components(version: int) -> list:
+    with session_scope() as session:
+        return ComponentService(session).list_components()
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def load_latest_decisions(version: int) -> pd.DataFrame:
+    with session_scope() as session:
+        return IrrigationDecisionRepository(session).get_latest_frame()
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def load_sensor_record_ids(version: int, start_date=None, end_date=None, sensor_id=None) -> list:
+    with session_scope() as session:
+        return SensorRecordService(session).list_recent_ids(sensor_id, start_date, end_date, MAX_EDIT_OPTIONS)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def load_climate_ids(version: int, start_date=None, end_date=None) -> list:
+    with session_scope() as session:
+        return ClimateService(session).list_recent_ids(start_date, end_date, MAX_EDIT_OPTIONS)
+
+
+def sidebar_filters(with_sensors: bool = False) -> dict:
+    """
+    Período, cultura e sensor escolhidos na barra lateral. Os filtros são
+    repassados às consultas (WHERE no banco, poda de partições no Parquet):
+    só o que será exibido é lido.
+    """
+    st.sidebar.subheader("🔎 Filtros")
+    latest = sensor_service.get_latest_record() if with_sensors else climate_service.get_latest_climate_data()
+    last_day = latest["timestamp"].date() if latest else date.today()
+    period = st.sidebar.date_input(
+        "Período",
+        value=(last_day - timedelta(days=DEFAULT_WINDOW_DAYS), last_day),
+        key="filter_period"
+    )
+    # Enquanto só a data inicial foi escolhida, o período é de um dia
+    period = period if isinstance(period, (list, tuple)) else (period,)
+    filters = {
+        "start_date": datetime.combine(period[0], time.min),
+        "end_date": datetime.combine(period[-1], time.max),
+    }
+    if not with_sensors:
+        return filters
+
+    crops = {crop["id"]: crop["name"] for crop in load_crops(data_versions.get('crops'))}
+    crop_id = st.sidebar.selectbox("Cultura", [None] + list(crops), key="filter_crop",
+                                   format_func=lambda value: crops.get(value, "Todas"))
+    sensors = {
+        component["id"]: component["name"]
+        for component in load_components(data_versions.get('components'))
+        if component["type"] == "Sensor" and (crop_id is None or component["crop_id"] == crop_id)
+    }
+    sensor_id = st.sidebar.selectbox("Sensor", [None] + list(sensors), key="filter_sensor",
+                                     format_func=lambda value: sensors.get(value, "Todos"))
+    if sensor_id is not None:
+        filters["sensor_id"] = sensor_id
+    elif crop_id is not None:
+        filters["sensor_id"] = tuple(sensors)
+    return filters
+
+
+def bucketed_frame(series: list, metrics: list) -> pd.DataFrame:
+    """Série agregada no formato dos gráficos: timestamp e a média de cada métrica."""
+    df = pd.DataFrame(series)
+    return df.rename(columns={"bucket": "timestamp", **{f"{name}_avg": name for name in metrics}})
+
+
+def export_controls(key: str, export, base_name: str):
+    """
+    Exportação em streaming: o arquivo é gravado em disco bloco a bloco e
+    só então entregue ao botão de download (sem montar o CSV em memória).
+    """
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        fmt = st.selectbox("Formato", list(EXPORT_FORMATS), key=f"{key}_format")
+    with col2:
+        compression = st.selectbox("Compressão", COMPRESSIONS[fmt], key=f"{key}_compression",
+                                   format_func=lambda value: value or "nenhuma")
+    with col3:
+        st.write("")
+        prepare = st.button("📦 Preparar exportação", key=f"{key}_prepare")
+    if prepare:
+        export_file = tempfile.TemporaryFile()
+        with st.spinner("Exportando..."):
+            rows = export(export_file, fmt, compression)
+        export_file.seek(0)
+        st.download_button(
+            label=f"⬇️ Baixar {rows} registros",
+            data=export_file,
+            file_name=export_file_name(base_name, fmt, compression),
+            mime=EXPORT_FORMATS[fmt][0],
+            key=f"{key}_download"
+        )
 
 
 # from weasyprint import HTML
@@ -66,14 +250,12 @@ if aba == "🏠 Visão Geral":
     with col4:
         st.info("🌡️ Monitoramento Climático")
     
-    # Dados atuais dos sensores
-    sensor_df = pd.DataFrame(sensor_service.list_sensor_records())
+    # Última leitura dos sensores (cache de estado, sem carregar o histórico)
+    latest = sensor_service.get_latest_record()
     
-    if sensor_df.empty:
+    if latest is None:
         st.info("Nenhum dado de sensor disponível para mostrar a situação atual da safra.")
     else:
-        sensor_df["timestamp"] = pd.to_datetime(sensor_df["timestamp"])
-        latest = sensor_df.sort_values("timestamp", ascending=False).iloc[0]
         
         st.subheader("🌱 Estado Atual da Safra")
         
@@ -126,10 +308,8 @@ if aba == "🏠 Visão Geral":
             st.subheader("🤖 Predição de Irrigação - IA")
             
             # Buscar dados climáticos mais recentes
-            climate_df = pd.DataFrame(climate_service.list_climate_data())
-            if not climate_df.empty:
-                climate_df["timestamp"] = pd.to_datetime(climate_df["timestamp"])
-                latest_climate = climate_df.sort_values("timestamp", ascending=False).iloc[0]
+            latest_climate = climate_service.get_latest_climate_data()
+            if latest_climate is not None:
                 
                 prediction = ml_service.predict_irrigation(
                     soil_moisture=latest['soil_moisture'],
@@ -170,6 +350,8 @@ elif aba == "🤖 Machine Learning":
         if model_status["model_loaded"]:
             st.success("✅ Modelo carregado e pronto para uso")
             st.info(f"📁 Modelo salvo em: {model_status['model_path']}")
+            if model_status["watermark"]:
+                st.info(f"🕐 Dados de treino até: {model_status['watermark']}")
         else:
             st.warning("⚠️ Modelo não treinado")
             st.info("Treine o modelo com dados históricos para ativar predições")
@@ -178,10 +360,7 @@ elif aba == "🤖 Machine Learning":
         st.subheader("🎯 Treinar Modelo")
         if st.button("🚀 Treinar Modelo com Dados Históricos"):
             with st.spinner("Treinando modelo..."):
-                sensor_data = sensor_service.list_sensor_records()
-                climate_data = climate_service.list_climate_data()
-                
-                result = ml_service.train_model(sensor_data, climate_data)
+                result = ml_service.train_from_store()
                 
                 if result["success"]:
                     st.success("✅ Modelo treinado com sucesso!")
@@ -193,6 +372,18 @@ elif aba == "🤖 Machine Learning":
                         st.text(result['classification_report'])
                 else:
                     st.error(f"❌ Erro no treinamento: {result['message']}")
+        
+        if model_status["model_loaded"] and st.button("🔁 Atualizar Modelo com Dados Novos"):
+            with st.spinner("Atualizando modelo..."):
+                result = ml_service.train_incremental()
+                
+                if result["success"]:
+                    st.success("✅ Modelo atualizado com sucesso!")
+                    st.metric("Amostras Novas", result['new_samples'])
+                    st.metric("Acurácia antes da atualização", f"{result['accuracy_before_update']:.1%}")
+                    st.metric("Árvores no Modelo", result['n_estimators'])
+                else:
+                    st.warning(f"⚠️ {result['message']}")
     
     # Feature Importance
     if model_status["model_loaded"]:
@@ -211,6 +402,32 @@ elif aba == "🤖 Machine Learning":
             fig.update_layout(height=400)
             st.plotly_chart(fig, use_container_width=True)
     
+    # Decisão atual de todos os sensores (uma rodada: consulta de janela + predict_batch)
+    st.subheader("🛰️ Decisões da Frota")
+    if st.button("💧 Avaliar Todos os Sensores"):
+        with st.spinner("Calculando decisões..."):
+            stats = irrigation_service.score_fleet()
+        origin = "modelo de IA" if stats["source"] == "ml" else "regras do ESP32"
+        st.success(f"✅ {stats['sensors']} sensores avaliados em {stats['total_seconds']:.2f}s ({origin})")
+
+    decisions = load_latest_decisions(data_versions.get('irrigation_decisions'))
+    if decisions.empty:
+        st.info("Nenhuma decisão calculada ainda.")
+    else:
+        names = {component["id"]: component["name"]
+                 for component in load_components(data_versions.get('components'))}
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Sensores", len(decisions))
+        col2.metric("A Irrigar", int(decisions["should_irrigate"].sum()))
+        col3.metric("Última Rodada", decisions["decided_at"].max().strftime("%d/%m/%Y %H:%M"))
+        st.dataframe(
+            decisions.assign(sensor=decisions["sensor_id"].map(names))[
+                ["sensor", "should_irrigate", "irrigation_probability", "confidence", "source",
+                 "reading_timestamp", "decided_at"]
+            ].sort_values("irrigation_probability", ascending=False),
+            use_container_width=True
+        )
+
     # Simulador de Predição
     st.subheader("🎮 Simulador de Predição")
     st.markdown("Teste diferentes cenários para ver a predição do modelo:")
@@ -259,12 +476,22 @@ elif aba == "🤖 Machine Learning":
 # ---------------------- CLIMATE DATA -------------------------
 elif aba == "🌤️ Dados Climáticos":
     st.title("🌤️ Dados Climáticos")
-    df = pd.DataFrame(climate_service.list_climate_data())
+    filters = sidebar_filters()
+    version = data_versions.get('climate_data')
+    total = load_climate_count(version, **filters)
+    bucketed = total > MAX_PLOT_POINTS
+    if bucketed:
+        bucket = choose_bucket(filters["start_date"], filters["end_date"], MAX_PLOT_POINTS)
+        df = bucketed_frame(load_climate_series(version, bucket, **filters), ["temperature", "air_humidity"])
+    else:
+        df = load_climate_frame(version, **filters)
 
     if df.empty:
-        st.info("Nenhum dado climático disponível.")
+        st.info("Nenhum dado climático no período selecionado.")
     else:
         df["timestamp"] = pd.to_datetime(df["timestamp"])
+        if bucketed:
+            st.info(f"📉 {total} registros no período: exibindo as médias por bucket de {bucket}.")
         st.dataframe(df, use_container_width=True)
 
         st.subheader("📊 Visualização de tendências climáticas")
@@ -289,16 +516,14 @@ elif aba == "🌤️ Dados Climáticos":
         # Gráfico de dispersão
         fig_scatter = px.scatter(df, x="temperature", y="air_humidity", 
                                title="Correlação entre temperatura e umidade",
-                               color="rain_forecast")
+                               color=None if bucketed else "rain_forecast")
         st.plotly_chart(fig_scatter, use_container_width=True)
 
-        csv = df.to_csv(index=False).encode('utf-8')
-        st.download_button(
-            label="⬇️ Exportar como CSV",
-            data=csv,
-            file_name='climate_data.csv',
-            mime='text/csv'
-        )
+        st.subheader("⬇️ Exportar dados")
+        export_controls("climate_export",
+                        lambda file, fmt, compression: climate_service.export_climate_data(
+                            file, fmt, compression, **filters),
+                        "climate_data")
 
         # CRUD operations
         with st.expander("➕ Novo Registro Climático"):
@@ -321,7 +546,7 @@ elif aba == "🌤️ Dados Climáticos":
                 st.rerun()
 
         with st.expander("✏️ Editar ou remover registro climático"):
-            ids = [r["id"] for r in climate_service.list_climate_data()]
+            ids = load_climate_ids(data_versions.get('climate_data'), **filters)
             selected_id = st.selectbox("Selecione o registro:", ids)
             if selected_id:
                 registro = climate_service.get_climate_data(selected_id)
@@ -340,12 +565,22 @@ elif aba == "🌤️ Dados Climáticos":
 # ---------------------- SENSOR RECORDS -------------------------
 elif aba == "🧪 Registros de Sensores":
     st.title("🧪 Registros dos Sensores")
-    df = pd.DataFrame(sensor_service.list_sensor_records())
+    filters = sidebar_filters(with_sensors=True)
+    version = data_versions.get('sensor_records')
+    total = load_sensor_count(version, **filters)
+    bucketed = total > MAX_PLOT_POINTS
+    if bucketed:
+        bucket = choose_bucket(filters["start_date"], filters["end_date"], MAX_PLOT_POINTS)
+        df = bucketed_frame(load_sensor_series(version, bucket, **filters), ["soil_moisture", "soil_ph"])
+    else:
+        df = load_sensor_frame(version, **filters)
 
     if df.empty:
-        st.info("Nenhum registro de sensor disponível.")
+        st.info("Nenhum registro de sensor no período selecionado.")
     else:
         df["timestamp"] = pd.to_datetime(df["timestamp"])
+        if bucketed:
+            st.info(f"📉 {total} leituras no período: exibindo as médias por sensor e bucket de {bucket}.")
         st.dataframe(df, use_container_width=True)
 
         # Gráficos interativos
@@ -354,56 +589,59 @@ elif aba == "🧪 Registros de Sensores":
         with col1:
             fig_moisture = px.line(df, x="timestamp", y="soil_moisture", 
                                  title="Umidade do Solo ao longo do tempo",
-                                 markers=True)
+                                 color="sensor_id",
+                                 markers=not bucketed)
             fig_moisture.update_layout(height=400)
             st.plotly_chart(fig_moisture, use_container_width=True)
         
         with col2:
             fig_ph = px.line(df, x="timestamp", y="soil_ph", 
                            title="pH do Solo ao longo do tempo",
-                           markers=True)
+                           color="sensor_id",
+                           markers=not bucketed)
             fig_ph.update_layout(height=400)
             st.plotly_chart(fig_ph, use_container_width=True)
 
         with st.expander("📊 Visualização de Nutrientes e Irrigação"):
-            # Gráfico de nutrientes
-            df['phosphorus_present'] = df['phosphorus_present'].astype(bool)
-            df['potassium_present'] = df['potassium_present'].astype(bool)
+            if bucketed:
+                st.info("Reduza o período ou escolha um sensor para ver as leituras individuais.")
+            else:
+                # Gráfico de nutrientes
+                df['phosphorus_present'] = df['phosphorus_present'].astype(bool)
+                df['potassium_present'] = df['potassium_present'].astype(bool)
             
-            nutrient_data = []
-            for _, row in df.iterrows():
-                nutrient_data.append({
-                    'timestamp': row['timestamp'],
-                    'nutrient': 'Fósforo',
-                    'present': row['phosphorus_present']
-                })
-                nutrient_data.append({
-                    'timestamp': row['timestamp'],
-                    'nutrient': 'Potássio',
-                    'present': row['potassium_present']
-                })
+                nutrient_data = []
+                for _, row in df.iterrows():
+                    nutrient_data.append({
+                        'timestamp': row['timestamp'],
+                        'nutrient': 'Fósforo',
+                        'present': row['phosphorus_present']
+                    })
+                    nutrient_data.append({
+                        'timestamp': row['timestamp'],
+                        'nutrient': 'Potássio',
+                        'present': row['potassium_present']
+                    })
             
-            nutrient_df = pd.DataFrame(nutrient_data)
-            fig_nutrients = px.scatter(nutrient_df, x="timestamp", y="nutrient", 
-                                     color="present", title="Presença de Nutrientes")
-            st.plotly_chart(fig_nutrients, use_container_width=True)
-
-            # Gráfico de status de irrigação
-            df_sorted = df.sort_values(by="timestamp")
-            df_sorted['status_numeric'] = df_sorted['irrigation_status'].apply(lambda x: 1 if x == "ATIVADA" else 0)
+                nutrient_df = pd.DataFrame(nutrient_data)
+                fig_nutrients = px.scatter(nutrient_df, x="timestamp", y="nutrient", 
+                                         color="present", title="Presença de Nutrientes")
+                st.plotly_chart(fig_nutrients, use_container_width=True)
+
+                # Gráfico de status de irrigação
+                df_sorted = df.sort_values(by="timestamp")
+                df_sorted['status_numeric'] = df_sorted['irrigation_status'].apply(lambda x: 1 if x == "ATIVADA" else 0)
             
-            fig_irrigation = px.line(df_sorted, x="timestamp", y="status_numeric", 
-                                   title="Status de Irrigação ao longo do tempo")
-            fig_irrigation.update_layout(height=400)
-            st.plotly_chart(fig_irrigation, use_container_width=True)
+                fig_irrigation = px.line(df_sorted, x="timestamp", y="status_numeric", 
+                                       title="Status de Irrigação ao longo do tempo")
+                fig_irrigation.update_layout(height=400)
+                st.plotly_chart(fig_irrigation, use_container_width=True)
 
-        csv = df.to_csv(index=False).encode('utf-8')
-        st.download_button(
-            label="⬇️ Exportar como CSV",
-            data=csv,
-            file_name='sensor_data.csv',
-            mime='text/csv'
-        )
+        st.subheader("⬇️ Exportar dados")
+        export_controls("sensor_export",
+                        lambda file, fmt, compression: sensor_service.export_sensor_records(
+                            file, fmt, compression, **filters),
+                        "sensor_data")
 
         # CRUD operations
         with st.expander("➕ Novo Registro de Sensor"):
@@ -432,7 +670,7 @@ elif aba == "🧪 Registros de Sensores":
                 st.rerun()
 
         with st.expander("✏️ Editar ou remover registro de sensor"):
-            ids = [r["id"] for r in sensor_service.list_sensor_records()]
+            ids = load_sensor_record_ids(data_versions.get('sensor_records'), **filters)
             selected_id = st.selectbox("Selecione o registro:", ids)
             if selected_id:
                 registro = sensor_service.get_sensor_record(selected_id)
@@ -463,22 +701,16 @@ elif aba == "📊 Análises Avançadas":
     st.title("📊 Análises Avançadas e Insights")
     st.markdown("**Análises preditivas e correlações entre variáveis**")
     
-    # Carregar dados
-    sensor_df = pd.DataFrame(sensor_service.list_sensor_records())
-    climate_df = pd.DataFrame(climate_service.list_climate_data())
+    # Carregar dados do período filtrado (o clima começa uma tolerância antes, para o as-of join)
+    filters = sidebar_filters(with_sensors=True)
+    sensor_df = load_sensor_frame(data_versions.get('sensor_records'), **filters)
+    climate_df = load_climate_frame(data_versions.get('climate_data'),
+                                    filters["start_date"] - pd.Timedelta(DEFAULT_TOLERANCE).to_pytimedelta(),
+                                    filters["end_date"])
     
     if not sensor_df.empty and not climate_df.empty:
-        sensor_df["timestamp"] = pd.to_datetime(sensor_df["timestamp"])
-        climate_df["timestamp"] = pd.to_datetime(climate_df["timestamp"])
-        
-        # Mesclar dados
-        sensor_df['timestamp_hour'] = sensor_df['timestamp'].dt.floor('H')
-        climate_df['timestamp_hour'] = climate_df['timestamp'].dt.floor('H')
-        
-        merged_df = pd.merge(sensor_df, climate_df, 
-                           left_on='timestamp_hour', 
-                           right_on='timestamp_hour', 
-                           how='inner', suffixes=('_sensor', '_climate'))
+        # Mesclar dados: cada leitura com o clima mais recente dentro de 1 hora
+        merged_df = asof_join(sensor_df, climate_df, tolerance=DEFAULT_TOLERANCE, direction='backward')
         
         if not merged_df.empty:
             st.subheader("🔍 Correlações entre Variáveis")
@@ -537,7 +769,7 @@ elif aba == "📊 Análises Avançadas":
 # ---------------------- COMPONENTES -------------------------
 elif aba == "⚙️ Componentes":
     st.title("⚙️ Gerenciamento de Componentes")
-    df = pd.DataFrame(component_service.list_components())
+    df = pd.DataFrame(load_components(data_versions.get('components')))
 
     if df.empty:
         st.info("Nenhum componente cadastrado.")
@@ -566,7 +798,7 @@ elif aba == "⚙️ Componentes":
                 st.rerun()
 
         with st.expander("✏️ Editar ou remover componente"):
-            ids = [r["id"] for r in component_service.list_components()]
+            ids = [r["id"] for r in load_components(data_versions.get('components'))]
             selected_id = st.selectbox("Selecione o componente:", ids)
             if selected_id:
                 registro = component_service.get_component(selected_id)
@@ -589,4 +821,8 @@ elif aba == "⚙️ Componentes":
                 if st.button("Deletar"):
                     component_service.delete_component(selected_id)
                     st.success("Removido com sucesso!")
-                    st.rerun()
\ No newline at end of file
+                    st.rerun()
+
+# Fim da execução: devolve ao pool a conexão da sessão do usuário (a sessão
+# continua utilizável e abre outra transação na próxima interação)
+st.session_state["db_session"].close()
@@ -0,0 +1,6 @@
+"""
+Benchmarks de desempenho do sistema de monitoramento agrícola.
+
+Execute a partir de src/python, por exemplo:
+    python -m benchmarks.bench_sensor_ingestion --rows 5000
+"""
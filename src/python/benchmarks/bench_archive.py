@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark da camada de arquivo: leitura das colunas de treino do histórico
+via ORM (list_sensor_records + DataFrame) versus read_frame depois de
+arquivar as leituras antigas em Parquet.
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from database.archive import archive_older_than
+from database.models import SensorRecord
+from database.oracle import get_session
+from database.repositories import ComponentRepository, SensorRecordRepository
+from services.ml_service import SENSOR_COLUMNS
+from services.sensor_service import SensorRecordService
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def run(rows: int, sensors: int, hot_days: int):
+    session = get_session()
+    component_repo = ComponentRepository(session)
+    repo = SensorRecordRepository(session)
+    sensor_ids = [component_repo.create(name=f"Sensor Benchmark {i}", type="Sensor").id for i in range(sensors)]
+    end_date = datetime.now()
+    step = timedelta(days=365) / rows
+    archive_dir = tempfile.mkdtemp(prefix="archive-")
+
+    try:
+        repo.bulk_create(
+            {
+                "sensor_id": sensor_ids[i % sensors],
+                "timestamp": end_date - step * i,
+                "soil_moisture": 20 + (i % 600) / 10,
+                "phosphorus_present": i % 3 != 0,
+                "potassium_present": i % 5 != 0,
+                "soil_ph": 5 + (i % 30) / 10,
+            } for i in range(rows)
+        )
+        session.expunge_all()
+        columns = ['timestamp'] + SENSOR_COLUMNS
+
+        orm, orm_time = timed(lambda: pd.DataFrame(SensorRecordService(session).list_sensor_records())[columns])
+        session.expunge_all()
+        archived, archive_time = timed(lambda: archive_older_than(
+            session, SensorRecord, end_date - timedelta(days=hot_days), archive_dir))
+        tiered, tiered_time = timed(lambda: repo.read_frame(columns, archive_dir=archive_dir))
+        assert len(tiered) == len(orm) == rows
+
+        print(f"📊 {rows:,} leituras, {sensors} sensores, {archived:,} arquivadas (> {hot_days} dias)")
+        print(f"🐢 ORM + DataFrame:        {orm_time:.2f}s")
+        print(f"📦 Arquivamento (uma vez): {archive_time:.2f}s")
+        print(f"🚀 read_frame (banco + Parquet): {tiered_time:.2f}s ({orm_time / tiered_time:.1f}x)")
+    finally:
+        for sensor_id in sensor_ids:
+            component_repo.delete(sensor_id)
+        shutil.rmtree(archive_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--sensors", type=int, default=20)
+    parser.add_argument("--hot-days", type=int, default=30)
+    args = parser.parse_args()
+    run(args.rows, args.sensors, args.hot_days)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark do modelo compilado (services/compiled_forest.py) contra o
+MLService: tempo de inicialização de um processo novo (imports e carga do
+modelo), latência de uma leitura, vazão em lote e concordância das predições.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.bench_ml_inference import make_samples, make_training_data
+from services.compiled_forest import CompiledForest
+from services.ml_service import MLService
+
+STARTUP_SCRIPTS = {
+    "scikit-learn (pickle)": "from services.ml_service import MLService; MLService(None, model_dir={model_dir!r})",
+    "compilado (.npz)": "from services.compiled_forest import load_compiled; load_compiled({compiled!r})",
+}
+
+
+def measure_startup(script: str, repeat: int) -> float:
+    """Menor tempo (s) de um processo Python que só importa e carrega o modelo."""
+    cwd = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-W", "ignore", "-c", script], cwd=cwd, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def latency(predict, sample: np.ndarray, calls: int) -> float:
+    """Latência média (µs) de uma predição de uma leitura."""
+    start = time.perf_counter()
+    for _ in range(calls):
+        predict(sample)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def run(sizes, calls: int, training_rows: int, repeat: int):
+    with tempfile.TemporaryDirectory() as model_dir:
+        service = MLService(None, model_dir=model_dir)
+        sensors, climate = make_training_data(training_rows)
+        service.train_model(sensors, climate)
+        exported = service.export_compiled()
+        forest = CompiledForest.load(exported["path"])
+        pickled = os.path.getsize(service.model_path) + os.path.getsize(service.scaler_path)
+        print(f"\n📦 {exported['trees']} árvores, {exported['nodes']:,} nós | "
+              f".npz {exported['bytes'] / 1024:.0f} KiB, pickles {pickled / 1024:.0f} KiB")
+
+        print("\n🚀 Inicialização (processo novo: imports + carga do modelo)")
+        for name, script in STARTUP_SCRIPTS.items():
+            seconds = measure_startup(script.format(model_dir=model_dir, compiled=exported["path"]), repeat)
+            print(f"  {name:<22} {seconds * 1000:>8.0f} ms")
+
+        print("\n⏱️  Latência de uma leitura")
+        sample = make_samples(1)
+        for name, predict in (("scikit-learn", service.predict_batch), ("compilado", forest.predict_batch)):
+            print(f"  {name:<22} {latency(predict, sample, calls):>8.0f} µs")
+
+        print("\n⚡ Lote")
+        print(f"{'amostras':>10} | {'sklearn (s)':>11} | {'compilado (s)':>13} | {'concordância':>12}")
+        for rows in sizes:
+            samples = make_samples(rows)
+            start = time.perf_counter()
+            expected = service.predict_batch(samples)
+            reference = time.perf_counter() - start
+
+            start = time.perf_counter()
+            compiled = forest.predict_batch(samples)
+            elapsed = time.perf_counter() - start
+
+            agreement = np.mean(compiled["should_irrigate"] == expected["should_irrigate"])
+            assert np.allclose(compiled["irrigation_probability"], expected["irrigation_probability"])
+            print(f"{rows:>10,} | {reference:>11.4f} | {elapsed:>13.4f} | {agreement:>11.2%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--calls", type=int, default=1_000, help="predições na medida de latência")
+    parser.add_argument("--training-rows", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=3, help="processos na medida de inicialização")
+    args = parser.parse_args()
+    run(args.sizes, args.calls, args.training_rows, args.repeat)
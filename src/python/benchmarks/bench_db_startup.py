@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark de conexão: tempo de importação do pacote `database` e latência
+por unidade de trabalho (abrir sessão, consultar, fechar) com a estratégia
+antiga (pool_pre_ping + SELECT 1 FROM DUAL a cada sessão) versus a atual
+(sem ping por sessão).
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+from sqlalchemy import create_engine, func, literal, select
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+from database.models import Component
+from database.oracle import ENGINE_CONFIG, get_database_url
+
+
+def import_time(repeat: int) -> float:
+    code = "import time; t = time.perf_counter(); import database; print(time.perf_counter() - t)"
+    samples = [float(subprocess.check_output([sys.executable, "-c", code], text=True)) for _ in range(repeat)]
+    return statistics.median(samples)
+
+
+def unit_of_work_latency(url: str, requests: int, pre_ping: bool, ping_per_session: bool) -> list:
+    engine = create_engine(url, **{**ENGINE_CONFIG, "pool_pre_ping": pre_ping, "echo": False})
+    Session = scoped_session(sessionmaker(bind=engine))
+    latencies = []
+    try:
+        for _ in range(requests):
+            start = time.perf_counter()
+            session = Session()
+            if ping_per_session:
+                session.execute(select(literal(1)))
+            session.execute(select(func.count()).select_from(Component)).scalar()
+            Session.remove()
+            latencies.append((time.perf_counter() - start) * 1000)
+    finally:
+        engine.dispose()
+    return latencies
+
+
+def run(requests: int, repeat: int, url: str):
+    print(f"📦 import database: {import_time(repeat) * 1000:.1f} ms (mediana de {repeat})")
+
+    strategies = [
+        ("antiga (pre_ping + SELECT 1)", True, True),
+        ("somente pool_pre_ping", True, False),
+        ("atual (sem ping por sessão)", False, False),
+    ]
+    print(f"\n⏱️  Latência por unidade de trabalho ({requests} requisições)")
+    print(f"{'estratégia':>30} | {'p50 (ms)':>9} | {'p95 (ms)':>9}")
+    for name, pre_ping, ping_per_session in strategies:
+        latencies = sorted(unit_of_work_latency(url, requests, pre_ping, ping_per_session))
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        print(f"{name:>30} | {statistics.median(latencies):>9.3f} | {p95:>9.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--url", default=None, help="URL do banco (padrão: variáveis ORACLE_*)")
+    args = parser.parse_args()
+    run(args.requests, args.repeat, args.url or get_database_url())
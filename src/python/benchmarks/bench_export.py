@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark da exportação de leituras: o caminho anterior do dashboard
+(DataFrame completo + df.to_csv em memória) versus a exportação em
+streaming do SensorRecordService para CSV, Parquet e Arrow IPC, com e sem
+compressão. Mede tempo, pico de memória do Python (tracemalloc; buffers
+internos do pyarrow não entram na conta) e tamanho do arquivo gerado.
+"""
+
+import argparse
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from database.oracle import get_session
+from database.repositories import ComponentRepository, SensorRecordRepository
+from services.sensor_service import SensorRecordService
+
+
+def measure(fn):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+def run(rows: int, chunk_size: int):
+    session = get_session()
+    component_repo = ComponentRepository(session)
+    repo = SensorRecordRepository(session)
+    service = SensorRecordService(session)
+    sensor_id = component_repo.create(name="Sensor Benchmark", type="Sensor").id
+    start_date = datetime(2022, 1, 1)
+    workdir = tempfile.mkdtemp(prefix="bench_export_")
+
+    try:
+        repo.bulk_create(
+            ({
+                "sensor_id": sensor_id,
+                "timestamp": start_date + timedelta(seconds=10 * i),
+                "soil_moisture": 20 + (i % 600) / 10,
+                "phosphorus_present": i % 3 != 0,
+                "potassium_present": i % 5 != 0,
+                "soil_ph": 5 + (i % 30) / 10,
+            } for i in range(rows)),
+            batch_size=10000
+        )
+
+        def in_memory(path):
+            csv = service.get_sensor_records_frame().to_csv(index=False).encode('utf-8')
+            with open(path, 'wb') as file:
+                file.write(csv)
+
+        def streaming(fmt, compression):
+            return lambda path: service.export_sensor_records(path, fmt, compression, chunk_size=chunk_size)
+
+        paths = [
+            ("DataFrame + to_csv", in_memory),
+            ("stream csv", streaming("csv", None)),
+            ("stream csv gzip", streaming("csv", "gzip")),
+            ("stream parquet snappy", streaming("parquet", "snappy")),
+            ("stream parquet zstd", streaming("parquet", "zstd")),
+            ("stream arrow", streaming("arrow", None)),
+            ("stream arrow lz4", streaming("arrow", "lz4")),
+        ]
+        print(f"📊 Exportação de {rows:,} leituras (chunk = {chunk_size})")
+        print(f"{'caminho':>22} | {'tempo (s)':>9} | {'pico MiB':>9} | {'arquivo MiB':>11}")
+        for index, (name, fn) in enumerate(paths):
+            path = os.path.join(workdir, f"export_{index}")
+            session.expunge_all()
+            elapsed, peak = measure(lambda: fn(path))
+            size = os.path.getsize(path) / 1024 / 1024
+            os.remove(path)
+            print(f"{name:>22} | {elapsed:>9.2f} | {peak:>9.1f} | {size:>11.1f}")
+    finally:
+        os.rmdir(workdir)
+        session.expunge_all()
+        component_repo.delete(sensor_id)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    args = parser.parse_args()
+    run(args.rows, args.chunk_size)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark da decisão de irrigação da frota (services/irrigation_service.py):
+uma consulta + predict_irrigation por sensor (caminho do dashboard repetido
+N vezes) versus score_fleet (consulta de janela, um predict_batch e um
+executemany), comparado à meta FLEET_LATENCY_TARGET.
+"""
+
+import argparse
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import delete, insert
+
+from database.models import Component, IrrigationDecision, SensorRecord
+from database.oracle import get_session
+from database.repositories import ClimateDataRepository, SensorRecordRepository
+from services.irrigation_service import FLEET_LATENCY_TARGET, IrrigationDecisionService
+from services.ml_service import MLService
+
+# Limite de itens por IN (...) no Oracle
+DELETE_BATCH = 1000
+
+
+def train_model(model_dir: str) -> MLService:
+    rng = np.random.default_rng(42)
+    size = 5000
+    timestamps = pd.date_range("2024-01-01", periods=size, freq="15min")
+    sensors = pd.DataFrame({
+        "soil_moisture": rng.uniform(10, 90, size), "soil_ph": rng.uniform(5, 7.5, size),
+        "phosphorus_present": rng.random(size) > 0.3, "potassium_present": rng.random(size) > 0.2,
+        "timestamp": timestamps})
+    climate = pd.DataFrame({
+        "temperature": rng.uniform(15, 35, size), "air_humidity": rng.uniform(30, 90, size),
+        "rain_forecast": rng.random(size) < 0.2, "timestamp": timestamps})
+    service = MLService(None, model_dir=model_dir)
+    service.train_model(sensors.to_dict("records"), climate.to_dict("records"))
+    return service
+
+
+def populate(session, sensors: int, readings: int) -> list:
+    sensor_ids = [str(uuid.uuid4()) for _ in range(sensors)]
+    session.execute(insert(Component.__table__),
+                    [{"id": sensor_id, "name": f"Sensor Frota {i}", "type": "Sensor", "crop_id": None}
+                     for i, sensor_id in enumerate(sensor_ids)])
+    session.commit()
+    rng = np.random.default_rng(7)
+    start = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=readings)
+    SensorRecordRepository(session).bulk_create((
+        {
+            "sensor_id": sensor_id,
+            "timestamp": start + timedelta(hours=step),
+            "soil_moisture": float(rng.uniform(10, 90)),
+            "phosphorus_present": bool(rng.random() > 0.3),
+            "potassium_present": bool(rng.random() > 0.2),
+            "soil_ph": float(rng.uniform(5, 7.5)),
+        } for step in range(readings) for sensor_id in sensor_ids), batch_size=10_000)
+    return sensor_ids
+
+
+def cleanup(session, sensor_ids: list):
+    for first in range(0, len(sensor_ids), DELETE_BATCH):
+        ids = sensor_ids[first:first + DELETE_BATCH]
+        for model in (IrrigationDecision, SensorRecord):
+            session.execute(delete(model.__table__).where(model.__table__.c.sensor_id.in_(ids)))
+        session.execute(delete(Component.__table__).where(Component.__table__.c.id.in_(ids)))
+    session.commit()
+
+
+def per_sensor_loop(session, ml_service: MLService, sensor_ids: list) -> float:
+    repo = SensorRecordRepository(session)
+    climate = ClimateDataRepository(session).get_latest()
+    start = time.perf_counter()
+    for sensor_id in sensor_ids:
+        latest = repo.get_latest_by_sensor(sensor_id)
+        ml_service.predict_irrigation(latest.soil_moisture, latest.soil_ph, latest.phosphorus_present,
+                                      latest.potassium_present, climate.temperature, climate.air_humidity,
+                                      climate.rain_forecast, latest.timestamp.hour, latest.timestamp.month)
+    return time.perf_counter() - start
+
+
+def run(sizes, readings: int, loop_max: int):
+    session = get_session()
+    climate_repo = ClimateDataRepository(session)
+    climate = climate_repo.create(temperature=26.0, air_humidity=55.0, rain_forecast=False)
+
+    with tempfile.TemporaryDirectory() as model_dir:
+        ml_service = train_model(model_dir)
+        service = IrrigationDecisionService(session, ml_service)
+        print(f"📊 Decisão da frota ({readings} leituras por sensor, meta {FLEET_LATENCY_TARGET:.1f}s)")
+        print(f"{'sensores':>9} | {'laço N':>8} | {'leitura':>8} | {'predição':>8} | {'gravação':>8} | "
+              f"{'total':>7} | meta")
+        try:
+            for sensors in sizes:
+                sensor_ids = populate(session, sensors, readings)
+                try:
+                    loop = per_sensor_loop(session, ml_service, sensor_ids) if sensors <= loop_max else None
+                    stats = service.score_fleet(sensor_id=sensor_ids if sensors <= DELETE_BATCH else None)
+                    loop_text = f"{loop:>8.2f}" if loop is not None else f"{'-':>8}"
+                    status = "✅" if stats["total_seconds"] <= FLEET_LATENCY_TARGET else "⚠️"
+                    print(f"{sensors:>9,} | {loop_text} | {stats['read_seconds']:>8.3f} | "
+                          f"{stats['predict_seconds']:>8.3f} | {stats['write_seconds']:>8.3f} | "
+                          f"{stats['total_seconds']:>7.3f} | {status}")
+                finally:
+                    cleanup(session, sensor_ids)
+        finally:
+            climate_repo.delete(climate.id)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--readings", type=int, default=24, help="leituras por sensor (uma por hora)")
+    parser.add_argument("--loop-max", type=int, default=1_000,
+                        help="maior frota em que o laço por sensor também é medido")
+    args = parser.parse_args()
+    run(args.sizes, args.readings, args.loop_max)
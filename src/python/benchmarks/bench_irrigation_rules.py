@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark da decisão de irrigação (services/irrigation_rules.py): cascata
+escrita à mão em Python, avaliador escalar compilado (uma leitura por vez,
+como na ingestão) e avaliador vetorizado sobre arrays NumPy.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from services.irrigation_rules import irrigation_rules
+
+
+def make_readings(rows: int, seed: int = 42) -> dict:
+    rng = np.random.default_rng(seed)
+    return {
+        "soil_moisture": rng.uniform(10, 90, rows),
+        "soil_ph": rng.uniform(5.0, 7.5, rows),
+        "phosphorus_present": rng.random(rows) > 0.3,
+        "potassium_present": rng.random(rows) > 0.2,
+        "rain_forecast": rng.random(rows) < 0.2,
+    }
+
+
+def handwritten(reading: dict) -> bool:
+    irrigate = False
+    if not reading["rain_forecast"]:
+        moisture, ph = reading["soil_moisture"], reading["soil_ph"]
+        if moisture < 40 and reading["phosphorus_present"]:
+            irrigate = True
+        if reading["potassium_present"] and moisture > 60:
+            irrigate = False
+        if moisture < 40 and (ph < 5.5 or ph > 7.0):
+            irrigate = False
+        if moisture > 70:
+            irrigate = False
+        if (not reading["phosphorus_present"] or not reading["potassium_present"]) and 30 <= moisture <= 50:
+            irrigate = True
+    return irrigate
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def run(sizes, scalar_max: int):
+    print("📊 Decisão de irrigação (tempo em segundos)")
+    print(f"{'leituras':>10} | {'à mão':>8} | {'escalar':>8} | {'vetorizado':>10} | {'leituras/s (vet.)':>17}")
+    for rows in sizes:
+        columns = make_readings(rows)
+        vectorized, decisions = timed(irrigation_rules.evaluate_many, columns)
+
+        if rows <= scalar_max:
+            records = [dict(zip(columns, values)) for values in zip(*(array.tolist() for array in columns.values()))]
+            manual, expected = timed(lambda: [handwritten(record) for record in records])
+            scalar, scored = timed(lambda: [irrigation_rules.evaluate(record) for record in records])
+            assert scored == expected == decisions.tolist()
+            print(f"{rows:>10,} | {manual:>8.3f} | {scalar:>8.3f} | {vectorized:>10.4f} | {rows / vectorized:>17,.0f}")
+        else:
+            print(f"{rows:>10,} | {'-':>8} | {'-':>8} | {vectorized:>10.4f} | {rows / vectorized:>17,.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--scalar-max", type=int, default=1_000_000,
+                        help="maior tamanho em que os avaliadores leitura a leitura também são medidos")
+    args = parser.parse_args()
+    run(args.sizes, args.scalar_max)
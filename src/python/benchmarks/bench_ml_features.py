@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark da construção de features/labels do MLService: laço com
+iterrows() (implementação anterior) versus construtor vetorizado.
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from services.ml_service import build_feature_matrix, build_irrigation_labels
+
+
+def make_merged_df(rows: int, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "soil_moisture": rng.uniform(0, 100, rows),
+        "soil_ph": rng.uniform(4.0, 9.0, rows),
+        "phosphorus_present": rng.random(rows) > 0.3,
+        "potassium_present": rng.random(rows) > 0.2,
+        "temperature": rng.uniform(10, 40, rows),
+        "air_humidity": rng.uniform(20, 100, rows),
+        "rain_forecast": rng.random(rows) < 0.2,
+        "timestamp_sensor": pd.date_range("2024-01-01", periods=rows, freq="10s"),
+    })
+
+
+def legacy_row_loop(merged_df: pd.DataFrame):
+    features = []
+    for _, row in merged_df.iterrows():
+        features.append([
+            row["soil_moisture"], row["soil_ph"],
+            float(row["phosphorus_present"]), float(row["potassium_present"]),
+            row["temperature"], row["air_humidity"], float(row["rain_forecast"]),
+            row["timestamp_sensor"].hour, row["timestamp_sensor"].month,
+        ])
+    targets = []
+    for _, row in merged_df.iterrows():
+        irrigate = False
+        if not row["rain_forecast"]:
+            if row["soil_moisture"] < 40 and row["phosphorus_present"]:
+                irrigate = True
+            if row["potassium_present"] and row["soil_moisture"] > 60:
+                irrigate = False
+            if row["soil_moisture"] < 40 and (row["soil_ph"] < 5.5 or row["soil_ph"] > 7.0):
+                irrigate = False
+            if row["soil_moisture"] > 70:
+                irrigate = False
+            if (not row["phosphorus_present"] or not row["potassium_present"]) and \
+               (30 <= row["soil_moisture"] <= 50):
+                irrigate = True
+        targets.append(1 if irrigate else 0)
+    return np.array(features), np.array(targets)
+
+
+def run(sizes, legacy_max: int):
+    print("📊 Construção de features/labels (tempo em segundos)")
+    print(f"{'linhas':>10} | {'iterrows':>10} | {'vetorizado':>10} | {'ganho':>7}")
+    for rows in sizes:
+        merged_df = make_merged_df(rows)
+
+        start = time.perf_counter()
+        build_feature_matrix(merged_df)
+        build_irrigation_labels(merged_df)
+        vectorized = time.perf_counter() - start
+
+        if rows <= legacy_max:
+            start = time.perf_counter()
+            legacy_row_loop(merged_df)
+            legacy = time.perf_counter() - start
+            print(f"{rows:>10,} | {legacy:>10.3f} | {vectorized:>10.4f} | {legacy / vectorized:>6.0f}x")
+        else:
+            print(f"{rows:>10,} | {'-':>10} | {vectorized:>10.4f} | {'-':>7}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--legacy-max", type=int, default=100_000,
+                        help="maior tamanho em que o laço iterrows também é medido")
+    args = parser.parse_args()
+    run(args.sizes, args.legacy_max)
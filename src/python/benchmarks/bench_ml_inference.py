@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark de inferência do MLService: predict_irrigation amostra a amostra
+versus predict_batch, e custo de carga do modelo sem e com o registro de
+modelos (carga única por processo).
+"""
+
+import argparse
+import tempfile
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from services import model_registry
+from services.ml_service import MLService
+
+
+def make_training_data(rows: int, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    timestamps = pd.date_range("2024-01-01", periods=rows, freq="10min")
+    sensors = [
+        {
+            "timestamp": ts,
+            "soil_moisture": float(rng.uniform(0, 100)),
+            "soil_ph": float(rng.uniform(4.0, 9.0)),
+            "phosphorus_present": bool(rng.random() > 0.3),
+            "potassium_present": bool(rng.random() > 0.2),
+        } for ts in timestamps
+    ]
+    climate = [
+        {
+            "timestamp": ts,
+            "temperature": float(rng.uniform(10, 40)),
+            "air_humidity": float(rng.uniform(20, 100)),
+            "rain_forecast": bool(rng.random() < 0.2),
+        } for ts in timestamps[::6]
+    ]
+    return sensors, climate
+
+
+def make_samples(rows: int, seed: int = 7) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return np.column_stack([
+        rng.uniform(0, 100, rows), rng.uniform(4.0, 9.0, rows),
+        rng.random(rows) > 0.3, rng.random(rows) > 0.2,
+        rng.uniform(10, 40, rows), rng.uniform(20, 100, rows),
+        rng.random(rows) < 0.2, rng.integers(0, 24, rows), rng.integers(1, 13, rows),
+    ]).astype(np.float32)
+
+
+def run(sizes, loop_max: int, training_rows: int):
+    with tempfile.TemporaryDirectory() as model_dir:
+        service = MLService(None, model_dir=model_dir)
+        sensors, climate = make_training_data(training_rows)
+        service.train_model(sensors, climate)
+
+        print("\n📦 Carga do modelo")
+        start = time.perf_counter()
+        joblib.load(service.model_path)
+        joblib.load(service.scaler_path)
+        print(f"  joblib.load a cada instância: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        model_registry.clear()
+        start = time.perf_counter()
+        MLService(None, model_dir=model_dir)
+        print(f"  registro (primeira carga): {(time.perf_counter() - start) * 1000:.1f} ms")
+        start = time.perf_counter()
+        service = MLService(None, model_dir=model_dir)
+        print(f"  registro (instâncias seguintes): {(time.perf_counter() - start) * 1000:.3f} ms")
+
+        print("\n⚡ Inferência")
+        print(f"{'amostras':>10} | {'loop (s)':>9} | {'lote (s)':>9} | {'lote amostras/s':>16} | {'ganho':>7}")
+        for rows in sizes:
+            samples = make_samples(rows)
+
+            measured = min(rows, loop_max)
+            start = time.perf_counter()
+            for row in samples[:measured]:
+                service.predict_irrigation(*row)
+            loop = (time.perf_counter() - start) / measured * rows
+
+            start = time.perf_counter()
+            service.predict_batch(samples)
+            batch = time.perf_counter() - start
+
+            estimated = "*" if measured < rows else " "
+            print(f"{rows:>10,} | {loop:>8.2f}{estimated} | {batch:>9.4f} | {rows / batch:>16,.0f} | {loop / batch:>6.0f}x")
+        print("* tempo do loop extrapolado a partir das primeiras amostras")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--loop-max", type=int, default=500)
+    parser.add_argument("--training-rows", type=int, default=5_000)
+    args = parser.parse_args()
+    run(args.sizes, args.loop_max, args.training_rows)
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Benchmark de treino do MLService: RandomForest com um núcleo versus todos
+(n_jobs=-1) e tempo de busca de hiperparâmetros no pool de processos.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from sklearn.ensemble import RandomForestClassifier
+
+from benchmarks.bench_ml_inference import make_training_data
+from services.ml_service import MLService
+
+
+def run(rows: int, trees: int, mode: str, n_iter: int, cv: int, workers: int):
+    sensors, climate = make_training_data(rows)
+    with tempfile.TemporaryDirectory() as model_dir:
+        service = MLService(None, model_dir=model_dir)
+        X, y = service.prepare_data(sensors, climate)
+
+        print(f"\n🌲 Treino da floresta ({len(X):,} amostras, {trees} árvores, {os.cpu_count()} núcleos)")
+        for n_jobs in (1, -1):
+            start = time.perf_counter()
+            RandomForestClassifier(n_estimators=trees, random_state=42, n_jobs=n_jobs).fit(X, y)
+            print(f"  n_jobs={n_jobs:>2}: {time.perf_counter() - start:.2f}s")
+
+        print(f"\n🔍 Busca de hiperparâmetros ({mode})")
+        result = service.search_hyperparameters(sensors, climate, mode=mode, n_iter=n_iter,
+                                                cv=cv, max_workers=workers)
+        serial = sum(candidate["seconds"] for candidate in result["candidates"])
+        print(f"  {len(result['candidates'])} candidatos em {result['search_seconds']:.1f}s "
+              f"(soma dos candidatos: {serial:.1f}s, ganho {serial / result['search_seconds']:.1f}x)")
+        print(f"  melhor: {result['best_params']} ({result['best_accuracy']:.3f})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--trees", type=int, default=200)
+    parser.add_argument("--mode", choices=["grid", "random"], default="random")
+    parser.add_argument("--n-iter", type=int, default=8)
+    parser.add_argument("--cv", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    run(args.rows, args.trees, args.mode, args.n_iter, args.cv, args.workers)
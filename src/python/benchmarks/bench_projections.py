@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark de serialização das listagens: objetos ORM convertidos com
+__dict__ (caminho anterior dos serviços) versus select() só de colunas
+devolvendo dicts (select_rows) ou DataFrame tipado (select_frame).
+Mede tempo e pico de memória de listar + montar o DataFrame.
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from database.models import SensorRecord
+from database.oracle import get_session
+from database.repositories import ComponentRepository, SensorRecordRepository
+from database.repositories.projections import select_frame, select_rows
+
+
+def measure(fn):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+def run(rows: int):
+    session = get_session()
+    component_repo = ComponentRepository(session)
+    repo = SensorRecordRepository(session)
+    sensor_id = component_repo.create(name="Sensor Benchmark", type="Sensor").id
+    start_date = datetime(2022, 1, 1)
+
+    try:
+        repo.bulk_create(
+            {
+                "sensor_id": sensor_id,
+                "timestamp": start_date + timedelta(seconds=10 * i),
+                "soil_moisture": 20 + (i % 600) / 10,
+                "phosphorus_present": i % 3 != 0,
+                "potassium_present": i % 5 != 0,
+                "soil_ph": 5 + (i % 30) / 10,
+            } for i in range(rows)
+        )
+
+        def orm_dict():
+            pd.DataFrame([record.__dict__ for record in repo.get_all()])
+            session.expunge_all()
+
+        paths = [
+            ("ORM + __dict__", orm_dict),
+            ("select_rows + DataFrame", lambda: pd.DataFrame(select_rows(session, SensorRecord))),
+            ("select_frame", lambda: select_frame(session, SensorRecord)),
+        ]
+        print(f"📊 Listagem de {rows:,} leituras + DataFrame")
+        print(f"{'caminho':>24} | {'tempo (s)':>9} | {'pico MiB':>9}")
+        for name, fn in paths:
+            session.expunge_all()
+            elapsed, peak = measure(fn)
+            print(f"{name:>24} | {elapsed:>9.2f} | {peak:>9.1f}")
+    finally:
+        session.expunge_all()
+        component_repo.delete(sensor_id)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+    run(args.rows)
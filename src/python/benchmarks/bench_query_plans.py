@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos índices de sensor_records: popula a tabela com N leituras
+distribuídas entre S sensores, mede a latência da última leitura por sensor
+e de consultas por intervalo e exibe o plano de execução de cada consulta.
+
+Exemplo (10 milhões de linhas, 1000 sensores):
+    python -m benchmarks.bench_query_plans --rows 10000000 --sensors 1000
+"""
+
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, text
+
+from database.oracle import get_session
+from database.models import SensorRecord
+from database.repositories import ComponentRepository, SensorRecordRepository
+
+
+def explain(session, sql: str, params: dict) -> str:
+    dialect = session.get_bind().dialect.name
+    if dialect == "oracle":
+        session.execute(text(f"EXPLAIN PLAN FOR {sql}"), params)
+        rows = session.execute(text("SELECT plan_table_output FROM TABLE(DBMS_XPLAN.DISPLAY())"))
+        return "\n".join(row[0] for row in rows)
+    if dialect == "sqlite":
+        rows = session.execute(text(f"EXPLAIN QUERY PLAN {sql}"), params)
+        return "\n".join(str(row[-1]) for row in rows)
+    rows = session.execute(text(f"EXPLAIN {sql}"), params)
+    return "\n".join(str(row[0]) for row in rows)
+
+
+def timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def run(rows: int, sensors: int, repeat: int, batch_size: int):
+    session = get_session()
+    component_repo = ComponentRepository(session)
+    repo = SensorRecordRepository(session)
+
+    sensor_ids = [component_repo.create(name=f"Sensor Benchmark {i}", type="Sensor").id for i in range(sensors)]
+    start_date = datetime(2020, 1, 1)
+
+    try:
+        print(f"📥 Inserindo {rows:,} leituras em {sensors} sensores...")
+        start = time.perf_counter()
+        repo.bulk_create(
+            (
+                {
+                    "sensor_id": sensor_ids[i % sensors],
+                    "timestamp": start_date + timedelta(seconds=10 * (i // sensors)),
+                    "soil_moisture": 45.0,
+                    "phosphorus_present": True,
+                    "potassium_present": True,
+                    "soil_ph": 6.5,
+                } for i in range(rows)
+            ),
+            batch_size=batch_size
+        )
+        print(f"✅ Carga concluída em {time.perf_counter() - start:.1f}s")
+
+        end_date = start_date + timedelta(seconds=10 * (rows // sensors))
+        window_start = end_date - timedelta(hours=1)
+        target = sensor_ids[len(sensor_ids) // 2]
+
+        queries = {
+            "Última leitura por sensor": (
+                "SELECT * FROM sensor_records WHERE sensor_id = :sensor_id ORDER BY timestamp DESC",
+                {"sensor_id": target},
+                lambda: repo.get_latest_by_sensor(target),
+            ),
+            "Intervalo de 1h (todos os sensores)": (
+                "SELECT * FROM sensor_records WHERE timestamp >= :start_date AND timestamp <= :end_date",
+                {"start_date": window_start, "end_date": end_date},
+                lambda: repo.get_by_date_range(window_start, end_date),
+            ),
+            "Página de 500 por chave": (
+                "SELECT * FROM sensor_records WHERE timestamp > :start_date ORDER BY timestamp, id",
+                {"start_date": window_start},
+                lambda: repo.get_page(after_timestamp=window_start, limit=500),
+            ),
+        }
+
+        for title, (sql, params, fn) in queries.items():
+            latency = timed(fn, repeat)
+            session.expunge_all()
+            print(f"\n⏱️ {title}: {latency:.2f} ms (mediana de {repeat})")
+            print(explain(session, sql, params))
+    finally:
+        session.rollback()
+        session.execute(delete(SensorRecord).where(SensorRecord.sensor_id.in_(sensor_ids)))
+        session.commit()
+        for sensor_id in sensor_ids:
+            component_repo.delete(sensor_id)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--sensors", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    args = parser.parse_args()
+    run(args.rows, args.sensors, args.repeat, args.batch_size)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark de ingestão de leituras de sensores: caminho por linha
+(create_sensor_record) versus caminho em lote (bulk_create_sensor_records)
+e o daemon de ingestão (micro-lotes alimentados por vários dispositivos).
+"""
+
+import argparse
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from database.oracle import get_session
+from database.repositories import ComponentRepository
+from services.ingestion import MicroBatcher, database_sink
+from services.sensor_service import SensorRecordService
+
+
+def make_readings(sensor_id: str, rows: int) -> list:
+    start = datetime.now(timezone.utc) - timedelta(seconds=10 * rows)
+    return [
+        {
+            "sensor_id": sensor_id,
+            "timestamp": start + timedelta(seconds=10 * i),
+            "soil_moisture": round(random.uniform(10, 90), 1),
+            "soil_ph": round(random.uniform(4.5, 8.5), 1),
+            "phosphorus_present": random.random() > 0.3,
+            "potassium_present": random.random() > 0.2,
+        }
+        for i in range(rows)
+    ]
+
+
+def run(rows: int, batch_size: int, devices: int):
+    session = get_session()
+    component_repo = ComponentRepository(session)
+    sensor_service = SensorRecordService(session)
+
+    sensor_id = component_repo.create(name="Sensor Benchmark", type="Sensor").id
+
+    try:
+        readings = make_readings(sensor_id, rows)
+
+        start = time.perf_counter()
+        for reading in readings:
+            sensor_service.create_sensor_record(reading)
+        per_row = time.perf_counter() - start
+
+        readings = make_readings(sensor_id, rows)
+        start = time.perf_counter()
+        sensor_service.bulk_create_sensor_records(readings, batch_size=batch_size)
+        bulk = time.perf_counter() - start
+
+        readings = make_readings(sensor_id, rows)
+        batcher = MicroBatcher(database_sink, batch_size=batch_size, queue_size=rows).start()
+        per_device = -(-rows // devices)
+        producers = [
+            threading.Thread(target=batcher.submit_many, args=(readings[i:i + per_device], 1.0))
+            for i in range(0, rows, per_device)
+        ]
+        start = time.perf_counter()
+        for producer in producers:
+            producer.start()
+        for producer in producers:
+            producer.join()
+        batcher.stop()
+        daemon = time.perf_counter() - start
+        metrics = batcher.metrics()
+
+        print(f"📊 Ingestão de {rows} leituras (lote = {batch_size})")
+        print(f"🐢 Por linha: {per_row:.2f}s ({rows / per_row:,.0f} linhas/s)")
+        print(f"🚀 Em lote:   {bulk:.2f}s ({rows / bulk:,.0f} linhas/s)")
+        print(f"📡 Daemon ({len(producers)} dispositivos): {daemon:.2f}s ({rows / daemon:,.0f} linhas/s, "
+              f"{metrics['batches']} lotes, fila máx. {metrics['queue_high_water']})")
+        print(f"📈 Ganho: {per_row / bulk:.1f}x")
+    finally:
+        component_repo.delete(sensor_id)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--devices", type=int, default=50)
+    args = parser.parse_args()
+    run(args.rows, args.batch_size, args.devices)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memória das leituras de sensor_records: get_by_date_range
+(materializa tudo com .all()) versus iter_by_date_range (streaming com
+yield_per). Mede o pico de memória alocada em cada caminho.
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete
+
+from database.oracle import get_session
+from database.models import SensorRecord
+from database.repositories import ComponentRepository, SensorRecordRepository
+
+
+def measure(fn):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, elapsed, peak / 1024 / 1024
+
+
+def run(sizes, chunk_size: int):
+    session = get_session()
+    component_repo = ComponentRepository(session)
+    repo = SensorRecordRepository(session)
+    sensor_id = component_repo.create(name="Sensor Benchmark", type="Sensor").id
+    start_date = datetime(2020, 1, 1)
+
+    print(f"📊 Pico de memória por leitura completa do intervalo (chunk = {chunk_size})")
+    print(f"{'linhas':>10} | {'.all() MiB':>11} | {'stream MiB':>11} | {'.all() s':>9} | {'stream s':>9}")
+    try:
+        inserted = 0
+        for rows in sorted(sizes):
+            repo.bulk_create(
+                {
+                    "sensor_id": sensor_id,
+                    "timestamp": start_date + timedelta(seconds=10 * i),
+                    "soil_moisture": 45.0,
+                    "phosphorus_present": True,
+                    "potassium_present": True,
+                    "soil_ph": 6.5,
+                } for i in range(inserted, rows)
+            )
+            inserted = rows
+            end_date = start_date + timedelta(seconds=10 * rows)
+            session.expunge_all()
+
+            def materialize():
+                return len([record.__dict__.copy() for record in repo.get_by_date_range(start_date, end_date)])
+
+            def stream():
+                return sum(1 for _ in repo.iter_by_date_range(start_date, end_date, chunk_size=chunk_size))
+
+            _, all_time, all_peak = measure(materialize)
+            session.expunge_all()
+            _, stream_time, stream_peak = measure(stream)
+            session.expunge_all()
+            print(f"{rows:>10,} | {all_peak:>11.1f} | {stream_peak:>11.1f} | {all_time:>9.2f} | {stream_time:>9.2f}")
+    finally:
+        session.execute(delete(SensorRecord).where(SensorRecord.sensor_id == sensor_id))
+        session.commit()
+        component_repo.delete(sensor_id)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 50_000, 100_000])
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+    run(args.sizes, args.chunk_size)
@@ -7,7 +7,8 @@ from .models import (
     ClimateData,
     Producer,
     Crop,
-    Application
+    Application,
+    IrrigationDecision
 )
 from .repositories import (
     ProducerRepository,
@@ -15,9 +16,10 @@ from .repositories import (
     ComponentRepository,
     SensorRecordRepository,
     ApplicationRepository,
-    ClimateDataRepository
+    ClimateDataRepository,
+    IrrigationDecisionRepository
 )
-from .oracle import get_session, close_session, engine
+from .oracle import get_session, close_session, get_engine, open_session, session_scope
 
 __all__ = [
     'Component',
@@ -26,13 +28,25 @@ __all__ = [
     'Producer',
     'Crop',
     'Application',
+    'IrrigationDecision',
     'ProducerRepository',
     'CropRepository',
     'ComponentRepository',
     'SensorRecordRepository',
     'ApplicationRepository',
     'ClimateDataRepository',
+    'IrrigationDecisionRepository',
     'get_session',
     'close_session',
+    'get_engine',
+    'open_session',
+    'session_scope',
     'engine'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    # O engine é criado sob demanda: importar `database` não conecta ao banco
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
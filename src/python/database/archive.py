@@ -0,0 +1,270 @@
+"""
+Camada de arquivo histórico em Parquet.
+
+Registros de sensor_records e climate_data mais antigos que o horizonte
+configurado são copiados para arquivos Parquet particionados (sensor_id e
+mês para leituras, mês para clima) e removidos do banco. As leituras
+analíticas unem as duas camadas com read_tiered, lendo do Parquet apenas as
+colunas e partições necessárias. Se o processo cair entre a gravação de um
+bloco e sua remoção do banco, o bloco fica nas duas camadas: a leitura e a
+contagem ignoram no arquivo os ids ainda presentes no banco (read_cold), e
+a próxima execução regrava o mesmo bloco no mesmo arquivo antes de removê-lo.
+
+Uso:
+    python -m database.archive --horizon-days 90 --dir archive
+"""
+import argparse
+import hashlib
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional
+
+import pandas as pd
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from .models import ClimateData, SensorRecord
+from .repositories.projections import SensorFilter, range_filters, select_frame
+from .oracle import get_session, close_session
+
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "archive")
+ARCHIVE_HORIZON_DAYS = int(os.getenv("ARCHIVE_HORIZON_DAYS", "90"))
+
+# Colunas de partição (diretórios no estilo hive: sensor_id=<id>/month=AAAA-MM)
+PARTITIONS = {
+    SensorRecord.__tablename__: ['sensor_id', 'month'],
+    ClimateData.__tablename__: ['month'],
+}
+
+# Limite de itens por IN (...) no Oracle
+DELETE_BATCH = 1000
+
+
+def archive_path(model, archive_dir: str = ARCHIVE_DIR) -> str:
+    return os.path.join(archive_dir, model.__tablename__)
+
+
+def write_archive(frame: pd.DataFrame, model, archive_dir: str = ARCHIVE_DIR, name: Optional[str] = None):
+    """
+    Acrescenta um bloco de linhas (todas as colunas do modelo) às partições do
+    arquivo. Com name, os arquivos do bloco têm nome fixo e gravar o mesmo
+    bloco de novo os substitui em vez de duplicar as linhas.
+    """
+    frame = frame.assign(timestamp=pd.to_datetime(frame['timestamp']))
+    frame['month'] = frame['timestamp'].dt.strftime('%Y-%m')
+    options = {'basename_template': f"{name}-{{i}}.parquet"} if name else {}
+    frame.to_parquet(archive_path(model, archive_dir), partition_cols=PARTITIONS[model.__tablename__], index=False,
+                     **options)
+
+
+def _chunk_name(ids: List[str]) -> str:
+    return hashlib.sha1("\n".join(ids).encode()).hexdigest()[:16]
+
+
+def archive_older_than(session: Session, model, cutoff: datetime, archive_dir: str = ARCHIVE_DIR,
+                       chunk_size: int = 50000) -> int:
+    """
+    Move para o Parquet os registros com timestamp anterior a cutoff, em blocos:
+    cada bloco é gravado no arquivo antes de ser removido do banco, então uma
+    falha no meio nunca perde dados. No pior caso o bloco fica nas duas
+    camadas: as leituras usam a cópia do banco (read_cold) e a próxima
+    execução regrava o bloco no mesmo arquivo (nome derivado dos ids) e o remove.
+    """
+    table = model.__table__
+    columns = [column.key for column in table.columns]
+    # Como cada bloco é removido após gravado, a mesma consulta sempre traz o próximo
+    stmt = (select(*table.columns)
+            .where(table.c.timestamp < cutoff)
+            .order_by(table.c.timestamp, table.c.id)
+            .limit(chunk_size))
+
+    total = 0
+    while True:
+        frame = pd.DataFrame(session.execute(stmt).all(), columns=columns)
+        if frame.empty:
+            return total
+        ids = frame['id'].tolist()
+        write_archive(frame, model, archive_dir, name=_chunk_name(ids))
+
+        for start in range(0, len(ids), DELETE_BATCH):
+            session.execute(delete(table).where(table.c.id.in_(ids[start:start + DELETE_BATCH])))
+        session.commit()
+        total += len(frame)
+
+
+def run_archive(session: Session, horizon_days: int = ARCHIVE_HORIZON_DAYS,
+                archive_dir: str = ARCHIVE_DIR) -> Dict[str, int]:
+    """Arquiva leituras de sensores e dados climáticos mais antigos que o horizonte."""
+    # Timestamps gravados em UTC sem fuso, como nos repositórios
+    cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=horizon_days)
+    return {
+        model.__tablename__: archive_older_than(session, model, cutoff, archive_dir)
+        for model in (SensorRecord, ClimateData)
+    }
+
+
+def _no_sensors(sensor_id: SensorFilter) -> bool:
+    # Lista vazia de sensores (ex.: cultura sem sensores) não seleciona nenhuma linha
+    return sensor_id is not None and not isinstance(sensor_id, str) and len(sensor_id) == 0
+
+
+def _archive_filters(start_date: datetime = None, end_date: datetime = None,
+                     sensor_id: SensorFilter = None) -> list:
+    filters = []
+    if isinstance(sensor_id, str):
+        filters.append(('sensor_id', '=', sensor_id))
+    elif sensor_id is not None:
+        filters.append(('sensor_id', 'in', list(sensor_id)))
+    if start_date is not None:
+        filters += [('month', '>=', start_date.strftime('%Y-%m')), ('timestamp', '>=', start_date)]
+    if end_date is not None:
+        filters += [('month', '<=', end_date.strftime('%Y-%m')), ('timestamp', '<=', end_date)]
+    return filters
+
+
+def read_archive(model, columns: Optional[List[str]] = None, start_date: datetime = None,
+                 end_date: datetime = None, sensor_id: SensorFilter = None,
+                 archive_dir: str = ARCHIVE_DIR) -> pd.DataFrame:
+    """
+    Lê a camada Parquet com poda de colunas e de partições: filtros por
+    sensor_id e mês descartam diretórios inteiros, e o filtro de timestamp usa
+    as estatísticas dos row groups.
+    """
+    columns = columns or [column.key for column in model.__table__.columns]
+    path = archive_path(model, archive_dir)
+    if not os.path.isdir(path) or _no_sensors(sensor_id):
+        return pd.DataFrame(columns=columns)
+
+    filters = _archive_filters(start_date, end_date, sensor_id)
+    read_columns = list(dict.fromkeys(columns + ['id']))
+    frame = pd.read_parquet(path, columns=read_columns, filters=filters or None)
+    # Colunas de partição voltam como categóricas
+    for column in set(read_columns) & set(PARTITIONS[model.__tablename__]):
+        frame[column] = frame[column].astype(str)
+    return frame.drop_duplicates('id')[columns]
+
+
+def count_archive(model, start_date: datetime = None, end_date: datetime = None,
+                  sensor_id: SensorFilter = None, archive_dir: str = ARCHIVE_DIR) -> int:
+    """Conta os ids distintos arquivados no intervalo lendo só a coluna id e as de filtro."""
+    path = archive_path(model, archive_dir)
+    if not os.path.isdir(path) or _no_sensors(sensor_id):
+        return 0
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+
+    filters = _archive_filters(start_date, end_date, sensor_id)
+    dataset = ds.dataset(path, format='parquet', partitioning='hive')
+    ids = dataset.to_table(columns=['id'], filter=pq.filters_to_expression(filters) if filters else None)
+    return pc.count_distinct(ids['id']).as_py()
+
+
+def read_cold(session: Session, model, columns: Optional[List[str]] = None, start_date: datetime = None,
+              end_date: datetime = None, sensor_id: SensorFilter = None,
+              archive_dir: str = ARCHIVE_DIR) -> pd.DataFrame:
+    """
+    Linhas arquivadas que já não estão no banco. Um bloco gravado no Parquet
+    e não removido (falha entre as duas etapas) é lido só da camada quente;
+    como o arquivamento segue a ordem de timestamp, basta consultar no banco
+    os ids até o timestamp mais recente do arquivo.
+    """
+    columns = columns or [column.key for column in model.__table__.columns]
+    cold = read_archive(model, list(dict.fromkeys(columns + ['id', 'timestamp'])), start_date, end_date,
+                        sensor_id, archive_dir)
+    if not cold.empty:
+        latest = pd.to_datetime(cold['timestamp']).max().to_pydatetime()
+        cold = _without_hot_ids(session, model, cold, start_date, latest, sensor_id)
+    return cold[columns].reset_index(drop=True)
+
+
+def _without_hot_ids(session: Session, model, cold: pd.DataFrame, start_date: Optional[datetime],
+                     end_date: Optional[datetime], sensor_id: SensorFilter) -> pd.DataFrame:
+    """Remove do bloco arquivado os ids ainda presentes no banco no intervalo dado."""
+    filters = range_filters(model, start_date, end_date, sensor_id)
+    hot_ids = session.execute(select(model.__table__.c.id).where(*filters)).scalars().all()
+    return cold[~cold['id'].isin(hot_ids)] if hot_ids else cold
+
+
+def iter_cold_frames(session: Session, model, columns: Optional[List[str]] = None, start_date: datetime = None,
+                     end_date: datetime = None, sensor_id: SensorFilter = None, archive_dir: str = ARCHIVE_DIR,
+                     chunk_size: int = 50000) -> Iterator[pd.DataFrame]:
+    """
+    Versão em blocos de read_cold para exportações: lê o Parquet em lotes de
+    até chunk_size linhas, com a mesma poda de colunas e partições, e descarta
+    de cada lote os ids ainda presentes no banco (consulta limitada ao
+    intervalo de timestamps do lote). Os blocos seguem a ordem das partições.
+    """
+    columns = columns or [column.key for column in model.__table__.columns]
+    path = archive_path(model, archive_dir)
+    if not os.path.isdir(path) or _no_sensors(sensor_id):
+        return
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+
+    filters = _archive_filters(start_date, end_date, sensor_id)
+    dataset = ds.dataset(path, format='parquet', partitioning='hive')
+    batches = dataset.to_batches(columns=list(dict.fromkeys(columns + ['id', 'timestamp'])),
+                                 filter=pq.filters_to_expression(filters) if filters else None,
+                                 batch_size=chunk_size)
+    for batch in batches:
+        if batch.num_rows == 0:
+            continue
+        frame = batch.to_pandas()
+        for column in set(frame.columns) & set(PARTITIONS[model.__tablename__]):
+            frame[column] = frame[column].astype(str)
+        timestamps = pd.to_datetime(frame['timestamp'])
+        frame = _without_hot_ids(session, model, frame, timestamps.min().to_pydatetime(),
+                                 timestamps.max().to_pydatetime(), sensor_id)
+        if not frame.empty:
+            yield frame[columns].reset_index(drop=True)
+
+
+def read_tiered(session: Session, model, columns: Optional[List[str]] = None, start_date: datetime = None,
+                end_date: datetime = None, sensor_id: SensorFilter = None,
+                archive_dir: str = ARCHIVE_DIR) -> pd.DataFrame:
+    """
+    Une a camada quente (banco) e a camada arquivada (Parquet) em um único
+    DataFrame ordenado por timestamp, lendo do banco apenas as colunas pedidas.
+    Cada id aparece uma vez, mesmo com um bloco presente nas duas camadas.
+    """
+    columns = columns or [column.key for column in model.__table__.columns]
+    filters = range_filters(model, start_date, end_date, sensor_id)
+
+    hot = select_frame(session, model, filters, columns=columns)
+    cold = read_cold(session, model, columns, start_date, end_date, sensor_id, archive_dir)
+    frames = [frame for frame in (cold, hot) if not frame.empty]
+    if not frames:
+        return hot
+    frame = pd.concat(frames, ignore_index=True)
+    if 'timestamp' in frame:
+        frame['timestamp'] = pd.to_datetime(frame['timestamp'])
+        frame = frame.sort_values('timestamp', kind='stable', ignore_index=True)
+    return frame
+
+
+def count_tiered(session: Session, model, start_date: datetime = None, end_date: datetime = None,
+                 sensor_id: SensorFilter = None, archive_dir: str = ARCHIVE_DIR) -> int:
+    """Total de linhas no intervalo: COUNT no banco mais as linhas só arquivadas (read_cold)."""
+    filters = range_filters(model, start_date, end_date, sensor_id)
+    hot = session.execute(select(func.count()).select_from(model.__table__).where(*filters)).scalar()
+    cold = read_cold(session, model, ['id'], start_date, end_date, sensor_id, archive_dir)
+    return hot + cold['id'].nunique()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Arquiva registros antigos em Parquet")
+    parser.add_argument("--horizon-days", type=int, default=ARCHIVE_HORIZON_DAYS)
+    parser.add_argument("--dir", default=ARCHIVE_DIR)
+    args = parser.parse_args()
+
+    try:
+        archived = run_archive(get_session(), args.horizon_days, args.dir)
+    finally:
+        close_session()
+    for table, count in archived.items():
+        print(f"📦 {table}: {count} registros arquivados em {os.path.join(args.dir, table)}")
+
+
+if __name__ == "__main__":
+    main()
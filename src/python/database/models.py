@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, Float, Boolean, DateTime, ForeignKey, Date, Sequence
+from sqlalchemy import Column, String, Float, Boolean, DateTime, ForeignKey, Date, Sequence, Index
 from sqlalchemy.orm import declarative_base, relationship
 from datetime import datetime, timezone, timedelta
 
@@ -9,6 +9,9 @@ BRT = timezone(timedelta(hours=-3))
 # Tabela que representa o cadastro de sensores e atuadores físicos
 class Component(Base):
     __tablename__ = "components"
+    __table_args__ = (
+        Index("ix_components_crop_id", "crop_id"),
+    )
 
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     name = Column(String(50), nullable=False)
@@ -32,6 +35,12 @@ class Component(Base):
 # Tabela que armazena os registros de sensores no solo
 class SensorRecord(Base):
     __tablename__ = "sensor_records"
+    __table_args__ = (
+        # Última leitura por sensor e séries de um sensor (get_latest_by_sensor, get_by_sensor)
+        Index("ix_sensor_rec_sensor_ts", "sensor_id", "timestamp"),
+        # Intervalos de datas e paginação por chave (timestamp, id)
+        Index("ix_sensor_rec_ts_id", "timestamp", "id"),
+    )
 
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     sensor_id = Column(String(36), ForeignKey("components.id", ondelete="CASCADE"), nullable=False)
@@ -68,6 +77,9 @@ class SensorRecord(Base):
 # Tabela que armazena os dados meteorológicos obtidos de API externa
 class ClimateData(Base):
     __tablename__ = "climate_data"
+    __table_args__ = (
+        Index("ix_climate_data_ts_id", "timestamp", "id"),
+    )
 
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     timestamp = Column(DateTime, nullable=False, default=lambda: datetime.now(BRT))
@@ -101,6 +113,9 @@ class Producer(Base):
 # Tabela que armazena os dados das culturas
 class Crop(Base):
     __tablename__ = 'crops'
+    __table_args__ = (
+        Index("ix_crops_producer_id", "producer_id"),
+    )
 
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     name = Column(String(100), nullable=False)
@@ -119,6 +134,10 @@ class Crop(Base):
 # Tabela que armazena os dados de aplicação de insumos, como fertilizantes, defensivos, etc.
 class Application(Base):
     __tablename__ = 'applications'
+    __table_args__ = (
+        Index("ix_applications_crop_ts", "crop_id", "timestamp"),
+        Index("ix_applications_ts_id", "timestamp", "id"),
+    )
 
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     crop_id = Column(String(36), ForeignKey('crops.id', ondelete="CASCADE"), nullable=False)
@@ -130,3 +149,29 @@ class Application(Base):
 
     def __repr__(self):
         return f"<Application(id={self.id}, crop={self.crop_id}, type='{self.type}')>"
+
+# Tabela que armazena as decisões de irrigação calculadas para todos os sensores de uma vez
+class IrrigationDecision(Base):
+    __tablename__ = 'irrigation_decisions'
+    __table_args__ = (
+        # Última decisão por sensor
+        Index("ix_irrigation_dec_sensor_ts", "sensor_id", "decided_at"),
+        # Decisões de uma mesma rodada
+        Index("ix_irrigation_dec_run", "run_id"),
+    )
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    run_id = Column(String(36), nullable=False)
+    sensor_id = Column(String(36), ForeignKey("components.id", ondelete="CASCADE"), nullable=False)
+    # Leitura e registro climático usados (sem FK: podem ser movidos para o arquivo Parquet)
+    record_id = Column(String(36), nullable=False)
+    climate_id = Column(String(36))
+    reading_timestamp = Column(DateTime, nullable=False)
+    decided_at = Column(DateTime, nullable=False, default=lambda: datetime.now(BRT))
+    should_irrigate = Column(Boolean, nullable=False)
+    irrigation_probability = Column(Float, nullable=False)
+    confidence = Column(Float, nullable=False)
+    source = Column(String(10), nullable=False)  # 'ml', 'rules' ou 'compiled' (daemon de ingestão)
+
+    def __repr__(self):
+        return f"<IrrigationDecision(sensor={self.sensor_id}, irrigate={self.should_irrigate})>"
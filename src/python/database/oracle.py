@@ -1,52 +1,77 @@
-from sqlalchemy import create_engine, text
+from sqlalchemy import literal, select
 from sqlalchemy.orm import sessionmaker, scoped_session
 import os
+from contextlib import contextmanager
 from dotenv import load_dotenv
+import threading
 import time
 import logging
 
+from database.backends import create_backend_engine
+
 logger = logging.getLogger(__name__)
 
 # Carrega variáveis de ambiente
 load_dotenv()
 
 required_vars = ["ORACLE_USER", "ORACLE_PASSWORD", "ORACLE_HOST", "ORACLE_PORT", "ORACLE_SERVICE"]
-missing_vars = [var for var in required_vars if not os.getenv(var)]
 
-if missing_vars:
-    raise EnvironmentError(f"Erro: Variáveis de ambiente ausentes - {', '.join(missing_vars)}.\nVerifique se o arquivo .env contém todas as configurações necessárias.")
 
-# Configuração da conexão com o banco
-ORACLE_USER = os.getenv('ORACLE_USER')
-ORACLE_PASSWORD = os.getenv('ORACLE_PASSWORD')
-ORACLE_HOST = os.getenv('ORACLE_HOST')
-ORACLE_PORT = os.getenv('ORACLE_PORT')
-ORACLE_SERVICE = os.getenv('ORACLE_SERVICE')
+def _env_flag(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
 
-# String de conexão
-DATABASE_URL = f"oracle+oracledb://{ORACLE_USER}:{ORACLE_PASSWORD}@{ORACLE_HOST}:{ORACLE_PORT}/{ORACLE_SERVICE}"
 
-# Configurações do engine
+# Configurações do engine (sobrescrevíveis por variáveis de ambiente)
 ENGINE_CONFIG = {
-    'pool_size': 5,
-    'max_overflow': 10,
-    'pool_timeout': 30,
-    'pool_recycle': 1800,  # Recicla conexões a cada 30 minutos
-    'pool_pre_ping': True,  # Verifica conexão antes de usar
-    'echo': True  # Log de SQL
+    'pool_size': int(os.getenv('DB_POOL_SIZE', '5')),
+    'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', '10')),
+    'pool_timeout': int(os.getenv('DB_POOL_TIMEOUT', '30')),
+    'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', '1800')),  # Recicla conexões a cada 30 minutos
+    # Ping antes de cada checkout: desligado por padrão, pois conexões quebradas já
+    # são descartadas pelo pool_recycle e pela invalidação do pool em erros de desconexão
+    'pool_pre_ping': _env_flag('DB_POOL_PRE_PING', False),
+    'echo': _env_flag('DB_ECHO', False)  # Log de SQL
 }
 
-def create_engine_with_retry(max_retries=3, retry_delay=5):
+# Verifica a conexão uma única vez, na criação do engine (não a cada sessão)
+CONNECT_CHECK = _env_flag('DB_CONNECT_CHECK', True)
+
+
+def get_database_url() -> str:
+    """
+    String de conexão: DATABASE_URL (Oracle, PostgreSQL, SQLite ou DuckDB, ver
+    database/backends.py) ou, na falta dela, o Oracle das variáveis ORACLE_*.
+    """
+    if os.getenv('DATABASE_URL'):
+        return os.getenv('DATABASE_URL')
+
+    missing_vars = [var for var in required_vars if not os.getenv(var)]
+    if missing_vars:
+        raise EnvironmentError(f"Erro: Variáveis de ambiente ausentes - {', '.join(missing_vars)}.\nVerifique se o arquivo .env contém todas as configurações necessárias.")
+
+    return (f"oracle+oracledb://{os.getenv('ORACLE_USER')}:{os.getenv('ORACLE_PASSWORD')}"
+            f"@{os.getenv('ORACLE_HOST')}:{os.getenv('ORACLE_PORT')}/{os.getenv('ORACLE_SERVICE')}")
+
+
+def check_connection(engine) -> None:
+    """Executa uma consulta trivial (SELECT 1, ou SELECT 1 FROM DUAL no Oracle)."""
+    with engine.connect() as conn:
+        conn.execute(select(literal(1)))
+
+
+def create_engine_with_retry(max_retries=3, retry_delay=5, check=CONNECT_CHECK):
     """Cria o engine com retry logic."""
     for attempt in range(max_retries):
         try:
             logger.info(f"Tentativa {attempt + 1} de {max_retries} para criar engine")
-            engine = create_engine(DATABASE_URL, **ENGINE_CONFIG)
-            # Testa a conexão
-            with engine.connect() as conn:
-                conn.execute(text("SELECT 1 FROM DUAL"))
+            engine = create_backend_engine(get_database_url(), ENGINE_CONFIG)
+            if check:
+                check_connection(engine)
             logger.info("Engine criado com sucesso")
             return engine
+        except (EnvironmentError, ImportError, ValueError):
+            # Configuração ausente ou driver não instalado: novas tentativas não resolvem
+            raise
         except Exception as e:
             logger.error(f"Erro ao criar engine (tentativa {attempt + 1}): {str(e)}")
             if attempt < max_retries - 1:
@@ -55,21 +80,38 @@ def create_engine_with_retry(max_retries=3, retry_delay=5):
             else:
                 raise
 
-# Cria o engine do SQLAlchemy
-engine = create_engine_with_retry()
 
-# Cria a sessão
-session_factory = sessionmaker(bind=engine)
-Session = scoped_session(session_factory)
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """Engine do SQLAlchemy, criado na primeira utilização (não na importação)."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_engine_with_retry()
+    return _engine
+
+
+def __getattr__(name):
+    # Mantém `from database.oracle import engine` funcionando sem criar o engine na importação
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Cria a sessão (o engine só é criado quando a primeira sessão é aberta)
+session_factory = sessionmaker()
+Session = scoped_session(lambda: session_factory(bind=get_engine()))
 
 def get_session():
     try:
-        session = Session()
-        session.execute(text("SELECT 1 FROM DUAL"))
-        return session
+        return Session()
     except Exception as e:
         logger.error(f"Erro ao obter sessão: {str(e)}")
-        Session.remove()  
+        Session.remove()
         raise
 
 def close_session():
@@ -78,8 +120,27 @@ def close_session():
     except Exception as e:
         logger.error(f"Erro ao fechar sessão: {str(e)}")
 
+def open_session():
+    """
+    Sessão independente do scoped_session (não ligada à thread), para quem
+    gerencia o próprio ciclo de vida, como cada usuário do dashboard.
+    """
+    return session_factory(bind=get_engine())
+
+@contextmanager
+def session_scope():
+    """Sessão de vida curta: devolve a conexão ao pool ao sair do bloco."""
+    session = open_session()
+    try:
+        yield session
+    finally:
+        session.close()
+
 class DB:
     session = Session
-    engine = engine
+
+    @property
+    def engine(self):
+        return get_engine()
 
 db = DB()
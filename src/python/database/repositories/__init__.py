@@ -4,6 +4,7 @@ from .component_repository import ComponentRepository
 from .sensor_record_repository import SensorRecordRepository
 from .application_repository import ApplicationRepository
 from .climate_data_repository import ClimateDataRepository
+from .irrigation_decision_repository import IrrigationDecisionRepository
 
 __all__ = [
     'ProducerRepository',
@@ -11,5 +12,6 @@ __all__ = [
     'ComponentRepository',
     'SensorRecordRepository',
     'ApplicationRepository',
-    'ClimateDataRepository'
+    'ClimateDataRepository',
+    'IrrigationDecisionRepository'
 ]
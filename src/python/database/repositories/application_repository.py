@@ -1,8 +1,10 @@
-from typing import List, Optional, Type
+from typing import Iterator, List, Optional, Type
 from datetime import datetime, date, timezone
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from ..models import Component, SensorRecord, ClimateData, Producer, Crop, Application
+from .pagination import keyset_page, iter_rows
+from .projections import select_rows
 
 class ApplicationRepository:
     def __init__(self, session: Session):
@@ -20,12 +22,40 @@ class ApplicationRepository:
     def get_all(self) -> List[Type[Application]]:
         return self.session.query(Application).all()
 
+    def get_all_rows(self) -> List[dict]:
+        """Todos os registros como dicts simples (somente colunas, sem objetos ORM)."""
+        return select_rows(self.session, Application)
+
+    def get_rows_by_crop(self, crop_id: str) -> List[dict]:
+        return select_rows(self.session, Application, [Application.crop_id == crop_id])
+
     def get_by_crop(self, crop_id: str) -> List[Type[Application]]:
         return self.session.query(Application).filter(Application.crop_id == crop_id).all()
 
     def get_by_date_range(self, start_date: datetime, end_date: datetime) -> List[Type[Application]]:
         return self.session.query(Application).filter(Application.timestamp.between(start_date, end_date)).all()
 
+    def get_page(self, after_timestamp: datetime = None, after_id: str = None, limit: int = 500,
+                 start_date: datetime = None, end_date: datetime = None, crop_id: str = None) -> List[Type[Application]]:
+        """
+        Paginação por chave (keyset): passe o timestamp e o id do último item
+        da página anterior para obter a próxima, em ordem cronológica.
+        """
+        filters = []
+        if start_date and end_date:
+            filters.append(Application.timestamp.between(start_date, end_date))
+        if crop_id:
+            filters.append(Application.crop_id == crop_id)
+        return keyset_page(self.session, Application, after_timestamp, after_id, limit, filters)
+
+    def iter_by_date_range(self, start_date: datetime, end_date: datetime, chunk_size: int = 1000) -> Iterator[Application]:
+        """
+        Versão em streaming de get_by_date_range: gera os registros em blocos
+        com cursor no servidor, com uso de memória constante.
+        """
+        filters = [Application.timestamp >= start_date, Application.timestamp <= end_date]
+        return iter_rows(self.session, Application, filters, chunk_size)
+
     def get_by_type(self, type: str) -> List[Type[Application]]:
         return self.session.query(Application).filter(Application.type == type).all()
 
@@ -1,8 +1,15 @@
-from typing import List, Optional, Type
+import itertools
+import uuid
+import pandas as pd
+from typing import Iterable, Iterator, List, Optional, Type
 from sqlalchemy.orm import Session
-from sqlalchemy import func, Float
+from sqlalchemy import func, Float, insert
 from datetime import datetime, timezone
 from ..models import ClimateData
+from .pagination import keyset_page, iter_rows
+from .time_buckets import aggregate_frame, aggregate_series, merge_series
+from .projections import iter_frames, range_filters, select_recent_ids, select_rows
+from ..archive import ARCHIVE_DIR, count_tiered, iter_cold_frames, read_cold, read_tiered
 
 class ClimateDataRepository:
     def __init__(self, session: Session):
@@ -19,12 +26,47 @@ class ClimateDataRepository:
         self.session.commit()
         return data
 
+    def bulk_create(self, records: Iterable[dict], batch_size: int = 1000) -> int:
+        """
+        Insere registros climáticos em lote: um executemany e um commit por
+        lote. Lotes já confirmados permanecem gravados se um lote posterior falhar.
+        """
+        table = ClimateData.__table__
+        total = 0
+        batch = []
+        for data in records:
+            batch.append({
+                'id': data.get('id') or str(uuid.uuid4()),
+                'timestamp': data.get('timestamp') or datetime.now(timezone.utc),
+                'temperature': data['temperature'],
+                'air_humidity': data['air_humidity'],
+                'rain_forecast': data['rain_forecast']
+            })
+            if len(batch) >= batch_size:
+                self.session.execute(insert(table), batch)
+                self.session.commit()
+                total += len(batch)
+                batch = []
+        if batch:
+            self.session.execute(insert(table), batch)
+            self.session.commit()
+            total += len(batch)
+        return total
+
     def get_by_id(self, id: str) -> Optional[ClimateData]:
         return self.session.query(ClimateData).filter(ClimateData.id == id).first()
 
     def get_all(self) -> List[Type[ClimateData]]:
         return self.session.query(ClimateData).all()
 
+    def get_all_rows(self) -> List[dict]:
+        """Todos os registros como dicts simples (somente colunas, sem objetos ORM)."""
+        return select_rows(self.session, ClimateData, order_by=ClimateData.timestamp.desc())
+
+    def get_recent_ids(self, start_date: datetime = None, end_date: datetime = None, limit: int = 500) -> List[str]:
+        """Ids dos registros climáticos mais recentes do intervalo, do mais novo para o mais antigo."""
+        return select_recent_ids(self.session, ClimateData, range_filters(ClimateData, start_date, end_date), limit)
+
     def update(self, id: str, **kwargs) -> Optional[ClimateData]:
         data = self.get_by_id(id)
         if data:
@@ -48,6 +90,62 @@ class ClimateDataRepository:
             ClimateData.timestamp <= end_date
         ).all()
 
+    def get_page(self, after_timestamp: datetime = None, after_id: str = None, limit: int = 500,
+                 start_date: datetime = None, end_date: datetime = None) -> List[Type[ClimateData]]:
+        """
+        Paginação por chave (keyset): passe o timestamp e o id do último item
+        da página anterior para obter a próxima, em ordem cronológica.
+        """
+        filters = []
+        if start_date and end_date:
+            filters.append(ClimateData.timestamp.between(start_date, end_date))
+        return keyset_page(self.session, ClimateData, after_timestamp, after_id, limit, filters)
+
+    def iter_by_date_range(self, start_date: datetime, end_date: datetime, chunk_size: int = 1000) -> Iterator[ClimateData]:
+        """
+        Versão em streaming de get_by_date_range: gera os registros em blocos
+        com cursor no servidor, com uso de memória constante.
+        """
+        filters = [ClimateData.timestamp >= start_date, ClimateData.timestamp <= end_date]
+        return iter_rows(self.session, ClimateData, filters, chunk_size)
+
+    def read_frame(self, columns: List[str] = None, start_date: datetime = None, end_date: datetime = None,
+                   archive_dir: str = ARCHIVE_DIR) -> pd.DataFrame:
+        """
+        Dados climáticos como DataFrame, unindo o banco e o arquivo Parquet
+        (database/archive.py) e lendo apenas as colunas pedidas.
+        """
+        return read_tiered(self.session, ClimateData, columns, start_date, end_date, archive_dir=archive_dir)
+
+    def count_rows(self, start_date: datetime = None, end_date: datetime = None,
+                   archive_dir: str = ARCHIVE_DIR) -> int:
+        """Quantidade de registros climáticos no intervalo (banco + arquivo Parquet)."""
+        return count_tiered(self.session, ClimateData, start_date, end_date, archive_dir=archive_dir)
+
+    def read_series(self, bucket: str = '1h', start_date: datetime = None, end_date: datetime = None,
+                    archive_dir: str = ARCHIVE_DIR) -> List[dict]:
+        """Série por bucket de get_bucketed_series, incluindo os registros arquivados."""
+        metrics = ['temperature', 'air_humidity']
+        hot = self.get_bucketed_series(bucket, start_date, end_date)
+        archived = read_cold(self.session, ClimateData, ['timestamp'] + metrics, start_date, end_date,
+                             archive_dir=archive_dir)
+        return merge_series(metrics, aggregate_frame(archived, 'timestamp', metrics, bucket), hot)
+
+    def iter_frames(self, columns: List[str] = None, start_date: datetime = None, end_date: datetime = None,
+                    chunk_size: int = 50000) -> Iterator[pd.DataFrame]:
+        """Dados climáticos do banco em blocos de DataFrame, em ordem cronológica."""
+        filters = range_filters(ClimateData, start_date, end_date)
+        return iter_frames(self.session, ClimateData, filters, [ClimateData.timestamp, ClimateData.id],
+                           columns, chunk_size)
+
+    def iter_tiered_frames(self, columns: List[str] = None, start_date: datetime = None, end_date: datetime = None,
+                           chunk_size: int = 50000,
+                           archive_dir: str = ARCHIVE_DIR) -> Iterator[pd.DataFrame]:
+        """Dados climáticos do arquivo e do banco em blocos de DataFrame: primeiro os arquivados, depois os do banco."""
+        cold = iter_cold_frames(self.session, ClimateData, columns, start_date, end_date,
+                                archive_dir=archive_dir, chunk_size=chunk_size)
+        return itertools.chain(cold, self.iter_frames(columns, start_date, end_date, chunk_size))
+
     def get_latest(self) -> Optional[ClimateData]:
         return self.session.query(ClimateData).order_by(ClimateData.timestamp.desc()).first()
 
@@ -65,3 +163,17 @@ class ClimateDataRepository:
             'air_humidity': result.air_humidity or 0,
             'rain_forecast': result.rain_forecast or 0
         }
+
+    def get_bucketed_series(self, bucket: str = '1h', start_date: datetime = None, end_date: datetime = None) -> List[dict]:
+        """
+        Série reduzida: min/max/avg/count de temperatura e umidade do ar por
+        bucket ('1min', '1h' ou '1d'), calculada no banco.
+        """
+        filters = range_filters(ClimateData, start_date, end_date)
+        return aggregate_series(
+            self.session,
+            ClimateData.timestamp,
+            {'temperature': ClimateData.temperature, 'air_humidity': ClimateData.air_humidity},
+            bucket,
+            filters=filters
+        )
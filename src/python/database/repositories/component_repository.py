@@ -3,6 +3,7 @@ from datetime import datetime, date, timezone
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from ..models import Component, SensorRecord, ClimateData, Producer, Crop, Application
+from .projections import select_rows
 
 class ComponentRepository:
     def __init__(self, session: Session):
@@ -20,6 +21,13 @@ class ComponentRepository:
     def get_all(self) -> List[Type[Component]]:
         return self.session.query(Component).all()
 
+    def get_all_rows(self) -> List[dict]:
+        """Todos os registros como dicts simples (somente colunas, sem objetos ORM)."""
+        return select_rows(self.session, Component)
+
+    def get_rows_by_crop(self, crop_id: str) -> List[dict]:
+        return select_rows(self.session, Component, [Component.crop_id == crop_id])
+
     def get_by_type(self, type: str) -> List[Type[Component]]:
         return self.session.query(Component).filter(Component.type == type).all()
 
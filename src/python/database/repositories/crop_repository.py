@@ -2,6 +2,7 @@ from typing import List, Optional, Type
 from datetime import date
 from sqlalchemy.orm import Session
 from ..models import Crop
+from .projections import select_rows
 
 class CropRepository:
     def __init__(self, session: Session):
@@ -25,6 +26,10 @@ class CropRepository:
     def get_all(self) -> List[Type[Crop]]:
         return self.session.query(Crop).all()
 
+    def get_all_rows(self) -> List[dict]:
+        """Todos os registros como dicts simples (somente colunas, sem objetos ORM)."""
+        return select_rows(self.session, Crop)
+
     def update(self, id: str, **kwargs) -> Optional[Crop]:
         crop = self.get_by_id(id)
         if crop:
@@ -45,6 +50,9 @@ class CropRepository:
     def get_active_crops(self) -> List[Type[Crop]]:
         return self.session.query(Crop).filter(Crop.end_date.is_(None)).all()
 
+    def get_active_rows(self) -> List[dict]:
+        return select_rows(self.session, Crop, [Crop.end_date.is_(None)])
+
     def get_by_type(self, type: str) -> List[Type[Crop]]:
         return self.session.query(Crop).filter(Crop.type == type).all()
 
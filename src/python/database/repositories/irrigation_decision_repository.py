@@ -0,0 +1,50 @@
+import uuid
+import pandas as pd
+from typing import Iterable, List, Optional
+from sqlalchemy.orm import Session
+from datetime import datetime
+from ..models import IrrigationDecision
+from .projections import SensorFilter, range_filters, select_latest_frame, select_rows
+from sqlalchemy import delete, insert
+
+
+class IrrigationDecisionRepository:
+    def __init__(self, session: Session):
+        self.session = session
+
+    def bulk_create(self, records: Iterable[dict], batch_size: int = 5000) -> int:
+        """
+        Grava as decisões de uma rodada em lote: um executemany por lote e um
+        único commit ao final, para a rodada ficar visível inteira ou não ficar.
+        """
+        table = IrrigationDecision.__table__
+        total = 0
+        batch = []
+        for data in records:
+            batch.append({**data, 'id': data.get('id') or str(uuid.uuid4())})
+            if len(batch) >= batch_size:
+                self.session.execute(insert(table), batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            self.session.execute(insert(table), batch)
+            total += len(batch)
+        self.session.commit()
+        return total
+
+    def get_rows_by_run(self, run_id: str) -> List[dict]:
+        return select_rows(self.session, IrrigationDecision, [IrrigationDecision.run_id == run_id])
+
+    def get_latest_frame(self, columns: List[str] = None, sensor_id: SensorFilter = None) -> pd.DataFrame:
+        """Decisão mais recente de cada sensor, em uma única consulta com função de janela."""
+        filters = range_filters(IrrigationDecision, sensor_id=sensor_id)
+        return select_latest_frame(self.session, IrrigationDecision, IrrigationDecision.sensor_id,
+                                   [IrrigationDecision.decided_at.desc(), IrrigationDecision.id.desc()],
+                                   filters, columns)
+
+    def delete_older_than(self, cutoff: datetime) -> int:
+        """Remove as decisões anteriores a cutoff (cada rodada grava uma linha por sensor)."""
+        result = self.session.execute(delete(IrrigationDecision.__table__)
+                                      .where(IrrigationDecision.decided_at < cutoff))
+        self.session.commit()
+        return result.rowcount
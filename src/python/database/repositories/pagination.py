@@ -0,0 +1,38 @@
+from typing import Iterator, List, Optional
+from datetime import datetime
+from sqlalchemy import select, and_, or_
+from sqlalchemy.orm import Session
+
+
+def keyset_page(session: Session, model, after_timestamp: Optional[datetime] = None,
+                after_id: Optional[str] = None, limit: int = 500, filters: Optional[list] = None) -> List:
+    """
+    Retorna a próxima página ordenada por (timestamp, id) a partir do último
+    item visto. Diferente de OFFSET, o custo não cresce com o número da página:
+    o banco posiciona direto na chave pelo índice.
+    """
+    stmt = select(model).where(*(filters or []))
+    if after_timestamp is not None:
+        if after_id is None:
+            stmt = stmt.where(model.timestamp > after_timestamp)
+        else:
+            stmt = stmt.where(or_(
+                model.timestamp > after_timestamp,
+                and_(model.timestamp == after_timestamp, model.id > after_id)
+            ))
+    stmt = stmt.order_by(model.timestamp, model.id).limit(limit)
+    return session.scalars(stmt).all()
+
+
+def iter_rows(session: Session, model, filters: Optional[list] = None, chunk_size: int = 1000) -> Iterator:
+    """
+    Percorre os registros em blocos de chunk_size com cursor no servidor
+    (yield_per), mantendo em memória apenas o bloco corrente.
+    """
+    stmt = select(model).where(*(filters or [])).order_by(model.timestamp, model.id)
+    result = session.scalars(stmt.execution_options(yield_per=chunk_size))
+    try:
+        for partition in result.partitions():
+            yield from partition
+    finally:
+        result.close()
@@ -1,6 +1,7 @@
 from typing import List, Optional, Type
 from sqlalchemy.orm import Session
 from ..models import Producer
+from .projections import select_rows
 
 class ProducerRepository:
     def __init__(self, session: Session):
@@ -22,6 +23,10 @@ class ProducerRepository:
     def get_all(self) -> List[Type[Producer]]:
         return self.session.query(Producer).all()
 
+    def get_all_rows(self) -> List[dict]:
+        """Todos os registros como dicts simples (somente colunas, sem objetos ORM)."""
+        return select_rows(self.session, Producer)
+
     def update(self, id: str, **kwargs) -> Optional[Producer]:
         producer = self.get_by_id(id)
         if producer:
@@ -0,0 +1,145 @@
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+
+import pandas as pd
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, func, select
+from sqlalchemy.orm import Session
+
+# dtype do pandas para cada tipo de coluna (demais tipos ficam como object)
+PANDAS_DTYPES = [
+    (Boolean, 'bool'),
+    (Float, 'float64'),
+    (Integer, 'int64'),
+    (DateTime, 'datetime64[ns]'),
+    (Date, 'datetime64[ns]'),
+]
+
+
+# Um sensor ou uma lista de sensores (ex.: os sensores de uma cultura)
+SensorFilter = Union[str, Sequence[str], None]
+
+
+def range_filters(model, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
+                  sensor_id: SensorFilter = None) -> list:
+    """Predicados de intervalo de timestamp e de sensor(es) para as consultas do modelo."""
+    table = model.__table__
+    filters = []
+    if isinstance(sensor_id, str):
+        filters.append(table.c.sensor_id == sensor_id)
+    elif sensor_id is not None:
+        filters.append(table.c.sensor_id.in_(list(sensor_id)))
+    if start_date is not None:
+        filters.append(table.c.timestamp >= start_date)
+    if end_date is not None:
+        filters.append(table.c.timestamp <= end_date)
+    return filters
+
+
+def _columns(model, columns: Optional[List[str]] = None) -> list:
+    table = model.__table__
+    return [table.c[name] for name in columns] if columns else list(table.columns)
+
+
+def _statement(model, columns, filters, order_by):
+    stmt = select(*_columns(model, columns)).where(*(filters or []))
+    if order_by is not None:
+        stmt = stmt.order_by(*(order_by if isinstance(order_by, (list, tuple)) else [order_by]))
+    return stmt
+
+
+def select_rows(session: Session, model, filters: Optional[list] = None, order_by=None,
+                columns: Optional[List[str]] = None) -> List[dict]:
+    """
+    Lê apenas as colunas da tabela (sem montar objetos ORM nem passar pelo
+    identity map) e devolve dicts simples, prontos para serializar.
+    """
+    result = session.execute(_statement(model, columns, filters, order_by))
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result]
+
+
+def select_recent_ids(session: Session, model, filters: Optional[list] = None, limit: int = 500) -> List[str]:
+    """Ids dos limit registros mais recentes (por timestamp) que atendem aos filtros."""
+    table = model.__table__
+    stmt = (select(table.c.id).where(*(filters or []))
+            .order_by(table.c.timestamp.desc(), table.c.id.desc()).limit(limit))
+    return list(session.execute(stmt).scalars())
+
+
+def frame_dtypes(model, columns: Optional[List[str]] = None) -> Dict[str, str]:
+    """dtypes do pandas derivados dos tipos das colunas do modelo."""
+    dtypes = {}
+    for column in _columns(model, columns):
+        for sql_type, dtype in PANDAS_DTYPES:
+            if isinstance(column.type, sql_type):
+                dtypes[column.key] = dtype
+                break
+    return dtypes
+
+
+def select_frame(session: Session, model, filters: Optional[list] = None, order_by=None,
+                 columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Monta um DataFrame direto das tuplas do banco, com dtypes definidos pelo
+    modelo (float64, bool, datetime64) em vez de inferidos de objetos.
+    """
+    result = session.execute(_statement(model, columns, filters, order_by))
+    keys = list(result.keys())
+    return _typed_frame(result.all(), keys, frame_dtypes(model, keys))
+
+
+def select_latest_frame(session: Session, model, partition_by, order_by: list, filters: Optional[list] = None,
+                        columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Linha mais recente de cada grupo em uma única consulta: ROW_NUMBER() OVER
+    (PARTITION BY partition_by ORDER BY order_by) = 1, em vez de uma consulta
+    por grupo. order_by deve vir em ordem decrescente (ex.: timestamp.desc()).
+    """
+    rank = func.row_number().over(partition_by=partition_by, order_by=order_by).label('row_rank')
+    ranked = select(*_columns(model), rank).where(*(filters or [])).subquery()
+    keys = columns or [column.key for column in model.__table__.columns]
+    result = session.execute(select(*(ranked.c[key] for key in keys)).where(ranked.c.row_rank == 1))
+    return _typed_frame(result.all(), keys, frame_dtypes(model, keys))
+
+
+def iter_frames(session: Session, model, filters: Optional[list] = None, order_by=None,
+                columns: Optional[List[str]] = None, chunk_size: int = 50000) -> Iterator[pd.DataFrame]:
+    """
+    Versão em streaming de select_frame: percorre o resultado com cursor no
+    servidor (yield_per) e gera um DataFrame tipado por bloco de chunk_size
+    linhas, mantendo em memória apenas o bloco corrente.
+    """
+    stmt = _statement(model, columns, filters, order_by).execution_options(yield_per=chunk_size)
+    result = session.execute(stmt)
+    keys = list(result.keys())
+    dtypes = frame_dtypes(model, keys)
+    empty = True
+    try:
+        for partition in result.partitions():
+            empty = False
+            yield _typed_frame(partition, keys, dtypes)
+    finally:
+        result.close()
+    if empty:
+        # Sempre gera ao menos um bloco, para o consumidor conhecer as colunas
+        yield _typed_frame([], keys, dtypes)
+
+
+def _typed_frame(rows, keys: List[str], dtypes: Dict[str, str]) -> pd.DataFrame:
+    frame = pd.DataFrame.from_records(rows, columns=keys)
+    if frame.empty:
+        return frame.astype(dtypes)
+    for key, dtype in dtypes.items():
+        if dtype.startswith('datetime64'):
+            frame[key] = _to_datetime(frame[key])
+        elif not frame[key].isna().any():
+            frame[key] = frame[key].astype(dtype)
+    return frame
+
+
+def _to_datetime(values: pd.Series) -> pd.Series:
+    # Valores com fuso (gravados em UTC) são normalizados para UTC sem fuso
+    sample = values.first_valid_index()
+    if sample is not None and getattr(values[sample], 'tzinfo', None) is not None:
+        return pd.to_datetime(values, utc=True).dt.tz_localize(None)
+    return pd.to_datetime(values)
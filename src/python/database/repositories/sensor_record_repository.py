@@ -1,8 +1,15 @@
-from typing import List, Optional, Type
+import itertools
+import uuid
+import pandas as pd
+from typing import Iterable, Iterator, List, Optional, Type
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone
 from ..models import SensorRecord
-from sqlalchemy import func, Float
+from .pagination import keyset_page, iter_rows
+from .time_buckets import aggregate_frame, aggregate_series, merge_series
+from ..archive import ARCHIVE_DIR, count_tiered, iter_cold_frames, read_cold, read_tiered
+from .projections import SensorFilter, iter_frames, range_filters, select_latest_frame, select_recent_ids, select_rows
+from sqlalchemy import func, Float, insert
 
 class SensorRecordRepository:
     def __init__(self, session: Session):
@@ -22,12 +29,53 @@ class SensorRecordRepository:
         self.session.commit()
         return record
 
+    def bulk_create(self, records: Iterable[dict], batch_size: int = 1000) -> int:
+        """
+        Insere leituras em lote: um único executemany (array binding) e um
+        commit por lote, em vez de um add + commit por leitura.
+        Lotes já confirmados permanecem gravados caso um lote posterior falhe.
+        """
+        table = SensorRecord.__table__
+        total = 0
+        batch = []
+        for data in records:
+            batch.append({
+                'id': data.get('id') or str(uuid.uuid4()),
+                'sensor_id': data['sensor_id'],
+                'timestamp': data.get('timestamp') or datetime.now(timezone.utc),
+                'soil_moisture': data['soil_moisture'],
+                'phosphorus_present': data['phosphorus_present'],
+                'potassium_present': data['potassium_present'],
+                'soil_ph': data['soil_ph'],
+                'irrigation_status': data.get('irrigation_status', 'DESLIGADA')
+            })
+            if len(batch) >= batch_size:
+                self.session.execute(insert(table), batch)
+                self.session.commit()
+                total += len(batch)
+                batch = []
+        if batch:
+            self.session.execute(insert(table), batch)
+            self.session.commit()
+            total += len(batch)
+        return total
+
     def get_by_id(self, id: str) -> Optional[SensorRecord]:
         return self.session.query(SensorRecord).filter(SensorRecord.id == id).first()
 
     def get_all(self) -> List[Type[SensorRecord]]:
         return self.session.query(SensorRecord).all()
 
+    def get_all_rows(self) -> List[dict]:
+        """Todos os registros como dicts simples (somente colunas, sem objetos ORM)."""
+        return select_rows(self.session, SensorRecord)
+
+    def get_recent_ids(self, start_date: datetime = None, end_date: datetime = None,
+                       sensor_id: SensorFilter = None, limit: int = 500) -> List[str]:
+        """Ids das leituras mais recentes do intervalo, da mais nova para a mais antiga."""
+        return select_recent_ids(self.session, SensorRecord, range_filters(SensorRecord, start_date, end_date, sensor_id),
+                                 limit)
+
     def update(self, id: str, **kwargs) -> Optional[SensorRecord]:
         record = self.get_by_id(id)
         if record:
@@ -51,14 +99,90 @@ class SensorRecordRepository:
             SensorRecord.timestamp <= end_date
         ).all()
 
+    def get_page(self, after_timestamp: datetime = None, after_id: str = None, limit: int = 500,
+                 start_date: datetime = None, end_date: datetime = None, sensor_id: str = None) -> List[Type[SensorRecord]]:
+        """
+        Paginação por chave (keyset): passe o timestamp e o id do último item
+        da página anterior para obter a próxima, em ordem cronológica.
+        """
+        filters = []
+        if start_date and end_date:
+            filters.append(SensorRecord.timestamp.between(start_date, end_date))
+        if sensor_id:
+            filters.append(SensorRecord.sensor_id == sensor_id)
+        return keyset_page(self.session, SensorRecord, after_timestamp, after_id, limit, filters)
+
+    def iter_by_date_range(self, start_date: datetime, end_date: datetime, chunk_size: int = 1000) -> Iterator[SensorRecord]:
+        """
+        Versão em streaming de get_by_date_range: gera os registros em blocos
+        com cursor no servidor, com uso de memória constante.
+        """
+        filters = [SensorRecord.timestamp >= start_date, SensorRecord.timestamp <= end_date]
+        return iter_rows(self.session, SensorRecord, filters, chunk_size)
+
     def get_by_sensor(self, sensor_id: str) -> List[Type[SensorRecord]]:
         return self.session.query(SensorRecord).filter(SensorRecord.sensor_id == sensor_id).all()
 
+    def get_rows_by_sensor(self, sensor_id: str) -> List[dict]:
+        return select_rows(self.session, SensorRecord, [SensorRecord.sensor_id == sensor_id])
+
+    def read_frame(self, columns: List[str] = None, start_date: datetime = None, end_date: datetime = None,
+                   sensor_id: SensorFilter = None, archive_dir: str = ARCHIVE_DIR) -> pd.DataFrame:
+        """
+        Leituras como DataFrame, unindo o banco e o arquivo Parquet
+        (database/archive.py) e lendo apenas as colunas pedidas.
+        sensor_id aceita um sensor ou uma lista de sensores.
+        """
+        return read_tiered(self.session, SensorRecord, columns, start_date, end_date, sensor_id, archive_dir)
+
+    def count_rows(self, start_date: datetime = None, end_date: datetime = None,
+                   sensor_id: SensorFilter = None, archive_dir: str = ARCHIVE_DIR) -> int:
+        """Quantidade de leituras no intervalo (banco + arquivo Parquet)."""
+        return count_tiered(self.session, SensorRecord, start_date, end_date, sensor_id, archive_dir)
+
+    def read_series(self, bucket: str = '1h', sensor_id: SensorFilter = None, start_date: datetime = None,
+                    end_date: datetime = None, archive_dir: str = ARCHIVE_DIR) -> List[dict]:
+        """Série por bucket de get_bucketed_series, incluindo as leituras arquivadas."""
+        metrics = ['soil_moisture', 'soil_ph']
+        hot = self.get_bucketed_series(bucket, sensor_id, start_date, end_date)
+        archived = read_cold(self.session, SensorRecord, ['sensor_id', 'timestamp'] + metrics, start_date, end_date,
+                             sensor_id, archive_dir)
+        cold = aggregate_frame(archived, 'timestamp', metrics, bucket, group_key='sensor_id')
+        return merge_series(metrics, cold, hot, group_key='sensor_id')
+
+    def iter_frames(self, columns: List[str] = None, start_date: datetime = None, end_date: datetime = None,
+                    sensor_id: SensorFilter = None, chunk_size: int = 50000) -> Iterator[pd.DataFrame]:
+        """Leituras do banco em blocos de DataFrame, em ordem cronológica."""
+        filters = range_filters(SensorRecord, start_date, end_date, sensor_id)
+        return iter_frames(self.session, SensorRecord, filters, [SensorRecord.timestamp, SensorRecord.id],
+                           columns, chunk_size)
+
+    def iter_tiered_frames(self, columns: List[str] = None, start_date: datetime = None, end_date: datetime = None,
+                           sensor_id: SensorFilter = None, chunk_size: int = 50000,
+                           archive_dir: str = ARCHIVE_DIR) -> Iterator[pd.DataFrame]:
+        """Leituras do arquivo e do banco em blocos de DataFrame: primeiro os arquivados, depois os do banco."""
+        cold = iter_cold_frames(self.session, SensorRecord, columns, start_date, end_date, sensor_id,
+                                archive_dir=archive_dir, chunk_size=chunk_size)
+        return itertools.chain(cold, self.iter_frames(columns, start_date, end_date, sensor_id, chunk_size))
+
+    def get_latest(self) -> Optional[SensorRecord]:
+        return self.session.query(SensorRecord).order_by(SensorRecord.timestamp.desc()).first()
+
     def get_latest_by_sensor(self, sensor_id: str) -> Optional[SensorRecord]:
         return self.session.query(SensorRecord).filter(
             SensorRecord.sensor_id == sensor_id
         ).order_by(SensorRecord.timestamp.desc()).first()
 
+    def get_latest_frame(self, columns: List[str] = None, sensor_id: SensorFilter = None,
+                         start_date: datetime = None) -> pd.DataFrame:
+        """
+        Última leitura de cada sensor, em uma única consulta com função de janela.
+        Com start_date, só as leituras a partir dessa data entram na janela.
+        """
+        return select_latest_frame(self.session, SensorRecord, SensorRecord.sensor_id,
+                                   [SensorRecord.timestamp.desc(), SensorRecord.id.desc()],
+                                   range_filters(SensorRecord, start_date, sensor_id=sensor_id), columns)
+
     def get_average_values_by_sensor(self, sensor_id: str, start_date: datetime = None, end_date: datetime = None) -> dict:
         query = self.session.query(
             func.avg(SensorRecord.soil_moisture).label('soil_moisture'),
@@ -75,3 +199,18 @@ class SensorRecordRepository:
             'phosphorus_present': result.phosphorus_present or 0,
             'potassium_present': result.potassium_present or 0
         }
+
+    def get_bucketed_series(self, bucket: str = '1h', sensor_id: SensorFilter = None, start_date: datetime = None, end_date: datetime = None) -> List[dict]:
+        """
+        Série reduzida por sensor: min/max/avg/count de umidade e pH por bucket
+        ('1min', '1h' ou '1d'), calculada no banco.
+        """
+        filters = range_filters(SensorRecord, start_date, end_date, sensor_id)
+        return aggregate_series(
+            self.session,
+            SensorRecord.timestamp,
+            {'soil_moisture': SensorRecord.soil_moisture, 'soil_ph': SensorRecord.soil_ph},
+            bucket,
+            group_column=SensorRecord.sensor_id,
+            filters=filters
+        )
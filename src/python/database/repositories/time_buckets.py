@@ -0,0 +1,158 @@
+from typing import Dict, List, Optional
+from datetime import datetime, timedelta
+
+import pandas as pd
+from sqlalchemy import select, func, text
+from sqlalchemy.orm import Session
+
+# Tamanhos de bucket suportados e o formato equivalente em cada banco
+BUCKETS = ('1min', '1h', '1d')
+ORACLE_TRUNC_FORMATS = {'1min': 'MI', '1h': 'HH24', '1d': 'DD'}
+DATE_TRUNC_UNITS = {'1min': 'minute', '1h': 'hour', '1d': 'day'}
+PANDAS_FREQS = {'1min': 'min', '1h': 'h', '1d': 'D'}
+BUCKET_WIDTHS = {'1min': timedelta(minutes=1), '1h': timedelta(hours=1), '1d': timedelta(days=1)}
+
+
+def validate_bucket(bucket: str) -> str:
+    if bucket not in BUCKETS:
+        raise ValueError(f"Bucket inválido: {bucket}. Use um de {', '.join(BUCKETS)}")
+    return bucket
+
+
+def choose_bucket(start_date: datetime, end_date: datetime, max_points: int) -> str:
+    """Menor bucket que mantém o intervalo em até max_points pontos por série."""
+    span = end_date - start_date
+    for bucket in BUCKETS:
+        if span / BUCKET_WIDTHS[bucket] <= max_points:
+            return bucket
+    return BUCKETS[-1]
+
+
+def truncate_timestamp(value: datetime, bucket: str) -> datetime:
+    """Trunca um datetime no início do bucket (equivalente Python do TRUNC)."""
+    if bucket == '1min':
+        return value.replace(second=0, microsecond=0)
+    if bucket == '1h':
+        return value.replace(minute=0, second=0, microsecond=0)
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def bucket_expression(column, bucket: str, dialect_name: str):
+    """
+    Retorna a expressão SQL que trunca a coluna no bucket, ou None quando o
+    banco não tem função equivalente (ex.: SQLite) e a agregação deve ser feita
+    em Python. O formato é inserido como literal para que a mesma expressão
+    apareça idêntica no SELECT e no GROUP BY.
+    """
+    if dialect_name == 'oracle':
+        return func.trunc(column, text(f"'{ORACLE_TRUNC_FORMATS[bucket]}'"))
+    if dialect_name in ('postgresql', 'duckdb'):
+        return func.date_trunc(text(f"'{DATE_TRUNC_UNITS[bucket]}'"), column)
+    return None
+
+
+def aggregate_series(session: Session, timestamp_column, metrics: Dict[str, object], bucket: str,
+                     group_column=None, filters: Optional[list] = None) -> List[dict]:
+    """
+    Agrega métricas por bucket de tempo (e opcionalmente por grupo), retornando
+    min/max/avg/count por bucket. Usa TRUNC/date_trunc + GROUP BY no banco e
+    recorre a uma agregação em Python, lendo só as colunas necessárias, nos
+    bancos sem truncamento de datas.
+    """
+    validate_bucket(bucket)
+    filters = filters or []
+    group_key = group_column.key if group_column is not None else None
+    bucket_expr = bucket_expression(timestamp_column, bucket, session.get_bind().dialect.name)
+
+    if bucket_expr is not None:
+        keys = ([group_column] if group_column is not None else []) + [bucket_expr]
+        columns = [bucket_expr.label('bucket'), func.count().label('count')]
+        for name, column in metrics.items():
+            columns += [
+                func.min(column).label(f'{name}_min'),
+                func.max(column).label(f'{name}_max'),
+                func.avg(column).label(f'{name}_avg')
+            ]
+        if group_column is not None:
+            columns.insert(0, group_column)
+        stmt = select(*columns).where(*filters).group_by(*keys).order_by(*keys)
+        return [dict(row) for row in session.execute(stmt).mappings()]
+
+    # Fallback em Python: uma passada com acumuladores por (grupo, bucket)
+    columns = ([group_column] if group_column is not None else []) + [timestamp_column] + list(metrics.values())
+    stmt = select(*columns).where(*filters).execution_options(yield_per=5000)
+    accumulators = {}
+    for row in session.execute(stmt):
+        group = row[0] if group_column is not None else None
+        offset = 1 if group_column is not None else 0
+        key = (group, truncate_timestamp(row[offset], bucket))
+        values = row[offset + 1:]
+        acc = accumulators.get(key)
+        if acc is None:
+            accumulators[key] = [1, list(values), list(values), list(values)]
+            continue
+        acc[0] += 1
+        for i, value in enumerate(values):
+            acc[1][i] = min(acc[1][i], value)
+            acc[2][i] = max(acc[2][i], value)
+            acc[3][i] += value
+
+    series = []
+    for (group, bucket_start), (count, mins, maxs, sums) in sorted(
+            accumulators.items(), key=lambda item: (item[0][0] or '', item[0][1])):
+        point = {'bucket': bucket_start, 'count': count}
+        if group_key:
+            point = {group_key: group, **point}
+        for i, name in enumerate(metrics):
+            point[f'{name}_min'] = mins[i]
+            point[f'{name}_max'] = maxs[i]
+            point[f'{name}_avg'] = sums[i] / count
+        series.append(point)
+    return series
+
+
+def aggregate_frame(frame: pd.DataFrame, timestamp_column: str, metrics: List[str], bucket: str,
+                    group_key: Optional[str] = None) -> List[dict]:
+    """
+    Mesma agregação de aggregate_series (min/max/avg/count por bucket) sobre
+    um DataFrame já carregado, como o lido do arquivo Parquet.
+    """
+    validate_bucket(bucket)
+    if frame.empty:
+        return []
+    keys = ([group_key] if group_key else []) + ['bucket']
+    frame = frame.assign(bucket=pd.to_datetime(frame[timestamp_column]).dt.floor(PANDAS_FREQS[bucket]))
+    grouped = frame.groupby(keys, sort=True)
+    result = grouped.size().rename('count').to_frame()
+    for name in metrics:
+        result[f'{name}_min'] = grouped[name].min()
+        result[f'{name}_max'] = grouped[name].max()
+        result[f'{name}_avg'] = grouped[name].mean()
+    series = result.reset_index().to_dict('records')
+    for point in series:
+        point['bucket'] = point['bucket'].to_pydatetime()
+    return series
+
+
+def merge_series(metrics: List[str], *series: List[dict], group_key: Optional[str] = None) -> List[dict]:
+    """
+    Une séries agregadas de camadas diferentes (banco e arquivo). Buckets
+    presentes em mais de uma série são combinados: min/max entre as partes e
+    média ponderada pela contagem.
+    """
+    merged = {}
+    for points in series:
+        for point in points:
+            key = (point.get(group_key) if group_key else None, point['bucket'])
+            current = merged.get(key)
+            if current is None:
+                merged[key] = dict(point)
+                continue
+            count = current['count'] + point['count']
+            for name in metrics:
+                current[f'{name}_min'] = min(current[f'{name}_min'], point[f'{name}_min'])
+                current[f'{name}_max'] = max(current[f'{name}_max'], point[f'{name}_max'])
+                current[f'{name}_avg'] = (current[f'{name}_avg'] * current['count']
+                                          + point[f'{name}_avg'] * point['count']) / count
+            current['count'] = count
+    return [merged[key] for key in sorted(merged, key=lambda key: (key[0] or '', key[1]))]
@@ -1,73 +1,207 @@
-from database.oracle import db
-from database.models import Component, SensorRecord, ClimateData, Application, Producer, Crop
-from datetime import datetime, timezone, timedelta
+"""
+Carga inicial do banco.
+
+run_seed insere o pequeno conjunto de demonstração apenas se o banco
+ainda não tiver produtores. seed_scale popula N produtores, culturas e
+componentes com volumes realistas de leituras e dados climáticos, tudo
+por inserts em lote, para preparar ambientes de teste de desempenho.
+Nenhum dos dois apaga dados.
+
+Uso:
+    python -m database.seed                                        # dados de demonstração
+    python -m database.seed --producers 50 --days 90 --seed 42     # carga em escala
+"""
+import argparse
+import time
 import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from database.oracle import db, get_session
+from database.models import Component, SensorRecord, ClimateData, Application, Producer, Crop
+from services.sample_data import reading_timestamps, write_readings
+
+# Culturas (nome, tipo) e insumos sorteados na carga em escala
+CROP_TYPES = [("Milho", "Grão"), ("Soja", "Grão"), ("Café", "Perene"), ("Cana-de-açúcar", "Semiperene"),
+              ("Algodão", "Fibra"), ("Feijão", "Grão"), ("Laranja", "Perene")]
+APPLICATION_TYPES = ["Fertilizante", "Defensivo", "Corretivo"]
+FIRST_NAMES = ["João", "Maria", "Ana", "Pedro", "Carla", "Lucas", "Fernanda", "Rafael", "Juliana", "Marcos"]
+LAST_NAMES = ["Silva", "Oliveira", "Souza", "Santos", "Pereira", "Costa", "Almeida", "Ferreira", "Lima", "Gomes"]
+
+
+def demo_data() -> List[list]:
+    """Objetos do conjunto de demonstração, na ordem de inserção (pais antes dos filhos)."""
+    now = datetime.now(timezone.utc)
+
+    producers = [
+        Producer(id=str(uuid.uuid4()), name="João Silva", email="joao.silva@email.com", phone="(11) 99999-9999"),
+        Producer(id=str(uuid.uuid4()), name="Maria Oliveira", email="maria.oliveira@email.com", phone="(21) 98888-8888")
+    ]
+
+    crops = [
+        Crop(id=str(uuid.uuid4()), name="Milho", type="Grão", start_date=datetime(2024, 1, 1).date(), producer_id=producers[0].id),
+        Crop(id=str(uuid.uuid4()), name="Soja", type="Grão", start_date=datetime(2024, 2, 1).date(), producer_id=producers[1].id)
+    ]
+
+    components = [
+        Component(id=str(uuid.uuid4()), name='Sensor de Umidade', type='Sensor', crop_id=crops[0].id),
+        Component(id=str(uuid.uuid4()), name='Atuador da Bomba', type='Actuator', crop_id=crops[0].id),
+        Component(id=str(uuid.uuid4()), name='Sensor de pH', type='Sensor', crop_id=crops[1].id),
+        Component(id=str(uuid.uuid4()), name='Controle Central', type='Actuator', crop_id=crops[1].id),
+        Component(id=str(uuid.uuid4()), name='Relé de Irrigação', type='Actuator', crop_id=crops[0].id),
+        Component(id=str(uuid.uuid4()), name='Sensor de Nutrientes', type='Sensor', crop_id=crops[1].id),
+        Component(id=str(uuid.uuid4()), name='Detector de Fósforo', type='Sensor', crop_id=crops[0].id),
+        Component(id=str(uuid.uuid4()), name='Detector de Potássio', type='Sensor', crop_id=crops[1].id),
+        Component(id=str(uuid.uuid4()), name='Sensor Ambiental', type='Sensor', crop_id=crops[0].id),
+        Component(id=str(uuid.uuid4()), name='Atuador de Emergência', type='Actuator', crop_id=crops[1].id)
+    ]
+
+    sensor_records = [
+        SensorRecord(id=str(uuid.uuid4()), sensor_id=components[0].id, soil_moisture=0.12, phosphorus_present=True, potassium_present=True, soil_ph=5.5, irrigation_status="ATIVADA", timestamp=now - timedelta(days=0)),
+        SensorRecord(id=str(uuid.uuid4()), sensor_id=components[2].id, soil_moisture=0.15, phosphorus_present=False, potassium_present=False, soil_ph=6.0, irrigation_status="DESLIGADA", timestamp=now - timedelta(days=1)),
+        SensorRecord(id=str(uuid.uuid4()), sensor_id=components[0].id, soil_moisture=0.19, phosphorus_present=True, potassium_present=False, soil_ph=6.5, irrigation_status="ATIVADA", timestamp=now - timedelta(days=2)),
+        SensorRecord(id=str(uuid.uuid4()), sensor_id=components[2].id, soil_moisture=0.22, phosphorus_present=False, potassium_present=True, soil_ph=7.0, irrigation_status="DESLIGADA", timestamp=now - timedelta(days=3))
+    ]
+
+    climate_records = [
+        ClimateData(id=str(uuid.uuid4()), temperature=20.0, air_humidity=45.0, rain_forecast=True, timestamp=now - timedelta(days=0)),
+        ClimateData(id=str(uuid.uuid4()), temperature=21.8, air_humidity=48.2, rain_forecast=False, timestamp=now - timedelta(days=1)),
+        ClimateData(id=str(uuid.uuid4()), temperature=23.6, air_humidity=51.4, rain_forecast=True, timestamp=now - timedelta(days=2)),
+        ClimateData(id=str(uuid.uuid4()), temperature=25.4, air_humidity=54.6, rain_forecast=False, timestamp=now - timedelta(days=3))
+    ]
+
+    applications = [
+        Application(id=str(uuid.uuid4()), crop_id=crops[0].id, timestamp=now - timedelta(days=0), type="Fertilizante", quantity=100.0),
+        Application(id=str(uuid.uuid4()), crop_id=crops[1].id, timestamp=now - timedelta(days=1), type="Defensivo", quantity=150.0)
+    ]
+
+    return [producers, crops, components, sensor_records, climate_records, applications]
+
 
-# Criando dados dos produtores
-producers = [
-    Producer(id=str(uuid.uuid4()), name="João Silva", email="joao.silva@email.com", phone="(11) 99999-9999"),
-    Producer(id=str(uuid.uuid4()), name="Maria Oliveira", email="maria.oliveira@email.com", phone="(21) 98888-8888")
-]
-
-# Criando dados das culturas
-crops = [
-    Crop(id=str(uuid.uuid4()), name="Milho", type="Grão", start_date=datetime(2024, 1, 1).date(), producer_id=producers[0].id),
-    Crop(id=str(uuid.uuid4()), name="Soja", type="Grão", start_date=datetime(2024, 2, 1).date(), producer_id=producers[1].id)
-]
-
-# Criando dados dos componentes
-components = [
-    Component(id=str(uuid.uuid4()), name='Sensor de Umidade', type='Sensor', crop_id=crops[0].id),
-    Component(id=str(uuid.uuid4()), name='Atuador da Bomba', type='Actuator', crop_id=crops[0].id),
-    Component(id=str(uuid.uuid4()), name='Sensor de pH', type='Sensor', crop_id=crops[1].id),
-    Component(id=str(uuid.uuid4()), name='Controle Central', type='Actuator', crop_id=crops[1].id),
-    Component(id=str(uuid.uuid4()), name='Relé de Irrigação', type='Actuator', crop_id=crops[0].id),
-    Component(id=str(uuid.uuid4()), name='Sensor de Nutrientes', type='Sensor', crop_id=crops[1].id),
-    Component(id=str(uuid.uuid4()), name='Detector de Fósforo', type='Sensor', crop_id=crops[0].id),
-    Component(id=str(uuid.uuid4()), name='Detector de Potássio', type='Sensor', crop_id=crops[1].id),
-    Component(id=str(uuid.uuid4()), name='Sensor Ambiental', type='Sensor', crop_id=crops[0].id),
-    Component(id=str(uuid.uuid4()), name='Atuador de Emergência', type='Actuator', crop_id=crops[1].id)
-]
-
-# Criando dados dos registros de sensores
-sensor_records = [
-    SensorRecord(id=str(uuid.uuid4()), sensor_id=components[0].id, soil_moisture=0.12, phosphorus_present=True, potassium_present=True, soil_ph=5.5, irrigation_status="ATIVADA", timestamp=datetime.now(timezone.utc) - timedelta(days=0)),
-    SensorRecord(id=str(uuid.uuid4()), sensor_id=components[2].id, soil_moisture=0.15, phosphorus_present=False, potassium_present=False, soil_ph=6.0, irrigation_status="DESLIGADA", timestamp=datetime.now(timezone.utc) - timedelta(days=1)),
-    SensorRecord(id=str(uuid.uuid4()), sensor_id=components[0].id, soil_moisture=0.19, phosphorus_present=True, potassium_present=False, soil_ph=6.5, irrigation_status="ATIVADA", timestamp=datetime.now(timezone.utc) - timedelta(days=2)),
-    SensorRecord(id=str(uuid.uuid4()), sensor_id=components[2].id, soil_moisture=0.22, phosphorus_present=False, potassium_present=True, soil_ph=7.0, irrigation_status="DESLIGADA", timestamp=datetime.now(timezone.utc) - timedelta(days=3))
-]
-
-# Criando dados dos registros climáticos
-climate_records = [
-    ClimateData(id=str(uuid.uuid4()), temperature=20.0, air_humidity=45.0, rain_forecast=True, timestamp=datetime.now(timezone.utc) - timedelta(days=0)),
-    ClimateData(id=str(uuid.uuid4()), temperature=21.8, air_humidity=48.2, rain_forecast=False, timestamp=datetime.now(timezone.utc) - timedelta(days=1)),
-    ClimateData(id=str(uuid.uuid4()), temperature=23.6, air_humidity=51.4, rain_forecast=True, timestamp=datetime.now(timezone.utc) - timedelta(days=2)),
-    ClimateData(id=str(uuid.uuid4()), temperature=25.4, air_humidity=54.6, rain_forecast=False, timestamp=datetime.now(timezone.utc) - timedelta(days=3))
-]
-
-# Criando dados das aplicações
-applications = [
-    Application(id=str(uuid.uuid4()), crop_id=crops[0].id, timestamp=datetime.now(timezone.utc) - timedelta(days=0), type="Fertilizante", quantity=100.0),
-    Application(id=str(uuid.uuid4()), crop_id=crops[1].id, timestamp=datetime.now(timezone.utc) - timedelta(days=1), type="Defensivo", quantity=150.0)
-]
-
-def run_seed():
+def run_seed(session: Optional[Session] = None) -> bool:
+    """Insere os dados de demonstração se ainda não houver produtores. Retorna se inseriu."""
+    session = session or db.session
     try:
-        with db.session.begin():
-            db.session.add_all(producers)
-            db.session.add_all(crops)
-            db.session.add_all(components)
-            db.session.add_all(sensor_records)
-            db.session.add_all(climate_records)
-            db.session.add_all(applications)
+        if session.execute(select(func.count()).select_from(Producer.__table__)).scalar():
+            print("ℹ️ Banco já possui dados; seed de demonstração ignorada.")
+            return False
+        for objects in demo_data():
+            session.add_all(objects)
+        session.commit()
 
         print("✅ Banco populado com sucesso.")
-        return
+        return True
 
     except Exception as e:
-        db.session.rollback()
+        session.rollback()
         print(f"❌ Erro ao popular banco de dados: {e}")
+        return False
+
+
+def _bulk_insert(session: Session, model, rows: List[dict], batch_size: int):
+    for start in range(0, len(rows), batch_size):
+        session.execute(insert(model.__table__), rows[start:start + batch_size])
+    session.commit()
+
+
+def seed_scale(session: Session, producers: int = 10, crops_per_producer: int = 3, sensors_per_crop: int = 4,
+               actuators_per_crop: int = 1, days: int = 30, interval_minutes: int = 60,
+               seed: Optional[int] = None, batch_size: int = 100_000) -> Dict[str, float]:
+    """
+    Acrescenta ao banco produtores, culturas, componentes e aplicações
+    sintéticos e, para cada sensor, uma leitura a cada interval_minutes nos
+    últimos days dias (com o clima correspondente), gerados de forma
+    vetorizada e gravados por inserts em lote. Retorna as contagens e a vazão.
+    """
+    rng = np.random.default_rng(seed)
+    started = time.perf_counter()
+    today = date.today()
+    # Mesmo relógio (UTC) dos dados de demonstração, sem fuso como nos repositórios
+    end_time = datetime.now(timezone.utc).replace(tzinfo=None, minute=0, second=0, microsecond=0)
+
+    producer_rows = []
+    for index in range(producers):
+        first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        producer_rows.append({
+            'id': str(uuid.uuid4()),
+            'name': f"{first_name} {last_name}",
+            'email': f"{first_name.lower()}.{last_name.lower()}.{index + 1}@email.com",
+            'phone': f"({rng.integers(11, 99)}) 9{rng.integers(1000, 9999)}-{rng.integers(1000, 9999)}",
+        })
+
+    crop_rows = []
+    for producer in producer_rows:
+        for crop_index in rng.integers(0, len(CROP_TYPES), crops_per_producer):
+            name, crop_type = CROP_TYPES[crop_index]
+            crop_rows.append({
+                'id': str(uuid.uuid4()),
+                'name': name,
+                'type': crop_type,
+                'start_date': today - timedelta(days=int(rng.integers(days, days + 365))),
+                'end_date': None,
+                'producer_id': producer['id'],
+            })
+
+    component_rows = []
+    for crop in crop_rows:
+        for kind, count in (('Sensor', sensors_per_crop), ('Actuator', actuators_per_crop)):
+            label = 'Sensor' if kind == 'Sensor' else 'Atuador'
+            component_rows += [{'id': str(uuid.uuid4()), 'name': f"{label} {crop['name']} {number + 1}",
+                                'type': kind, 'crop_id': crop['id']} for number in range(count)]
+
+    # Uma aplicação de insumo por cultura a cada semana do período
+    application_rows = [{
+        'id': str(uuid.uuid4()),
+        'crop_id': crop['id'],
+        'timestamp': end_time - timedelta(days=int(rng.integers(0, days)), hours=int(rng.integers(0, 24))),
+        'type': APPLICATION_TYPES[rng.integers(0, len(APPLICATION_TYPES))],
+        'quantity': round(float(rng.uniform(20, 300)), 1),
+    } for crop in crop_rows for _ in range(max(1, days // 7))]
+
+    for model, rows in ((Producer, producer_rows), (Crop, crop_rows),
+                        (Component, component_rows), (Application, application_rows)):
+        _bulk_insert(session, model, rows, batch_size)
+
+    stats = {'producers': len(producer_rows), 'crops': len(crop_rows),
+             'components': len(component_rows), 'applications': len(application_rows)}
+    sensor_ids = [row['id'] for row in component_rows if row['type'] == 'Sensor']
+    if sensor_ids:
+        timestamps = reading_timestamps(end_time - timedelta(days=days), days, interval_minutes, rng)
+        readings = write_readings(session, sensor_ids, timestamps, rng, batch_size=batch_size)
+        stats.update(climate_records=readings['climate_records'], sensor_records=readings['sensor_records'])
+
+    stats['seconds'] = time.perf_counter() - started
+    total = sum(value for key, value in stats.items() if key != 'seconds')
+    stats['rows_per_second'] = total / stats['seconds'] if stats['seconds'] else 0.0
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Popula o banco com dados de demonstração ou em escala")
+    parser.add_argument("--producers", type=int, default=0,
+                        help="produtores sintéticos a criar (0 = apenas dados de demonstração)")
+    parser.add_argument("--crops-per-producer", type=int, default=3)
+    parser.add_argument("--sensors-per-crop", type=int, default=4)
+    parser.add_argument("--actuators-per-crop", type=int, default=1)
+    parser.add_argument("--days", type=int, default=30, help="dias de histórico de leituras")
+    parser.add_argument("--interval-minutes", type=int, default=60, help="intervalo entre leituras")
+    parser.add_argument("--seed", type=int, default=None, help="semente para dados reprodutíveis")
+    args = parser.parse_args()
+
+    if not args.producers:
+        run_seed()
+        return
+    stats = seed_scale(get_session(), args.producers, args.crops_per_producer, args.sensors_per_crop,
+                       args.actuators_per_crop, args.days, args.interval_minutes, args.seed)
+    print(f"✅ {stats['producers']} produtores, {stats['crops']} culturas, {stats['components']} componentes, "
+          f"{stats['applications']} aplicações")
+    print(f"🧪 {stats.get('sensor_records', 0):,} leituras e {stats.get('climate_records', 0):,} registros climáticos")
+    print(f"⚡ {stats['seconds']:.1f}s | {stats['rows_per_second']:,.0f} linhas/s")
 
 
 if __name__ == "__main__":
-    run_seed()
+    main()
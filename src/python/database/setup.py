@@ -1,7 +1,74 @@
+"""
+Criação e manutenção do esquema do banco.
+
+ensure_schema é idempotente: cria apenas as tabelas, índices e sequências
+que ainda não existem e nunca remove dados, então pode rodar a cada
+inicialização. reset_database (drop + create) fica para quando se quer
+explicitamente recomeçar do zero.
+
+Uso:
+    python -m database.setup            # cria o que faltar
+    python -m database.setup --reset    # apaga e recria todas as tabelas
+"""
+import argparse
+import logging
+from typing import Dict, List
+
+from sqlalchemy import Sequence, inspect
+
 from database.models import Base
 from database.oracle import db
 
-import logging
+logger = logging.getLogger(__name__)
+
+# Sequências usadas pelo esquema no Oracle (ignoradas em bancos sem sequências)
+SEQUENCES = [
+    'producer_seq',
+    'crop_seq',
+    'component_seq',
+    'sensor_record_seq',
+    'application_seq'
+]
+
+
+def ensure_schema(engine=None) -> Dict[str, List[str]]:
+    """
+    Cria as tabelas, índices e sequências ausentes e devolve os nomes do que
+    foi criado. Índices novos em tabelas que já existem (que o create_all não
+    cria) são detectados pelo inspector e criados individualmente.
+    """
+    engine = engine or db.engine
+    created = {'tables': [], 'indexes': [], 'sequences': []}
+
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        existing_tables = set(inspector.get_table_names())
+        missing_tables = [table for table in Base.metadata.sorted_tables if table.name not in existing_tables]
+        # Tabelas novas já são criadas com os próprios índices
+        Base.metadata.create_all(conn, tables=missing_tables, checkfirst=True)
+        created['tables'] = [table.name for table in missing_tables]
+
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing_indexes = {index['name'].lower() for index in inspector.get_indexes(table.name)}
+            for index in sorted(table.indexes, key=lambda idx: idx.name):
+                if index.name.lower() not in existing_indexes:
+                    index.create(conn)
+                    created['indexes'].append(index.name)
+
+        if conn.dialect.supports_sequences:
+            existing_sequences = {name.lower() for name in inspector.get_sequence_names()}
+            for name in SEQUENCES:
+                if name not in existing_sequences:
+                    Sequence(name).create(conn, checkfirst=False)
+                    created['sequences'].append(name)
+
+    for kind, names in created.items():
+        if names:
+            logger.info(f"{kind} criados: {', '.join(names)}")
+    return created
+
 
 def create_all_tables():
     """
@@ -35,5 +102,12 @@ def reset_database():
     create_all_tables()
 
 if __name__ == "__main__":
-    drop_all_tables()
-    create_all_tables()
+    parser = argparse.ArgumentParser(description="Cria ou recria o esquema do banco")
+    parser.add_argument("--reset", action="store_true", help="apaga e recria todas as tabelas (perde os dados)")
+    args = parser.parse_args()
+
+    if args.reset:
+        reset_database()
+    else:
+        for kind, names in ensure_schema().items():
+            print(f"🧱 {kind}: {', '.join(names) if names else 'nada a criar'}")
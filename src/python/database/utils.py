@@ -1,22 +1,42 @@
-from sqlalchemy.schema import CreateTable
+from sqlalchemy.dialects import oracle
+from sqlalchemy.schema import CreateTable, CreateIndex
 from database.models import Base, Component, SensorRecord, ClimateData
-from database.oracle import db
 import os
 
+# Tabelas de séries temporais que podem ser particionadas por mês no Oracle
+PARTITIONED_TABLES = ("sensor_records", "climate_data")
+PARTITION_CLAUSE = (
+    "PARTITION BY RANGE (timestamp) INTERVAL (NUMTOYMINTERVAL(1, 'MONTH'))\n"
+    "(PARTITION p_initial VALUES LESS THAN (DATE '2024-01-01'))"
+)
 
-def generate_ddl(output_dir="generated"):
+
+def generate_ddl(output_dir="generated", partition_by_month=False, dialect=None):
     """
-    Gera os comandos SQL (DDL) para criar as tabelas baseadas nos models.
+    Gera os comandos SQL (DDL) para criar as tabelas e índices baseados nos models.
     Salva o resultado em um arquivo DDL.
+
+    Com partition_by_month=True, as tabelas de séries temporais recebem
+    particionamento por intervalo mensal (Oracle) e seus índices são LOCAL.
     """
+    dialect = dialect or oracle.dialect()
     os.makedirs(output_dir, exist_ok=True)
     ddl_path = os.path.join(output_dir, "schema.ddl")
 
     with open(ddl_path, "w", encoding="utf-8") as file:
         for table in Base.metadata.sorted_tables:
-            ddl_statement = str(CreateTable(table).compile(db.engine))
+            partitioned = partition_by_month and table.name in PARTITIONED_TABLES
+            ddl_statement = str(CreateTable(table).compile(dialect=dialect))
+            if partitioned:
+                ddl_statement = f"{ddl_statement.rstrip()}\n{PARTITION_CLAUSE}\n\n"
             file.write(f"{ddl_statement};\n\n")
 
+            for index in sorted(table.indexes, key=lambda idx: idx.name):
+                index_statement = str(CreateIndex(index).compile(dialect=dialect))
+                if partitioned:
+                    index_statement += " LOCAL"
+                file.write(f"{index_statement};\n\n")
+
     print(f"Arquivo DDL gerado em: {ddl_path}")
 
 
@@ -36,9 +56,17 @@ def print_mer():
                 foreign_table = list(column.foreign_keys)[0].column.table.name
                 col_info += f" [FK -> {foreign_table}]"
             print(col_info)
+        for index in table.indexes:
+            print(f"  * índice {index.name} ({', '.join(column.name for column in index.columns)})")
         print()
 
 
 if __name__ == "__main__":
-    generate_ddl()
-    print_mer()
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Gera o DDL e exibe o MER.")
+    parser.add_argument("--partition", action="store_true", help="particiona séries temporais por mês (Oracle)")
+    args = parser.parse_args()
+
+    generate_ddl(partition_by_month=args.partition)
+    print_mer()
@@ -2,154 +2,73 @@
 """
 Script para gerar dados de exemplo para treinar o modelo de Machine Learning
 FarmTech Solutions - Fase 4
+
+As leituras são geradas de forma vetorizada com NumPy, em blocos, e
+gravadas no banco com inserts em lote ou direto no arquivo Parquet
+(mesmo layout de database/archive.py, lido junto com o banco).
+
+Uso:
+    python generate_sample_data.py                          # 1 sensor, 30 dias, 5 leituras/dia
+    python generate_sample_data.py --sensors 200 --days 365 --interval-minutes 10 --seed 42
+    python generate_sample_data.py --sensors 200 --days 365 --interval-minutes 10 --parquet archive
 """
 
-import random
-from datetime import datetime, timedelta
+import argparse
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import numpy as np
+
 from database.oracle import get_session
-from services.climate_service import ClimateService
-from services.sensor_service import SensorRecordService
-from services.component_service import ComponentService
+from services.sample_data import ensure_sensors, reading_timestamps, write_readings
+
 
-def generate_sample_data():
+def generate_sample_data(sensors: int = 1, days: int = 30, interval_minutes: Optional[int] = None,
+                         seed: Optional[int] = None, parquet_dir: Optional[str] = None,
+                         batch_size: int = 100_000) -> dict:
     """
     Gera dados de exemplo para treinar o modelo de ML
     """
     session = get_session()
-    climate_service = ClimateService(session)
-    sensor_service = SensorRecordService(session)
-    component_service = ComponentService(session)
-    
+    rng = np.random.default_rng(seed)
+
     print("🌾 Gerando dados de exemplo para FarmTech Solutions - Fase 4")
     print("=" * 60)
-    
-    # Criar um sensor de exemplo se não existir
-    print("🔧 Criando sensor de exemplo...")
-    existing_sensors = component_service.list_components()
-    sensor_id = None
-    
-    if existing_sensors:
-        sensor_id = existing_sensors[0]['id']
-        print(f"✅ Usando sensor existente: {sensor_id}")
-    else:
-        # Criar novo sensor
-        sensor_data = {
-            "name": "Sensor Principal",
-            "type": "Sensor",
-            "crop_id": None
-        }
-        new_sensor = component_service.create_component(sensor_data)
-        sensor_id = new_sensor['id']
-        print(f"✅ Sensor criado: {sensor_id}")
-    
-    # Limpar dados existentes (opcional)
-    print("🗑️ Limpando dados existentes...")
-    # climate_service.delete_all()  # Descomente se quiser limpar
-    # sensor_service.delete_all()   # Descomente se quiser limpar
-    
-    # Gerar dados para os últimos 30 dias
-    start_date = datetime.now() - timedelta(days=30)
-    current_date = start_date
-    
-    print(f"📅 Gerando dados de {start_date.strftime('%d/%m/%Y')} até hoje")
-    
-    climate_records = 0
-    sensor_records = 0
-    
-    while current_date <= datetime.now():
-        # Gerar múltiplas leituras por dia (a cada 4 horas)
-        for hour in [6, 10, 14, 18, 22]:
-            timestamp = current_date.replace(hour=hour, minute=random.randint(0, 59))
-            
-            # Dados climáticos realistas
-            # Temperatura varia ao longo do dia (mais quente à tarde)
-            base_temp = 20
-            if hour == 6:  # Manhã
-                temperature = base_temp + random.uniform(-2, 5)
-            elif hour == 10:  # Meio da manhã
-                temperature = base_temp + random.uniform(2, 8)
-            elif hour == 14:  # Tarde (mais quente)
-                temperature = base_temp + random.uniform(8, 15)
-            elif hour == 18:  # Final da tarde
-                temperature = base_temp + random.uniform(3, 10)
-            else:  # Noite
-                temperature = base_temp + random.uniform(-3, 3)
-            
-            # Umidade do ar (inversamente proporcional à temperatura)
-            air_humidity = max(30, min(95, 80 - temperature * 1.5 + random.uniform(-10, 10)))
-            
-            # Previsão de chuva (mais provável à tarde/noite)
-            rain_probability = 0.1
-            if hour >= 14:
-                rain_probability = 0.3
-            rain_forecast = random.random() < rain_probability
-            
-            # Criar registro climático
-            climate_data = {
-                "temperature": round(temperature, 1),
-                "air_humidity": round(air_humidity, 1),
-                "rain_forecast": rain_forecast,
-                "timestamp": timestamp
-            }
-            
-            climate_service.create_climate_data(climate_data)
-            climate_records += 1
-            
-            # Dados dos sensores (relacionados aos dados climáticos)
-            # Umidade do solo diminui com temperatura alta e sem chuva
-            base_moisture = 60
-            if temperature > 25:
-                base_moisture -= 15
-            if rain_forecast:
-                base_moisture += 20
-            
-            soil_moisture = max(10, min(90, base_moisture + random.uniform(-10, 10)))
-            
-            # pH do solo (relativamente estável)
-            soil_ph = 6.0 + random.uniform(-0.5, 0.5)
-            
-            # Nutrientes (presença varia)
-            phosphorus_present = random.random() > 0.3  # 70% de chance de estar presente
-            potassium_present = random.random() > 0.2   # 80% de chance de estar presente
-            
-            # Status de irrigação (baseado na lógica do ESP32)
-            irrigate = False
-            if not rain_forecast:
-                if soil_moisture < 40 and phosphorus_present:
-                    irrigate = True
-                if potassium_present and soil_moisture > 60:
-                    irrigate = False
-                if soil_moisture < 40 and (soil_ph < 5.5 or soil_ph > 7.0):
-                    irrigate = False
-                if soil_moisture > 70:
-                    irrigate = False
-                if (not phosphorus_present or not potassium_present) and (soil_moisture >= 30 and soil_moisture <= 50):
-                    irrigate = True
-            
-            irrigation_status = "ATIVADA" if irrigate else "DESLIGADA"
-            
-            # Criar registro de sensor
-            sensor_data = {
-                "sensor_id": sensor_id,  # Adicionar sensor_id
-                "soil_moisture": round(soil_moisture, 1),
-                "soil_ph": round(soil_ph, 1),
-                "phosphorus_present": phosphorus_present,
-                "potassium_present": potassium_present,
-                "irrigation_status": irrigation_status,
-                "timestamp": timestamp
-            }
-            
-            sensor_service.create_sensor_record(sensor_data)
-            sensor_records += 1
-        
-        current_date += timedelta(days=1)
-    
+
+    print("🔧 Preparando sensores...")
+    sensor_ids = ensure_sensors(session, sensors)
+    print(f"✅ {len(sensor_ids)} sensor(es)")
+
+    # Timestamps em UTC sem fuso, como nos repositórios
+    start_date = (datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days)).replace(
+        hour=0, minute=0, second=0, microsecond=0)
+    timestamps = reading_timestamps(start_date, days, interval_minutes, rng)
+    destination = f"Parquet em {parquet_dir}" if parquet_dir else "banco"
+    print(f"📅 Gerando dados de {start_date.strftime('%d/%m/%Y')} até hoje → {destination}")
+
+    stats = write_readings(session, sensor_ids, timestamps, rng, parquet_dir, batch_size)
+
+    total = stats['climate_records'] + stats['sensor_records']
     print(f"✅ Dados gerados com sucesso!")
-    print(f"📊 Registros climáticos: {climate_records}")
-    print(f"🧪 Registros de sensores: {sensor_records}")
-    print(f"📈 Total de registros: {climate_records + sensor_records}")
+    print(f"📊 Registros climáticos: {stats['climate_records']}")
+    print(f"🧪 Registros de sensores: {stats['sensor_records']}")
+    print(f"📈 Total de registros: {total}")
+    print(f"⚡ Geração: {stats['generate_seconds']:.2f}s | gravação: {stats['write_seconds']:.2f}s | "
+          f"{stats['rows_per_second']:,.0f} linhas/s")
     print("\n🎯 Agora você pode treinar o modelo de Machine Learning no dashboard!")
     print("🌐 Execute: streamlit run app_dashboard.py")
+    return stats
+
 
 if __name__ == "__main__":
-    generate_sample_data() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Gera leituras de sensores e dados climáticos de exemplo")
+    parser.add_argument("--sensors", type=int, default=1, help="quantidade de sensores")
+    parser.add_argument("--days", type=int, default=30, help="dias de histórico até hoje")
+    parser.add_argument("--interval-minutes", type=int, default=None,
+                        help="intervalo entre leituras (padrão: 6h, 10h, 14h, 18h e 22h)")
+    parser.add_argument("--seed", type=int, default=None, help="semente para dados reprodutíveis")
+    parser.add_argument("--parquet", metavar="DIR", default=None,
+                        help="grava no arquivo Parquet (layout do database/archive.py) em vez do banco")
+    parser.add_argument("--batch-size", type=int, default=100_000, help="leituras de sensor por bloco")
+    args = parser.parse_args()
+    generate_sample_data(args.sensors, args.days, args.interval_minutes, args.seed, args.parquet, args.batch_size)
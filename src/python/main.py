@@ -1,13 +1,19 @@
 """
 Ponto de entrada principal da aplicação.
+
+Por padrão cria apenas o que falta no esquema e insere os dados de
+demonstração em um banco vazio, sem apagar nada. Use --reset para recriar
+as tabelas do zero e --producers N para uma carga em escala.
 """
+import argparse
 import logging.config
 
 from dotenv import load_dotenv
 import time
 
-from database.seed import run_seed
-from database.setup import reset_database, drop_all_tables
+from database.oracle import get_session
+from database.seed import run_seed, seed_scale
+from database.setup import ensure_schema, reset_database
 
 # Configura logging
 logger = logging.getLogger(__name__)
@@ -19,14 +25,28 @@ def main():
     """
     Função principal da aplicação.
     """
+    parser = argparse.ArgumentParser(description="Inicializa o banco de dados da FarmTech Solutions")
+    parser.add_argument("--reset", action="store_true", help="apaga e recria todas as tabelas (perde os dados)")
+    parser.add_argument("--producers", type=int, default=0,
+                        help="carga em escala com N produtores sintéticos (ver database/seed.py)")
+    parser.add_argument("--days", type=int, default=30, help="dias de leituras na carga em escala")
+    parser.add_argument("--seed", type=int, default=None, help="semente da carga em escala")
+    args = parser.parse_args()
+
     logger.info("Iniciando aplicação...")
-    
+    started = time.perf_counter()
+
     # Cria as sequências e tabelas necessárias
     try:
-        # Cria e popula o banco de dados
-        reset_database()
+        if args.reset:
+            reset_database()
+        else:
+            ensure_schema()
         run_seed()
-        logger.info("✅ Banco de dados inicializado com sucesso. Seeds carregadas")
+        if args.producers:
+            stats = seed_scale(get_session(), producers=args.producers, days=args.days, seed=args.seed)
+            logger.info(f"Carga em escala: {stats}")
+        logger.info(f"✅ Banco de dados inicializado com sucesso em {time.perf_counter() - started:.1f}s. Seeds carregadas")
     except Exception as e:
         logger.error(f"Erro ao criar tabelas: {str(e)}")
         return
@@ -4,6 +4,7 @@ from sqlalchemy.exc import SQLAlchemyError
 from datetime import datetime
 
 from database import ApplicationRepository
+from services.state_cache import data_versions
 
 
 class ApplicationService:
@@ -18,6 +19,7 @@ class ApplicationService:
                 quantity=data['quantity'],
                 timestamp=datetime.now()
             )
+            data_versions.bump('applications')
             return application.__dict__
         except SQLAlchemyError as e:
             self.repo.session.rollback()
@@ -28,11 +30,12 @@ class ApplicationService:
         return application.__dict__ if application else None
 
     def list_applications(self) -> List[dict]:
-        return [application.__dict__ for application in self.repo.get_all()]
+        return self.repo.get_all_rows()
 
     def update_application(self, application_id: str, data: dict) -> Optional[dict]:
         try:
             updated_application = self.repo.update(application_id, **data)
+            data_versions.bump('applications')
             return updated_application.__dict__ if updated_application else None
         except SQLAlchemyError as e:
             self.repo.session.rollback()
@@ -40,13 +43,15 @@ class ApplicationService:
 
     def delete_application(self, application_id: str) -> bool:
         try:
-            return self.repo.delete(application_id)
+            deleted = self.repo.delete(application_id)
+            data_versions.bump('applications')
+            return deleted
         except SQLAlchemyError as e:
             self.repo.session.rollback()
             raise e
 
     def get_applications_by_crop(self, crop_id: str) -> List[dict]:
-        return [application.__dict__ for application in self.repo.get_by_crop(crop_id)]
+        return self.repo.get_rows_by_crop(crop_id)
 
     def get_total_quantity_by_type(self, crop_id: str, app_type: str) -> float:
         applications = self.repo.get_by_crop(crop_id)
@@ -0,0 +1,58 @@
+import pandas as pd
+
+DEFAULT_TOLERANCE = '1h'
+DIRECTIONS = ('backward', 'nearest', 'forward')
+
+
+def to_naive_utc(values) -> pd.Series:
+    """
+    Converte timestamps para datetime64 sem fuso (UTC), permitindo comparar
+    registros gravados com e sem timezone.
+    """
+    timestamps = pd.to_datetime(values)
+    if timestamps.dt.tz is not None:
+        timestamps = timestamps.dt.tz_convert('UTC').dt.tz_localize(None)
+    return timestamps
+
+
+def asof_join(df_sensors: pd.DataFrame, df_climate: pd.DataFrame,
+              tolerance=DEFAULT_TOLERANCE, direction: str = 'backward',
+              by=None) -> pd.DataFrame:
+    """
+    Associa cada leitura de sensor ao registro climático mais próximo no tempo
+    (as-of join ordenado, O(n log n) pela ordenação + varredura linear).
+
+    - tolerance: distância máxima entre as duas leituras (ex.: '1h', '15min').
+    - direction: 'backward' usa o último clima até a leitura; 'nearest' o mais
+      próximo em qualquer direção; 'forward' o primeiro clima após a leitura.
+    - by: coluna(s) presentes nos dois lados para casar apenas dentro do mesmo
+      grupo (ex.: sensor_id ou localidade), quando o clima for segmentado.
+
+    Cada leitura de sensor gera no máximo uma linha; leituras sem clima dentro
+    da tolerância são descartadas. Colunas homônimas recebem os sufixos
+    '_sensor' e '_climate' (ex.: timestamp_sensor, timestamp_climate).
+    """
+    if direction not in DIRECTIONS:
+        raise ValueError(f"Direção inválida: {direction}. Use uma de {', '.join(DIRECTIONS)}")
+
+    left = df_sensors.copy()
+    right = df_climate.copy()
+    left['_join_ts'] = to_naive_utc(left['timestamp'])
+    right['_join_ts'] = to_naive_utc(right['timestamp'])
+    right['_climate_match'] = True
+
+    merged = pd.merge_asof(
+        left.sort_values('_join_ts', kind='stable'),
+        right.sort_values('_join_ts', kind='stable'),
+        on='_join_ts',
+        by=by,
+        tolerance=pd.Timedelta(tolerance),
+        direction=direction,
+        suffixes=('_sensor', '_climate')
+    )
+
+    merged = merged[merged['_climate_match'].notna()]
+    merged = merged.drop(columns=['_join_ts', '_climate_match']).reset_index(drop=True)
+    merged['timestamp_sensor'] = pd.to_datetime(merged['timestamp_sensor'])
+    merged['timestamp_climate'] = pd.to_datetime(merged['timestamp_climate'])
+    return merged
@@ -1,15 +1,18 @@
-from database.oracle import db
+from database.archive import ARCHIVE_DIR
 from database.models import ClimateData
 from datetime import datetime
 from typing import List, Optional
 from sqlalchemy.orm import Session
+import pandas as pd
 
-from database import ComponentRepository
+from database import ClimateDataRepository
+from services.state_cache import data_versions, latest_state, snapshot, LATEST_CLIMATE
+from services.exporter import EXPORT_CHUNK_SIZE, Sink, arrow_schema, export_frames
 
 
 class ClimateService:
     def __init__(self, session: Session):
-        self.repo = ComponentRepository(session)
+        self.repo = ClimateDataRepository(session)
 
     def create_climate_data(self, data: dict) -> dict:
         climate = ClimateData(
@@ -18,26 +21,39 @@ class ClimateService:
             air_humidity=data["air_humidity"],
             rain_forecast=data["rain_forecast"]
         )
-        db.session.add(climate)
-        db.session.commit()
-        db.session.refresh(climate)
+        self.repo.session.add(climate)
+        self.repo.session.commit()
+        self.repo.session.refresh(climate)
+        latest_state.offer(LATEST_CLIMATE, snapshot(climate))
+        data_versions.bump('climate_data')
         return climate.to_dict()
 
 
     def get_climate_data(self, climate_id: str) -> Optional[dict]:
-        climate = db.session.query(ClimateData).filter_by(id=climate_id).first()
+        climate = self.repo.session.query(ClimateData).filter_by(id=climate_id).first()
         if climate:
             return climate.to_dict()
         return None
 
 
+    def get_latest_climate_data(self) -> Optional[dict]:
+        """Registro climático mais recente (servido pelo cache de estado)."""
+        def load():
+            climate = self.repo.get_latest()
+            return snapshot(climate) if climate else None
+        return latest_state.get(LATEST_CLIMATE, load)
+
+
     def list_climate_data(self) -> List[dict]:
-        climates = db.session.query(ClimateData).order_by(ClimateData.timestamp.desc()).all()
-        return [c.to_dict() for c in climates]
+        return self.repo.get_all_rows()
+
+    def list_recent_ids(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
+                        limit: int = 500) -> List[str]:
+        return self.repo.get_recent_ids(start_date, end_date, limit)
 
 
     def update_climate_data(self, climate_id: str, data: dict) -> Optional[dict]:
-        climate = db.session.query(ClimateData).filter_by(id=climate_id).first()
+        climate = self.repo.session.query(ClimateData).filter_by(id=climate_id).first()
         if not climate:
             return None
 
@@ -50,15 +66,49 @@ class ClimateService:
         if "timestamp" in data:
             climate.timestamp = data["timestamp"]
 
-        db.session.commit()
-        db.session.refresh(climate)
+        self.repo.session.commit()
+        self.repo.session.refresh(climate)
+        latest_state.evict_record(climate_id)
+        data_versions.bump('climate_data')
         return climate.to_dict()
 
 
     def delete_climate_data(self, climate_id: str) -> bool:
-        climate = db.session.query(ClimateData).filter_by(id=climate_id).first()
+        climate = self.repo.session.query(ClimateData).filter_by(id=climate_id).first()
         if not climate:
             return False
-        db.session.delete(climate)
-        db.session.commit()
+        self.repo.session.delete(climate)
+        self.repo.session.commit()
+        latest_state.evict_record(climate_id)
+        data_versions.bump('climate_data')
         return True
+
+
+    def get_climate_series(self, bucket: str = '1h', start_date: Optional[datetime] = None,
+                           end_date: Optional[datetime] = None) -> List[dict]:
+        """Série agregada por bucket (banco + arquivo Parquet)."""
+        return self.repo.read_series(bucket, start_date, end_date)
+
+
+    def count_climate_data(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> int:
+        return self.repo.count_rows(start_date, end_date)
+
+
+    def get_climate_data_frame(self, columns: Optional[List[str]] = None, start_date: Optional[datetime] = None,
+                               end_date: Optional[datetime] = None) -> pd.DataFrame:
+        """Dados climáticos como DataFrame tipado, lidos em colunas (banco + arquivo Parquet)."""
+        return self.repo.read_frame(columns, start_date, end_date)
+
+
+    def export_climate_data(self, sink: Sink, fmt: str = 'csv', compression: Optional[str] = None,
+                            columns: Optional[List[str]] = None, start_date: Optional[datetime] = None,
+                            end_date: Optional[datetime] = None, chunk_size: int = EXPORT_CHUNK_SIZE,
+                            archive_dir: str = ARCHIVE_DIR) -> int:
+        """
+        Exporta os dados climáticos para CSV, Parquet ou Arrow IPC em blocos,
+        direto do cursor para o destino, incluindo os já arquivados em
+        Parquet. Retorna o total de linhas.
+        """
+        frames = self.repo.iter_tiered_frames(columns, start_date, end_date, chunk_size, archive_dir)
+        schema = arrow_schema(ClimateData, columns) if fmt != 'csv' else None
+        return export_frames(frames, sink, fmt, compression, schema)
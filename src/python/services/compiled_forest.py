@@ -0,0 +1,167 @@
+"""
+Floresta compilada para inferência só com NumPy.
+
+compile_forest achata as árvores do RandomForestClassifier treinado e os
+parâmetros do StandardScaler em poucos arrays contíguos (feature, limiar,
+filhos e probabilidades por nó), salvos em um único .npz. CompiledForest
+carrega esse arquivo e prediz sem importar scikit-learn nem desserializar
+pickles: a inicialização custa um np.load e cada leitura percorre todas as
+árvores ao mesmo tempo, um nível por iteração.
+
+As folhas apontam para si mesmas com limiar +inf, então o percurso é um
+laço fixo de max_depth passos sem máscaras. Os cálculos seguem os do
+scikit-learn (features em float32, normalização in-place e comparação
+x <= limiar), e as predições coincidem com as do modelo original.
+
+Este módulo não deve importar scikit-learn: é o que permite ao daemon de
+ingestão pontuar leituras sem carregar o ml_service.
+"""
+import os
+import threading
+from typing import Mapping, Optional
+
+import numpy as np
+
+COMPILED_FORMAT_VERSION = 1
+
+_LEAF = -1  # valor de children_left/right nas folhas do scikit-learn
+
+# Linhas percorridas por vez: mantém os arrays intermediários no cache
+ROW_CHUNK = 512
+
+
+def compile_forest(model, scaler, feature_names) -> dict:
+    """
+    Arrays da floresta e do scaler prontos para salvar com save_compiled.
+    Os índices dos filhos são globais (deslocados pelo início de cada árvore).
+    """
+    features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        count = tree.node_count
+        leaf = tree.children_left == _LEAF
+        index = np.arange(count) + offset
+
+        features.append(np.where(leaf, 0, tree.feature).astype(np.int32))
+        thresholds.append(np.where(leaf, np.inf, tree.threshold))
+        lefts.append(np.where(leaf, index, tree.children_left + offset).astype(np.int32))
+        rights.append(np.where(leaf, index, tree.children_right + offset).astype(np.int32))
+        # Probabilidade de cada classe no nó (o predict_proba da árvore usa a da folha)
+        counts = tree.value[:, 0, :]
+        values.append(counts / counts.sum(axis=1, keepdims=True))
+        roots.append(offset)
+        max_depth = max(max_depth, tree.max_depth)
+        offset += count
+
+    scale = scaler.scale_ if scaler.scale_ is not None else np.ones(len(feature_names))
+    mean = scaler.mean_ if scaler.mean_ is not None else np.zeros(len(feature_names))
+    return {
+        'version': np.array(COMPILED_FORMAT_VERSION),
+        'feature_names': np.array(list(feature_names)),
+        'classes': np.asarray(model.classes_),
+        'mean': np.asarray(mean, dtype=np.float64),
+        'scale': np.asarray(scale, dtype=np.float64),
+        'feature': np.concatenate(features),
+        'threshold': np.concatenate(thresholds),
+        'left': np.concatenate(lefts),
+        'right': np.concatenate(rights),
+        'value': np.concatenate(values),
+        'roots': np.array(roots, dtype=np.int32),
+        'max_depth': np.array(max_depth),
+    }
+
+
+def save_compiled(compiled: dict, path: str) -> int:
+    """Grava os arrays em um .npz (sem compressão, para carregar rápido). Retorna o tamanho em bytes."""
+    with open(path, 'wb') as file:
+        np.savez(file, **compiled)
+    return os.path.getsize(path)
+
+
+class CompiledForest:
+    """Floresta achatada: predict_proba e predict_batch equivalentes aos do MLService."""
+
+    def __init__(self, arrays: Mapping[str, np.ndarray]):
+        if int(arrays['version']) != COMPILED_FORMAT_VERSION:
+            raise ValueError(f"Versão do modelo compilado não suportada: {int(arrays['version'])}")
+        self.feature_names = [str(name) for name in arrays['feature_names']]
+        self.classes = arrays['classes']
+        # O StandardScaler converte média e escala para o dtype das features antes de aplicar
+        self.mean = arrays['mean'].astype(np.float32)
+        self.scale = arrays['scale'].astype(np.float32)
+        self.feature = arrays['feature'].astype(np.intp)
+        self.threshold = arrays['threshold']
+        # children[2 * nó + (x <= limiar)]: filho direito nas posições pares, esquerdo nas ímpares
+        self.children = np.column_stack([arrays['right'], arrays['left']]).ravel().astype(np.intp)
+        self.value = arrays['value']
+        self.roots = arrays['roots'].astype(np.intp)
+        self.max_depth = int(arrays['max_depth'])
+        positive = np.flatnonzero(self.classes == 1)
+        self._positive = int(positive[0]) if positive.size else None
+
+    @classmethod
+    def load(cls, path: str) -> "CompiledForest":
+        with np.load(path, allow_pickle=False) as data:
+            return cls({key: data[key] for key in data.files})
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def feature_matrix(self, columns: Mapping) -> np.ndarray:
+        """Matriz (n, features) em float32 a partir de um mapping/DataFrame com as colunas do modelo."""
+        return np.column_stack([np.asarray(columns[name], dtype=np.float32) for name in self.feature_names])
+
+    def predict_proba(self, features) -> np.ndarray:
+        """Probabilidade de cada classe, média das árvores (como o RandomForestClassifier)."""
+        X = np.array(features, dtype=np.float32, ndmin=2)
+        # Mesma aritmética do StandardScaler.transform sobre float32
+        X -= self.mean
+        X /= self.scale
+
+        n_features = X.shape[1]
+        probabilities = np.empty((len(X), self.value.shape[1]))
+        for start in range(0, len(X), ROW_CHUNK):
+            chunk = X[start:start + ROW_CHUNK].ravel()
+            size = len(chunk) // n_features
+            offsets = (np.arange(size, dtype=np.intp) * n_features)[:, None]
+            nodes = np.broadcast_to(self.roots, (size, self.n_trees))
+            for _ in range(self.max_depth):
+                go_left = chunk[offsets + self.feature[nodes]] <= self.threshold[nodes]
+                nodes = self.children[2 * nodes + go_left]
+            probabilities[start:start + size] = self.value[nodes].mean(axis=1)
+        return probabilities
+
+    def predict_batch(self, features) -> dict:
+        """Mesmo formato de MLService.predict_batch, a partir da matriz de features."""
+        probabilities = self.predict_proba(features)
+        return {
+            "success": True,
+            "should_irrigate": self.classes[probabilities.argmax(axis=1)].astype(bool),
+            "confidence": probabilities.max(axis=1),
+            "irrigation_probability": (probabilities[:, self._positive] if self._positive is not None
+                                       else np.zeros(len(probabilities)))
+        }
+
+
+# Modelos compilados já carregados no processo, por caminho: (mtime, floresta)
+_loaded = {}
+_lock = threading.Lock()
+
+
+def load_compiled(path: str) -> Optional[CompiledForest]:
+    """Carrega o modelo compilado uma vez por processo (recarrega se o arquivo mudar); None se não existir."""
+    path = os.path.abspath(path)
+    if not os.path.exists(path):
+        return None
+    mtime = os.path.getmtime(path)
+    with _lock:
+        cached = _loaded.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+    forest = CompiledForest.load(path)
+    with _lock:
+        _loaded[path] = (mtime, forest)
+    return forest
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
 from database import ComponentRepository
+from services.state_cache import data_versions
 
 
 class ComponentService:
@@ -12,6 +13,7 @@ class ComponentService:
     def create_component(self, data: dict) -> dict:
         try:
             component = self.repo.create(name=data['name'], type=data['type'], crop_id=data.get('crop_id'))
+            data_versions.bump('components')
             return component.__dict__
         except SQLAlchemyError as e:
             self.repo.session.rollback()
@@ -22,11 +24,12 @@ class ComponentService:
         return component.__dict__ if component else None
 
     def list_components(self) -> List[dict]:
-        return [component.__dict__ for component in self.repo.get_all()]
+        return self.repo.get_all_rows()
 
     def update_component(self, component_id: str, data: dict) -> Optional[dict]:
         try:
             updated_component = self.repo.update(component_id, **data)
+            data_versions.bump('components')
             return updated_component.__dict__ if updated_component else None
         except SQLAlchemyError as e:
             self.repo.session.rollback()
@@ -34,7 +37,10 @@ class ComponentService:
 
     def delete_component(self, component_id: str) -> bool:
         try:
-            return self.repo.delete(component_id)
+            deleted = self.repo.delete(component_id)
+            # Registros dependentes são removidos em cascata
+            data_versions.bump('components', 'sensor_records', 'irrigation_decisions')
+            return deleted
         except SQLAlchemyError as e:
             self.repo.session.rollback()
             raise e
\ No newline at end of file
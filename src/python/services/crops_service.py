@@ -3,7 +3,8 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from datetime import date
 
-from database import CropRepository
+from database import CropRepository, ComponentRepository, ApplicationRepository
+from services.state_cache import data_versions
 
 
 class CropService:
@@ -19,6 +20,7 @@ class CropService:
                 end_date=date.fromisoformat(data.get('end_date')) if data.get('end_date') else None,
                 producer_id=data['producer_id']
             )
+            data_versions.bump('crops')
             return crop.__dict__
         except SQLAlchemyError as e:
             self.repo.session.rollback()
@@ -29,11 +31,12 @@ class CropService:
         return crop.__dict__ if crop else None
 
     def list_crops(self) -> List[dict]:
-        return [crop.__dict__ for crop in self.repo.get_all()]
+        return self.repo.get_all_rows()
 
     def update_crop(self, crop_id: str, data: dict) -> Optional[dict]:
         try:
             updated_crop = self.repo.update(crop_id, **data)
+            data_versions.bump('crops')
             return updated_crop.__dict__ if updated_crop else None
         except SQLAlchemyError as e:
             self.repo.session.rollback()
@@ -41,28 +44,25 @@ class CropService:
 
     def delete_crop(self, crop_id: str) -> bool:
         try:
-            return self.repo.delete(crop_id)
+            deleted = self.repo.delete(crop_id)
+            # Registros dependentes são removidos em cascata
+            data_versions.bump('crops', 'components', 'sensor_records', 'applications', 'irrigation_decisions')
+            return deleted
         except SQLAlchemyError as e:
             self.repo.session.rollback()
             raise e
 
     def list_active_crops(self) -> List[dict]:
-        return [crop.__dict__ for crop in self.repo.get_active_crops()]
+        return self.repo.get_active_rows()
 
     def get_crops_by_producer(self, producer_id: str) -> List[dict]:
         return self.repo.get_by_producer(producer_id)
 
     def get_crop_components(self, crop_id: str) -> List[dict]:
-        crop = self.repo.get_by_id(crop_id)
-        if not crop:
-            return []
-        return [component.__dict__ for component in crop.components]
+        return ComponentRepository(self.repo.session).get_rows_by_crop(crop_id)
 
     def get_crop_applications(self, crop_id: str) -> List[dict]:
-        crop = self.repo.get_by_id(crop_id)
-        if not crop:
-            return []
-        return [application.__dict__ for application in crop.applications]
+        return ApplicationRepository(self.repo.session).get_rows_by_crop(crop_id)
 
     def get_crop_details(self, crop_id: str) -> Optional[dict]:
         crop = self.repo.get_by_id(crop_id)
@@ -0,0 +1,137 @@
+"""
+Exportação em streaming de tabelas para CSV, Parquet ou Arrow IPC.
+
+Os dados chegam em blocos de DataFrames lidos com cursor no servidor
+(projections.iter_frames) e cada bloco é gravado no destino antes do
+próximo ser lido, então a memória usada não cresce com o tamanho da
+exportação. O destino pode ser um caminho ou um arquivo binário aberto
+(arquivo temporário, BytesIO, resposta HTTP); ele não é fechado ao final.
+"""
+import bz2
+import gzip
+import io
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple, Union
+
+import pandas as pd
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer
+
+# Tipo MIME e extensão de cada formato
+EXPORT_FORMATS: Dict[str, Tuple[str, str]] = {
+    'csv': ('text/csv', '.csv'),
+    'parquet': ('application/vnd.apache.parquet', '.parquet'),
+    'arrow': ('application/vnd.apache.arrow.file', '.arrow'),
+}
+
+# Compressões aceitas por formato (None = sem compressão)
+COMPRESSIONS: Dict[str, Tuple[Optional[str], ...]] = {
+    'csv': (None, 'gzip', 'bz2'),
+    'parquet': (None, 'snappy', 'gzip', 'zstd'),
+    'arrow': (None, 'lz4', 'zstd'),
+}
+
+# Extensão extra do arquivo quando o CSV inteiro é comprimido
+CSV_SUFFIXES = {'gzip': '.gz', 'bz2': '.bz2'}
+
+EXPORT_CHUNK_SIZE = 50000
+
+Sink = Union[str, BinaryIO]
+
+
+def export_file_name(base_name: str, fmt: str, compression: Optional[str] = None) -> str:
+    """Nome sugerido para o arquivo exportado (ex.: sensor_data.csv.gz)."""
+    name = base_name + EXPORT_FORMATS[fmt][1]
+    if fmt == 'csv' and compression:
+        name += CSV_SUFFIXES[compression]
+    return name
+
+
+def arrow_schema(model, columns: Optional[List[str]] = None):
+    """
+    Schema Arrow derivado das colunas do modelo. Fixar o schema pelo modelo
+    (e não pelo primeiro bloco) mantém os tipos iguais em todos os blocos,
+    mesmo quando um deles só tem nulos em alguma coluna.
+    """
+    import pyarrow as pa
+
+    arrow_types = [
+        (Boolean, pa.bool_()),
+        (Float, pa.float64()),
+        (Integer, pa.int64()),
+        (DateTime, pa.timestamp('us')),
+        (Date, pa.timestamp('us')),
+    ]
+    table = model.__table__
+    fields = []
+    for column in ([table.c[name] for name in columns] if columns else table.columns):
+        arrow_type = next((t for sql_type, t in arrow_types if isinstance(column.type, sql_type)), pa.string())
+        fields.append(pa.field(column.key, arrow_type))
+    return pa.schema(fields)
+
+
+def export_frames(frames: Iterable[pd.DataFrame], sink: Sink, fmt: str = 'csv',
+                  compression: Optional[str] = None, schema=None) -> int:
+    """
+    Grava os blocos no destino no formato pedido e retorna o total de linhas.
+    Para Parquet e Arrow, informe o schema (arrow_schema) para tipos estáveis.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Formato não suportado: {fmt}. Use um de {', '.join(EXPORT_FORMATS)}")
+    if compression not in COMPRESSIONS[fmt]:
+        raise ValueError(f"Compressão {compression!r} não suportada para {fmt}: "
+                         f"use uma de {COMPRESSIONS[fmt]}")
+
+    if isinstance(sink, str):
+        with open(sink, 'wb') as file:
+            return export_frames(frames, file, fmt, compression, schema)
+    if fmt == 'csv':
+        return _write_csv(frames, sink, compression)
+    return _write_arrow(frames, sink, fmt, compression, schema)
+
+
+def _write_csv(frames: Iterable[pd.DataFrame], sink: BinaryIO, compression: Optional[str]) -> int:
+    if compression == 'gzip':
+        binary = gzip.GzipFile(fileobj=sink, mode='wb')
+    elif compression == 'bz2':
+        binary = bz2.BZ2File(sink, mode='wb')
+    else:
+        binary = sink
+    text = io.TextIOWrapper(binary, encoding='utf-8', newline='')
+
+    total = 0
+    first = True
+    try:
+        for frame in frames:
+            frame.to_csv(text, header=first, index=False)
+            first = False
+            total += len(frame)
+    finally:
+        text.flush()
+        text.detach()  # Não fecha o destino do chamador
+        if binary is not sink:
+            binary.close()
+    return total
+
+
+def _write_arrow(frames: Iterable[pd.DataFrame], sink: BinaryIO, fmt: str,
+                 compression: Optional[str], schema) -> int:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    total = 0
+    try:
+        for frame in frames:
+            table = pa.Table.from_pandas(frame, schema=schema, preserve_index=False)
+            if writer is None:
+                schema = table.schema
+                if fmt == 'parquet':
+                    writer = pq.ParquetWriter(sink, schema, compression=compression or 'none')
+                else:
+                    options = pa.ipc.IpcWriteOptions(compression=compression)
+                    writer = pa.ipc.new_file(sink, schema, options=options)
+            writer.write_table(table)
+            total += len(frame)
+    finally:
+        if writer is not None:
+            writer.close()
+    return total
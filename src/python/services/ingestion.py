@@ -0,0 +1,446 @@
+"""
+Daemon de ingestão de leituras dos ESP32.
+
+Recebe leituras pela porta serial, por UDP ou por um endpoint HTTP local,
+acumula-as em uma fila limitada e grava no banco em micro-lotes (por
+tamanho ou tempo máximo de espera), com um executemany e um commit por lote.
+
+Com --model, cada lote também é pontuado pelo modelo compilado
+(services/compiled_forest.py) e as decisões vão para irrigation_decisions,
+sem carregar scikit-learn no daemon.
+
+Uso:
+    python -m services.ingestion --serial --udp 9999 --http 8080
+    python -m services.ingestion --udp 9999 --model models/irrigation_model.npz
+"""
+import argparse
+import json
+import math
+import os
+import queue
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Iterable, List, Optional
+
+from database import ClimateDataRepository, IrrigationDecisionRepository
+from database.oracle import get_session
+from logs.logger import Logger
+from services.compiled_forest import load_compiled
+from services.sensor_service import SensorRecordService
+from services.serial_link import SerialLinkManager, parse_reading
+from services.state_cache import data_versions
+
+logger = Logger(__name__)()
+
+QUEUE_SIZE = int(os.getenv("INGESTION_QUEUE_SIZE", "10000"))
+BATCH_SIZE = int(os.getenv("INGESTION_BATCH_SIZE", "500"))
+MAX_LATENCY = float(os.getenv("INGESTION_MAX_LATENCY", "1.0"))
+
+REQUIRED_FIELDS = ('sensor_id', 'soil_moisture', 'soil_ph', 'phosphorus_present', 'potassium_present')
+NUMERIC_FIELDS = ('soil_moisture', 'soil_ph')
+BOOLEAN_FIELDS = ('phosphorus_present', 'potassium_present')
+
+
+def validate_reading(reading: dict) -> dict:
+    """
+    Confere campos obrigatórios e tipos de uma leitura (números finitos,
+    booleanos ou 0/1, sensor_id texto e timestamp datetime) e a devolve com
+    os tipos normalizados. Levanta ValueError com o motivo se for inválida.
+    """
+    missing = [field for field in REQUIRED_FIELDS if reading.get(field) is None]
+    if missing:
+        raise ValueError(f"Campos ausentes: {', '.join(missing)}")
+    if not isinstance(reading['sensor_id'], str) or not reading['sensor_id'].strip():
+        raise ValueError(f"sensor_id inválido: {reading['sensor_id']!r}")
+    normalized = dict(reading)
+    for field in NUMERIC_FIELDS:
+        value = reading[field]
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+            raise ValueError(f"{field} deve ser numérico: {value!r}")
+        normalized[field] = float(value)
+    for field in BOOLEAN_FIELDS:
+        value = reading[field]
+        if value not in (True, False) or not isinstance(value, (bool, int)):
+            raise ValueError(f"{field} deve ser booleano: {value!r}")
+        normalized[field] = bool(value)
+    if reading.get('timestamp') is not None and not isinstance(reading['timestamp'], datetime):
+        raise ValueError(f"timestamp inválido: {reading['timestamp']!r}")
+    return normalized
+
+
+def parse_payload(text: str) -> List[dict]:
+    """
+    Interpreta o corpo de uma mensagem UDP/HTTP: um objeto JSON, uma lista de
+    objetos JSON ou linhas no formato do ESP32 prefixadas pelo sensor
+    ("<sensor_id>;Umidade: 45.00% | Fosforo: ... | pH: 6.5"). Levanta
+    ValueError se a mensagem não tiver esse formato; os tipos de cada leitura
+    são conferidos no MicroBatcher.submit (validate_reading), para uma leitura
+    inválida não descartar as demais da mesma mensagem.
+    """
+    text = text.strip()
+    if text.startswith(("{", "[")):
+        data = json.loads(text)
+        readings = data if isinstance(data, list) else [data]
+        for reading in readings:
+            if not isinstance(reading, dict):
+                raise ValueError(f"Leitura deve ser um objeto JSON: {reading!r}")
+            if isinstance(reading.get('timestamp'), str):
+                reading['timestamp'] = datetime.fromisoformat(reading['timestamp'])
+        return readings
+
+    readings = []
+    for line in text.splitlines():
+        sensor_id, _, reading_line = line.partition(";")
+        reading = parse_reading(reading_line)
+        if reading is None:
+            raise ValueError(f"Linha de leitura inválida: {line!r}")
+        reading['sensor_id'] = sensor_id.strip()
+        readings.append(reading)
+    return readings
+
+
+def database_sink(batch: List[dict]) -> int:
+    """Grava um lote pelo serviço de registros (sessão própria da thread de gravação)."""
+    return SensorRecordService(get_session()).bulk_create_sensor_records(batch, batch_size=len(batch))
+
+
+def scoring_sink(model_path: str, sink: Callable[[List[dict]], int] = database_sink) -> Callable[[List[dict]], int]:
+    """
+    Envolve sink: depois de gravar o lote, prediz a irrigação de cada leitura
+    com o modelo compilado e o clima mais recente e grava as decisões (uma
+    rodada por lote). Sem dados climáticos, só grava as leituras. Uma falha
+    na pontuação é registrada no log sem propagar: as leituras já foram
+    gravadas e não devem ser reenviadas pelo MicroBatcher.
+    """
+    forest = load_compiled(model_path)
+    if forest is None:
+        raise FileNotFoundError(f"Modelo compilado não encontrado: {model_path} (ver MLService.export_compiled)")
+
+    def score(batch: List[dict]) -> int:
+        # id e horário definidos aqui para a decisão apontar para a leitura gravada
+        now = datetime.now(timezone.utc)
+        for reading in batch:
+            reading['id'] = reading.get('id') or str(uuid.uuid4())
+            reading['timestamp'] = reading.get('timestamp') or now
+        written = sink(batch)
+
+        # Qualquer falha daqui em diante fica no log: propagar faria o
+        # MicroBatcher dividir e regravar leituras que já estão no banco
+        session = None
+        try:
+            session = get_session()
+            climate = ClimateDataRepository(session).get_latest()
+            if climate is None:
+                return written
+            result = forest.predict_batch(forest.feature_matrix({
+                **{column: [reading[column] for reading in batch]
+                   for column in ('soil_moisture', 'soil_ph', 'phosphorus_present', 'potassium_present')},
+                'temperature': [climate.temperature] * len(batch),
+                'air_humidity': [climate.air_humidity] * len(batch),
+                'rain_forecast': [climate.rain_forecast] * len(batch),
+                'hour': [reading['timestamp'].hour for reading in batch],
+                'month': [reading['timestamp'].month for reading in batch],
+            }))
+
+            run_id = str(uuid.uuid4())
+            IrrigationDecisionRepository(session).bulk_create(
+                {
+                    'run_id': run_id,
+                    'sensor_id': reading['sensor_id'],
+                    'record_id': reading['id'],
+                    'climate_id': climate.id,
+                    'reading_timestamp': reading['timestamp'],
+                    'decided_at': now,
+                    'should_irrigate': bool(irrigate),
+                    'irrigation_probability': float(probability),
+                    'confidence': float(confidence),
+                    'source': 'compiled',
+                }
+                for reading, irrigate, probability, confidence in zip(
+                    batch, result['should_irrigate'], result['irrigation_probability'], result['confidence'])
+            )
+        except Exception as e:
+            if session is not None:
+                session.rollback()
+            logger.error(f"[ERRO] Falha ao pontuar {len(batch)} leituras: {e}")
+            return written
+        data_versions.bump('irrigation_decisions')
+        return written
+    return score
+
+
+class MicroBatcher:
+    """
+    Fila limitada de leituras gravadas em micro-lotes por uma thread própria.
+
+    Um lote é gravado quando atinge `batch_size` leituras ou quando a leitura
+    mais antiga espera `max_latency` segundos. Com a fila cheia, `submit`
+    aguarda até `timeout` e então rejeita a leitura (contabilizada nas
+    métricas), devolvendo a pressão para a origem.
+    """
+
+    def __init__(self, sink: Callable[[List[dict]], int] = database_sink, batch_size: int = BATCH_SIZE,
+                 max_latency: float = MAX_LATENCY, queue_size: int = QUEUE_SIZE):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.max_latency = max_latency
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._metrics = {
+            "received": 0, "written": 0, "rejected": 0, "invalid": 0, "failed": 0,
+            "batches": 0, "queue_high_water": 0, "last_batch_size": 0, "last_flush_seconds": 0.0
+        }
+
+    def _count(self, **increments):
+        with self._lock:
+            for key, value in increments.items():
+                self._metrics[key] += value
+
+    def record_invalid(self, count: int = 1):
+        self._count(invalid=count)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            metrics = dict(self._metrics)
+        metrics["queue_depth"] = self._queue.qsize()
+        metrics["queue_capacity"] = self._queue.maxsize
+        return metrics
+
+    def submit(self, reading: dict, timeout: float = 0) -> bool:
+        """Enfileira uma leitura; retorna False se inválida ou rejeitada por fila cheia."""
+        try:
+            reading = validate_reading(reading)
+        except ValueError as e:
+            self.record_invalid()
+            logger.warning(f"[ERRO] Leitura inválida: {e}")
+            return False
+        try:
+            self._queue.put(reading, block=timeout > 0, timeout=timeout or None)
+        except queue.Full:
+            self._count(rejected=1)
+            return False
+        depth = self._queue.qsize()
+        with self._lock:
+            self._metrics["received"] += 1
+            self._metrics["queue_high_water"] = max(self._metrics["queue_high_water"], depth)
+        return True
+
+    def submit_many(self, readings: Iterable[dict], timeout: float = 0) -> int:
+        return sum(self.submit(reading, timeout) for reading in readings)
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="ingestion-flusher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 10.0):
+        """Para a thread de gravação depois de gravar o que ainda está na fila."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _next_batch(self) -> List[dict]:
+        try:
+            batch = [self._queue.get(timeout=0.2)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.max_latency
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self._stop.is_set():
+                try:
+                    batch.append(self._queue.get_nowait())
+                    continue
+                except queue.Empty:
+                    break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch: List[dict]) -> int:
+        """
+        Grava o lote; se falhar (ex.: sensor inexistente), divide-o ao meio e
+        tenta cada metade, até isolar as leituras que falham sozinhas.
+        """
+        try:
+            return self.sink(batch)
+        except Exception as e:
+            if len(batch) == 1:
+                logger.error(f"[ERRO] Leitura descartada ({batch[0].get('sensor_id')}): {e}")
+                self._count(failed=1)
+                return 0
+            logger.warning(f"[ERRO] Falha ao gravar lote de {len(batch)} leituras, dividindo: {e}")
+            middle = len(batch) // 2
+            return self._write(batch[:middle]) + self._write(batch[middle:])
+
+    def _flush(self, batch: List[dict]):
+        start = time.perf_counter()
+        written = self._write(batch)
+        with self._lock:
+            self._metrics["written"] += written
+            self._metrics["batches"] += 1
+            self._metrics["last_batch_size"] = len(batch)
+            self._metrics["last_flush_seconds"] = time.perf_counter() - start
+
+    def _run(self):
+        while not (self._stop.is_set() and self._queue.empty()):
+            batch = self._next_batch()
+            if batch:
+                self._flush(batch)
+
+
+class UDPReceiver:
+    """Recebe leituras por datagramas UDP (um JSON ou linhas do ESP32 por datagrama)."""
+
+    def __init__(self, batcher: MicroBatcher, host: str = "0.0.0.0", port: int = 9999):
+        self.batcher = batcher
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind((host, port))
+        self.socket.settimeout(0.5)
+        self.address = self.socket.getsockname()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="ingestion-udp", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.socket.close()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                data, _ = self.socket.recvfrom(65535)
+            except socket.timeout:
+                continue
+            try:
+                self.batcher.submit_many(parse_payload(data.decode("utf-8")))
+            except ValueError as e:
+                self.batcher.record_invalid()
+                logger.warning(f"[ERRO] Datagrama inválido: {e}")
+
+
+class HTTPReceiver:
+    """
+    Endpoint HTTP local: POST /readings (JSON ou linhas do ESP32) e
+    GET /metrics. Responde 503 com Retry-After quando a fila está cheia.
+    """
+
+    def __init__(self, batcher: MicroBatcher, host: str = "0.0.0.0", port: int = 8080):
+        handler = self._make_handler(batcher)
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.address = self.server.server_address
+        self._thread = None
+
+    @staticmethod
+    def _make_handler(batcher: MicroBatcher):
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, status: int, body: dict, headers: Optional[dict] = None):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                if self.path != "/metrics":
+                    return self._reply(404, {"error": "not found"})
+                self._reply(200, batcher.metrics())
+
+            def do_POST(self):
+                if self.path != "/readings":
+                    return self._reply(404, {"error": "not found"})
+                length = int(self.headers.get("Content-Length", 0))
+                try:
+                    readings = parse_payload(self.rfile.read(length).decode("utf-8"))
+                except ValueError as e:
+                    return self._reply(400, {"error": str(e)})
+                accepted = batcher.submit_many(readings)
+                metrics = batcher.metrics()
+                if accepted < len(readings) and metrics["queue_depth"] >= metrics["queue_capacity"]:
+                    return self._reply(503, {"accepted": accepted, "received": len(readings)},
+                                       {"Retry-After": "1"})
+                self._reply(202, {"accepted": accepted, "received": len(readings)})
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name="ingestion-http", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Daemon de ingestão de leituras dos ESP32")
+    parser.add_argument("--serial", action="store_true", help="lê as portas de SERIAL_PORTS/PORTA_SERIAL")
+    parser.add_argument("--udp", type=int, metavar="PORTA", help="escuta leituras por UDP")
+    parser.add_argument("--http", type=int, metavar="PORTA", help="expõe POST /readings e GET /metrics")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--max-latency", type=float, default=MAX_LATENCY)
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE)
+    parser.add_argument("--metrics-interval", type=float, default=30.0)
+    parser.add_argument("--model", metavar="NPZ", help="pontua cada lote com o modelo compilado (irrigation_model.npz)")
+    args = parser.parse_args()
+
+    if not (args.serial or args.udp or args.http):
+        parser.error("informe ao menos uma origem: --serial, --udp ou --http")
+
+    sink = scoring_sink(args.model) if args.model else database_sink
+    batcher = MicroBatcher(sink=sink, batch_size=args.batch_size, max_latency=args.max_latency,
+                           queue_size=args.queue_size).start()
+    sources = []
+    if args.serial:
+        try:
+            serial_links = SerialLinkManager.from_env(os.getenv("PORTA_SERIAL", "/dev/ttyUSB0"),
+                                                      on_reading=lambda reading: batcher.submit(reading, timeout=1))
+        except ValueError as e:
+            batcher.stop()
+            parser.error(str(e))
+        sources.append(serial_links)
+    if args.udp:
+        sources.append(UDPReceiver(batcher, port=args.udp).start())
+    if args.http:
+        sources.append(HTTPReceiver(batcher, port=args.http).start())
+
+    logger.info("[OK] Ingestão iniciada")
+    try:
+        while True:
+            time.sleep(args.metrics_interval)
+            logger.info(f"[MÉTRICAS] {batcher.metrics()}")
+    except KeyboardInterrupt:
+        logger.info("Encerrando ingestão...")
+    finally:
+        for source in sources:
+            source.stop()
+        batcher.stop()
+        logger.info(f"[MÉTRICAS] {batcher.metrics()}")
+
+
+if __name__ == "__main__":
+    main()
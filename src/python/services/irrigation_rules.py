@@ -0,0 +1,187 @@
+"""
+Regras de decisão de irrigação, definidas uma única vez.
+
+A cascata do ESP32 (src/esp32/src/main.cpp) é descrita como dados em
+IRRIGATION_RULES e compilada em dois avaliadores equivalentes:
+
+- IrrigationRules.evaluate(reading): uma leitura (dict) por vez, usado na
+  gravação de leituras pelos serviços e pela ingestão;
+- IrrigationRules.evaluate_many(columns): arrays NumPy inteiros (ou um
+  DataFrame), usado nos rótulos do modelo de ML e na geração de dados.
+
+As regras são avaliadas em ordem e a última que casar define a decisão
+(como os ifs em sequência do firmware); se nenhuma casar, vale default.
+Cada regra é uma lista de cláusulas combinadas com E; uma cláusula é
+(campo, operador, valor) ou uma lista de cláusulas combinadas com OU.
+Regras que dependem de um campo ausente na leitura (chave inexistente,
+None ou NaN) não se aplicam, nos dois avaliadores: ex.: a leitura do sensor
+sem previsão de chuva ou sem clima correspondente após o as-of join.
+"""
+import operator
+from typing import Callable, Dict, List, Mapping, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+IRRIGATION_ON = "ATIVADA"
+IRRIGATION_OFF = "DESLIGADA"
+
+Clause = Union[Tuple[str, str, object], List[Tuple[str, str, object]]]
+
+# (nome, cláusulas, irrigar?) na ordem do firmware
+IRRIGATION_RULES: List[Tuple[str, List[Clause], bool]] = [
+    ("umidade baixa com fósforo", [('soil_moisture', '<', 40), ('phosphorus_present', '==', True)], True),
+    ("potássio presente e umidade alta", [('potassium_present', '==', True), ('soil_moisture', '>', 60)], False),
+    ("umidade baixa com pH fora de 5,5–7,0",
+     [('soil_moisture', '<', 40), [('soil_ph', '<', 5.5), ('soil_ph', '>', 7.0)]], False),
+    ("umidade acima de 70%", [('soil_moisture', '>', 70)], False),
+    ("falta de nutriente com umidade entre 30% e 50%",
+     [[('phosphorus_present', '==', False), ('potassium_present', '==', False)],
+      ('soil_moisture', '>=', 30), ('soil_moisture', '<=', 50)], True),
+    # No firmware a previsão de chuva cancela a irrigação antes das demais regras;
+    # como a última regra que casa prevalece, aqui ela vem por último
+    ("previsão de chuva", [('rain_forecast', '==', True)], False),
+]
+
+OPERATORS: Dict[str, Callable] = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+# dtype usado ao montar os arrays de cada campo no avaliador vetorizado
+FIELD_DTYPES = {
+    'soil_moisture': np.float64,
+    'soil_ph': np.float64,
+    'phosphorus_present': bool,
+    'potassium_present': bool,
+    'rain_forecast': bool,
+}
+
+
+def _fields(clauses: Sequence[Clause]) -> set:
+    fields = set()
+    for clause in clauses:
+        fields |= _fields(clause) if isinstance(clause, list) else {clause[0]}
+    return fields
+
+
+def _expression(clauses: Sequence[Clause], joiner: str = ' and ') -> str:
+    parts = []
+    for clause in clauses:
+        if isinstance(clause, list):
+            parts.append(f"({_expression(clause, ' or ')})")
+        else:
+            field, op, value = clause
+            if op not in OPERATORS or not field.isidentifier():
+                raise ValueError(f"Cláusula inválida: {clause!r}")
+            parts.append(f"{field} {op} {value!r}")
+    return joiner.join(parts)
+
+
+def _compile_scalar(rules, default: bool) -> Callable[[Mapping], bool]:
+    """
+    Gera o código Python da cascata (ifs em sequência, como no firmware) e o
+    compila em uma função, com custo por leitura próximo ao da versão escrita à mão.
+    """
+    fields = sorted(set().union(*(_fields(clauses) for _, clauses, _ in rules)))
+    lines = ["def evaluate(reading):", f"    decision = {default!r}"]
+    lines += [f"    {field} = reading.get({field!r})" for field in fields]
+    for _, clauses, action in rules:
+        # x == x descarta NaN (campo ausente em registros vindos de um DataFrame)
+        guards = ' and '.join(f"{field} is not None and {field} == {field}" for field in sorted(_fields(clauses)))
+        lines.append(f"    if {guards} and ({_expression(clauses)}):")
+        lines.append(f"        decision = {action!r}")
+    lines.append("    return decision")
+    namespace = {}
+    exec(compile("\n".join(lines), "<irrigation_rules>", "exec"), namespace)
+    return namespace["evaluate"]
+
+
+def _present_column(values, dtype):
+    """Array do campo no dtype das regras e máscara dos valores presentes (None se todos estão)."""
+    present = np.asarray(pd.notna(values), dtype=bool)
+    if present.all():
+        return np.asarray(values, dtype=dtype), None
+    # Preenche os ausentes antes da conversão: NaN convertido para bool viraria True
+    filler = np.nan if np.dtype(dtype).kind == 'f' else False
+    return np.where(present, np.asarray(values, dtype=object), filler).astype(dtype), present
+
+
+def _compile_vector(clauses: Sequence[Clause], any_of: bool = False) -> Callable[[Mapping], np.ndarray]:
+    tests = []
+    for clause in clauses:
+        if isinstance(clause, list):
+            tests.append(_compile_vector(clause, any_of=True))
+        else:
+            field, op, value = clause
+            compare = OPERATORS[op]
+            tests.append(lambda columns, field=field, compare=compare, value=value: compare(columns[field], value))
+    combine = np.logical_or if any_of else np.logical_and
+
+    def mask(columns):
+        result = tests[0](columns)
+        for test in tests[1:]:
+            result = combine(result, test(columns))
+        return result
+    return mask
+
+
+class IrrigationRules:
+    """Cascata de regras compilada em avaliadores escalar e vetorizado."""
+
+    def __init__(self, rules=IRRIGATION_RULES, default: bool = False):
+        self.rules = list(rules)
+        self.default = default
+        self._compiled = [
+            (frozenset(_fields(clauses)), _compile_vector(clauses), action) for _, clauses, action in self.rules
+        ]
+        self.fields = sorted(set().union(*(fields for fields, _, _ in self._compiled)))
+        self._evaluate = _compile_scalar(self.rules, default)
+
+    def evaluate(self, reading: Mapping) -> bool:
+        """Decisão para uma leitura (dict com os campos das regras)."""
+        return self._evaluate(reading)
+
+    def status(self, reading: Mapping) -> str:
+        return IRRIGATION_ON if self.evaluate(reading) else IRRIGATION_OFF
+
+    def evaluate_many(self, columns) -> np.ndarray:
+        """
+        Decisões para arrays inteiros: columns é um DataFrame ou um mapping de
+        campo → array. Retorna um array booleano (True = irrigar). Valores
+        ausentes (None/NaN) desativam, naquela linha, as regras do campo.
+        """
+        arrays = {}
+        present = {}
+        size = None
+        for field in self.fields:
+            if field in columns:
+                arrays[field], present[field] = _present_column(columns[field], FIELD_DTYPES.get(field, np.float64))
+                size = len(arrays[field])
+        if size is None:
+            raise ValueError(f"Nenhum dos campos das regras foi informado: {', '.join(self.fields)}")
+
+        decision = np.full(size, self.default, dtype=bool)
+        for fields, vector, action in self._compiled:
+            if not fields <= arrays.keys():
+                continue
+            applies = vector(arrays)
+            # Só nas linhas em que todos os campos da regra estão presentes
+            for field in fields:
+                if present[field] is not None:
+                    applies &= present[field]
+            if action:
+                decision |= applies
+            else:
+                decision &= ~applies
+        return decision
+
+    def statuses(self, columns) -> np.ndarray:
+        return np.where(self.evaluate_many(columns), IRRIGATION_ON, IRRIGATION_OFF)
+
+
+irrigation_rules = IrrigationRules()
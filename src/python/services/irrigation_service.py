@@ -0,0 +1,168 @@
+"""
+Decisão de irrigação para todos os sensores em uma única rodada.
+
+Cada rodada lê a última leitura de cada sensor com uma consulta de janela
+(ROW_NUMBER por sensor), combina todas com o registro climático mais
+recente, prediz com o MLService em um único predict_batch e grava uma
+decisão por sensor em irrigation_decisions com um executemany. Sem modelo
+treinado (ou sem dados climáticos), as decisões vêm das regras do ESP32.
+
+Uso:
+    python -m services.irrigation_service                 # uma rodada
+    python -m services.irrigation_service --interval 60   # a cada 60 s
+"""
+import argparse
+import logging
+import os
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from database import ClimateDataRepository, IrrigationDecisionRepository, SensorRecordRepository, session_scope
+from database.repositories.projections import SensorFilter
+from services.irrigation_rules import irrigation_rules
+from services.ml_service import MLService, SENSOR_COLUMNS
+from services.state_cache import data_versions
+
+logger = logging.getLogger(__name__)
+
+# Meta de latência (s) de uma rodada completa, usada pelo benchmark e nos logs
+FLEET_LATENCY_TARGET = float(os.getenv("FLEET_LATENCY_TARGET", "2.0"))
+
+# Idade máxima (h) da leitura usada na decisão: a consulta de janela só
+# ordena as leituras recentes, e sensores sem leitura no período ficam de fora
+FLEET_MAX_READING_AGE_HOURS = float(os.getenv("FLEET_MAX_READING_AGE_HOURS", "6"))
+
+
+class IrrigationDecisionService:
+    def __init__(self, session: Session, ml_service: Optional[MLService] = None):
+        self.repo = IrrigationDecisionRepository(session)
+        self.sensor_repo = SensorRecordRepository(session)
+        self.climate_repo = ClimateDataRepository(session)
+        self.ml_service = ml_service or MLService(session)
+
+    def score_fleet(self, sensor_id: SensorFilter = None,
+                    max_age_hours: Optional[float] = FLEET_MAX_READING_AGE_HOURS) -> dict:
+        """
+        Calcula e grava a decisão atual de todos os sensores (ou dos sensores
+        informados) com leitura nas últimas max_age_hours horas (None = sem
+        limite). Retorna o id da rodada, a quantidade de sensores, a origem
+        das decisões e o tempo de cada etapa.
+        """
+        started = time.perf_counter()
+        since = None
+        if max_age_hours is not None:
+            since = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=max_age_hours)
+        readings = self.sensor_repo.get_latest_frame(['id', 'sensor_id', 'timestamp'] + SENSOR_COLUMNS,
+                                                     sensor_id, since)
+        climate = self.climate_repo.get_latest()
+        loaded = time.perf_counter()
+
+        decisions = self._decide(readings, climate)
+        decided = time.perf_counter()
+
+        run_id = str(uuid.uuid4())
+        decided_at = datetime.now(timezone.utc)
+        try:
+            total = self.repo.bulk_create(
+                {
+                    'run_id': run_id,
+                    'sensor_id': sensor,
+                    'record_id': record_id,
+                    'climate_id': climate.id if climate else None,
+                    'reading_timestamp': timestamp,
+                    'decided_at': decided_at,
+                    'should_irrigate': bool(irrigate),
+                    'irrigation_probability': float(probability),
+                    'confidence': float(confidence),
+                    'source': decisions['source'],
+                }
+                for sensor, record_id, timestamp, irrigate, probability, confidence in zip(
+                    readings['sensor_id'], readings['id'], readings['timestamp'].tolist(),
+                    decisions['should_irrigate'], decisions['irrigation_probability'], decisions['confidence'])
+            )
+        except SQLAlchemyError as e:
+            self.repo.session.rollback()
+            raise e
+        data_versions.bump('irrigation_decisions')
+        finished = time.perf_counter()
+
+        stats = {
+            'run_id': run_id,
+            'sensors': total,
+            'irrigate': int(np.count_nonzero(decisions['should_irrigate'])),
+            'source': decisions['source'],
+            'read_seconds': loaded - started,
+            'predict_seconds': decided - loaded,
+            'write_seconds': finished - decided,
+            'total_seconds': finished - started,
+        }
+        if stats['total_seconds'] > FLEET_LATENCY_TARGET:
+            logger.warning(f"Rodada de decisões acima da meta de {FLEET_LATENCY_TARGET}s: {stats}")
+        return stats
+
+    def _decide(self, readings: pd.DataFrame, climate) -> dict:
+        if readings.empty:
+            empty = np.zeros(0)
+            return {'source': 'rules', 'should_irrigate': empty.astype(bool),
+                    'irrigation_probability': empty, 'confidence': empty}
+
+        if climate is not None:
+            readings = readings.assign(temperature=climate.temperature, air_humidity=climate.air_humidity,
+                                       rain_forecast=climate.rain_forecast)
+            if self.ml_service.model is not None:
+                # hour e month vêm do timestamp de cada leitura (ver as_feature_matrix)
+                result = self.ml_service.predict_batch(readings)
+                return {'source': 'ml', **{key: result[key] for key in
+                                           ('should_irrigate', 'irrigation_probability', 'confidence')}}
+
+        irrigate = irrigation_rules.evaluate_many(readings)
+        return {'source': 'rules', 'should_irrigate': irrigate,
+                'irrigation_probability': irrigate.astype(float), 'confidence': np.ones(len(irrigate))}
+
+    def get_latest_decisions(self, sensor_id: SensorFilter = None) -> pd.DataFrame:
+        """Decisão mais recente de cada sensor."""
+        return self.repo.get_latest_frame(sensor_id=sensor_id)
+
+    def list_run_decisions(self, run_id: str):
+        return self.repo.get_rows_by_run(run_id)
+
+    def prune_decisions(self, keep_hours: float) -> int:
+        """Remove decisões com mais de keep_hours horas."""
+        try:
+            deleted = self.repo.delete_older_than(datetime.now(timezone.utc) - timedelta(hours=keep_hours))
+        except SQLAlchemyError as e:
+            self.repo.session.rollback()
+            raise e
+        data_versions.bump('irrigation_decisions')
+        return deleted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calcula a decisão de irrigação de todos os sensores")
+    parser.add_argument("--interval", type=float, default=0, help="repete a cada N segundos (0 = uma rodada)")
+    parser.add_argument("--keep-hours", type=float, default=None, help="remove decisões mais antigas que N horas")
+    args = parser.parse_args()
+
+    while True:
+        with session_scope() as session:
+            service = IrrigationDecisionService(session)
+            stats = service.score_fleet()
+            print(f"💧 {stats['irrigate']}/{stats['sensors']} sensores a irrigar ({stats['source']}) | "
+                  f"leitura {stats['read_seconds']:.2f}s, predição {stats['predict_seconds']:.2f}s, "
+                  f"gravação {stats['write_seconds']:.2f}s, total {stats['total_seconds']:.2f}s")
+            if args.keep_hours is not None:
+                service.prune_decisions(args.keep_hours)
+        if not args.interval:
+            return
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,129 @@
 import pandas as pd
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import train_test_split, cross_val_score, ParameterGrid, ParameterSampler, StratifiedKFold
+from sklearn.pipeline import make_pipeline
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import accuracy_score, classification_report
-import joblib
+from concurrent.futures import ProcessPoolExecutor
+import copy
 from datetime import datetime, timedelta
+import json
 import os
+import time
+
+from database import SensorRecordRepository, ClimateDataRepository
+from services.irrigation_rules import irrigation_rules
+from services.compiled_forest import compile_forest, save_compiled
+from services.asof_join import asof_join, to_naive_utc, DEFAULT_TOLERANCE
+from services.model_registry import load_artifact, save_artifact
+
+SENSOR_COLUMNS = ['soil_moisture', 'soil_ph', 'phosphorus_present', 'potassium_present']
+CLIMATE_COLUMNS = ['temperature', 'air_humidity', 'rain_forecast']
+FEATURE_COLUMNS = SENSOR_COLUMNS + CLIMATE_COLUMNS + ['hour', 'month']
+
+# Treino incremental: árvores adicionadas por atualização e tamanho máximo da floresta
+INCREMENTAL_TREES = int(os.getenv("ML_INCREMENTAL_TREES", "10"))
+MAX_ESTIMATORS = int(os.getenv("ML_MAX_ESTIMATORS", "300"))
+MIN_TRAINING_SAMPLES = 10
+
+# Núcleos usados no treino da floresta (-1 = todos)
+N_JOBS = int(os.getenv("ML_N_JOBS", "-1"))
+
+# Espaço de busca padrão de hiperparâmetros do RandomForest
+DEFAULT_PARAM_GRID = {
+    'n_estimators': [100, 200, 400],
+    'max_depth': [None, 10, 20],
+    'min_samples_leaf': [1, 2, 5],
+    'max_features': ['sqrt', 0.5]
+}
+
+
+def build_feature_matrix(df, timestamp_column='timestamp_sensor'):
+    """
+    Monta a matriz de features (n, 9) em float32 a partir de um DataFrame já
+    combinado, usando operações por coluna em vez de iterar linha a linha.
+    Ordem: umidade, pH, fósforo, potássio, temperatura, umidade do ar,
+    previsão de chuva, hora e mês da leitura do sensor.
+    """
+    timestamps = pd.to_datetime(df[timestamp_column])
+    features = np.empty((len(df), 9), dtype=np.float32)
+    for i, column in enumerate(SENSOR_COLUMNS + CLIMATE_COLUMNS):
+        features[:, i] = df[column].to_numpy(dtype=np.float32)
+    features[:, 7] = timestamps.dt.hour.to_numpy()
+    features[:, 8] = timestamps.dt.month.to_numpy()
+    return features
+
+
+def build_irrigation_labels(df):
+    """
+    Aplica a cascata de regras do ESP32 (services/irrigation_rules.py) com o
+    avaliador vetorizado e retorna o target (1 = irrigar, 0 = não irrigar) como int8.
+    """
+    return irrigation_rules.evaluate_many(df).astype(np.int8)
+
+
+def as_feature_matrix(samples):
+    """
+    Converte amostras para a matriz (n, 9) em float32 esperada pelo modelo.
+    Aceita ndarray (uma linha ou n linhas na ordem de FEATURE_COLUMNS) ou
+    DataFrame com as colunas de FEATURE_COLUMNS; sem 'hour'/'month', usa o
+    'timestamp' de cada linha ou, na falta dele, o momento atual.
+    """
+    if isinstance(samples, pd.DataFrame):
+        frame = samples
+        if 'hour' not in frame or 'month' not in frame:
+            if 'timestamp' in frame:
+                timestamps = pd.to_datetime(frame['timestamp'])
+                frame = frame.assign(hour=timestamps.dt.hour, month=timestamps.dt.month)
+            else:
+                now = datetime.now()
+                frame = frame.assign(hour=now.hour, month=now.month)
+        return frame[FEATURE_COLUMNS].to_numpy(dtype=np.float32)
+    
+    features = np.asarray(samples, dtype=np.float32)
+    return features.reshape(1, -1) if features.ndim == 1 else features
+
+
+def _evaluate_candidate(params, X, y, cv):
+    """
+    Avalia uma combinação de hiperparâmetros por validação cruzada.
+    Executada em um processo do pool; a floresta usa um único núcleo para não
+    disputar CPU com os demais candidatos.
+    """
+    start = time.perf_counter()
+    pipeline = make_pipeline(StandardScaler(), RandomForestClassifier(random_state=42, n_jobs=1, **params))
+    scores = cross_val_score(pipeline, X, y, cv=StratifiedKFold(n_splits=cv, shuffle=True, random_state=42))
+    return {
+        "params": params,
+        "mean_accuracy": float(scores.mean()),
+        "std_accuracy": float(scores.std()),
+        "seconds": time.perf_counter() - start
+    }
+
 
 class MLService:
-    def __init__(self, session):
+    def __init__(self, session, model_dir="models"):
         self.session = session
         self.model = None
         self.scaler = StandardScaler()
-        self.model_path = "models/irrigation_model.pkl"
-        self.scaler_path = "models/scaler.pkl"
+        self.model_path = os.path.join(model_dir, "irrigation_model.pkl")
+        self.scaler_path = os.path.join(model_dir, "scaler.pkl")
+        self.compiled_path = os.path.join(model_dir, "irrigation_model.npz")
+        self.state_path = os.path.join(model_dir, "training_state.json")
         
         # Criar diretório de modelos se não existir
-        os.makedirs("models", exist_ok=True)
+        os.makedirs(model_dir, exist_ok=True)
         
         # Tentar carregar modelo existente
         self.load_model()
     
-    def prepare_data(self, sensor_data, climate_data):
+    def prepare_data(self, sensor_data, climate_data, tolerance=DEFAULT_TOLERANCE, direction='backward',
+                     with_keys=False):
         """
-        Prepara os dados para treinamento do modelo
+        Prepara os dados para treinamento do modelo. Com with_keys, retorna
+        também a chave (timestamp, id) das leituras que casaram com o clima,
+        usada na marca d'água.
         """
         # Combinar dados de sensores e clima
         df_sensors = pd.DataFrame(sensor_data)
@@ -36,147 +135,38 @@ class MLService:
         
         print(f"📊 Preparando dados: {len(df_sensors)} sensores, {len(df_climate)} clima")
         
-        # Converter timestamps
-        df_sensors['timestamp'] = pd.to_datetime(df_sensors['timestamp'])
-        df_climate['timestamp'] = pd.to_datetime(df_climate['timestamp'])
+        # Cada leitura recebe o registro climático mais próximo dentro da tolerância
+        merged_df = asof_join(df_sensors, df_climate, tolerance=tolerance, direction=direction)
         
-        # Mesclar dados por timestamp (aproximação de 1 hora)
-        df_sensors['timestamp_hour'] = df_sensors['timestamp'].dt.floor('h')  # Corrigido: 'H' -> 'h'
-        df_climate['timestamp_hour'] = df_climate['timestamp'].dt.floor('h')  # Corrigido: 'H' -> 'h'
+        print(f"🔄 Registros combinados: {len(merged_df)} (descartados sem clima: {len(df_sensors) - len(merged_df)})")
         
-        print(f"🕐 Timestamps únicos - Sensores: {df_sensors['timestamp_hour'].nunique()}, Clima: {df_climate['timestamp_hour'].nunique()}")
+        if merged_df.empty:
+            print("❌ Nenhum registro combinado encontrado")
+            return None
         
-        merged_df = pd.merge(df_sensors, df_climate, 
-                           left_on='timestamp_hour', 
-                           right_on='timestamp_hour', 
-                           how='inner', suffixes=('_sensor', '_climate'))
+        X = build_feature_matrix(merged_df, timestamp_column='timestamp_sensor')
         
-        print(f"🔄 Registros combinados: {len(merged_df)}")
+        # Criar target (decisão de irrigação baseada na lógica atual do ESP32)
+        y = build_irrigation_labels(merged_df)
         
-        if merged_df.empty:
-            print("❌ Nenhum registro combinado encontrado")
-            # Tentar combinação mais flexível
-            return self._prepare_data_flexible(df_sensors, df_climate)
-        
-        # Criar features
-        features = []
-        for _, row in merged_df.iterrows():
-            try:
-                feature_vector = [
-                    row['soil_moisture'],           # Umidade do solo
-                    row['soil_ph'],                 # pH do solo
-                    float(row['phosphorus_present']), # Fósforo (0 ou 1)
-                    float(row['potassium_present']),  # Potássio (0 ou 1)
-                    row['temperature'],             # Temperatura
-                    row['air_humidity'],            # Umidade do ar
-                    float(row['rain_forecast']),    # Previsão de chuva (0 ou 1)
-                    row['timestamp_sensor'].hour,   # Hora do dia
-                    row['timestamp_sensor'].month   # Mês
-                ]
-                features.append(feature_vector)
-            except Exception as e:
-                print(f"⚠️ Erro ao processar linha: {e}")
-                continue
-        
-        if len(features) < 10:
-            print(f"❌ Poucos features válidos: {len(features)}")
-            return self._prepare_data_flexible(df_sensors, df_climate)
-        
-        # Criar target (decisão de irrigação baseada na lógica atual)
-        targets = []
-        for _, row in merged_df.iterrows():
-            try:
-                # Aplicar a mesma lógica do ESP32
-                irrigate = False
-                
-                if not row['rain_forecast']:
-                    if row['soil_moisture'] < 40 and row['phosphorus_present']:
-                        irrigate = True
-                    
-                    if row['potassium_present'] and row['soil_moisture'] > 60:
-                        irrigate = False
-                    
-                    if row['soil_moisture'] < 40 and (row['soil_ph'] < 5.5 or row['soil_ph'] > 7.0):
-                        irrigate = False
-                    
-                    if row['soil_moisture'] > 70:
-                        irrigate = False
-                    
-                    if (not row['phosphorus_present'] or not row['potassium_present']) and \
-                       (row['soil_moisture'] >= 30 and row['soil_moisture'] <= 50):
-                        irrigate = True
-                
-                targets.append(1 if irrigate else 0)
-            except Exception as e:
-                print(f"⚠️ Erro ao processar target: {e}")
-                targets.append(0)
-        
-        print(f"✅ Features criados: {len(features)}, Targets: {len(targets)}")
-        return np.array(features), np.array(targets)
-    
-    def _prepare_data_flexible(self, df_sensors, df_climate):
-        """
-        Método alternativo para combinar dados quando timestamps não coincidem
-        """
-        print("🔄 Usando método flexível de combinação...")
-        
-        # Pegar os primeiros registros de cada tipo
-        min_records = min(len(df_sensors), len(df_climate), 50)
-        
-        features = []
-        targets = []
-        
-        for i in range(min_records):
-            try:
-                sensor_row = df_sensors.iloc[i]
-                climate_row = df_climate.iloc[i]
-                
-                feature_vector = [
-                    sensor_row['soil_moisture'],
-                    sensor_row['soil_ph'],
-                    float(sensor_row['phosphorus_present']),
-                    float(sensor_row['potassium_present']),
-                    climate_row['temperature'],
-                    climate_row['air_humidity'],
-                    float(climate_row['rain_forecast']),
-                    sensor_row['timestamp'].hour,
-                    sensor_row['timestamp'].month
-                ]
-                features.append(feature_vector)
-                
-                # Lógica de irrigação
-                irrigate = False
-                if not climate_row['rain_forecast']:
-                    if sensor_row['soil_moisture'] < 40 and sensor_row['phosphorus_present']:
-                        irrigate = True
-                    if sensor_row['potassium_present'] and sensor_row['soil_moisture'] > 60:
-                        irrigate = False
-                    if sensor_row['soil_moisture'] < 40 and (sensor_row['soil_ph'] < 5.5 or sensor_row['soil_ph'] > 7.0):
-                        irrigate = False
-                    if sensor_row['soil_moisture'] > 70:
-                        irrigate = False
-                    if (not sensor_row['phosphorus_present'] or not sensor_row['potassium_present']) and \
-                       (sensor_row['soil_moisture'] >= 30 and sensor_row['soil_moisture'] <= 50):
-                        irrigate = True
-                
-                targets.append(1 if irrigate else 0)
-                
-            except Exception as e:
-                print(f"⚠️ Erro no método flexível: {e}")
-                continue
-        
-        print(f"✅ Método flexível: {len(features)} features criados")
-        return np.array(features), np.array(targets)
+        print(f"✅ Features criados: {len(X)}, Targets: {len(y)}")
+        if with_keys:
+            id_column = 'id_sensor' if 'id_sensor' in merged_df else 'id'
+            keys = pd.DataFrame({'timestamp': merged_df['timestamp_sensor'],
+                                 'id': merged_df[id_column] if id_column in merged_df else None})
+            return X, y, keys
+        return X, y
     
     def train_model(self, sensor_data, climate_data):
         """
         Treina o modelo de predição de irrigação
         """
         # Preparar dados
-        X, y = self.prepare_data(sensor_data, climate_data)
+        data = self.prepare_data(sensor_data, climate_data, with_keys=True)
+        X, y, keys = data if data is not None else (None, None, None)
         
-        if X is None or len(X) < 10:
-            return {"success": False, "message": f"Dados insuficientes para treinamento (mínimo 10 registros, obtidos: {len(X) if X is not None else 0})"}
+        if X is None or len(X) < MIN_TRAINING_SAMPLES:
+            return {"success": False, "message": f"Dados insuficientes para treinamento (mínimo {MIN_TRAINING_SAMPLES} registros, obtidos: {len(X) if X is not None else 0})"}
         
         print(f"🎯 Treinando modelo com {len(X)} amostras...")
         
@@ -184,19 +174,21 @@ class MLService:
         X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
         
         # Normalizar features
+        self.scaler = StandardScaler()
         X_train_scaled = self.scaler.fit_transform(X_train)
         X_test_scaled = self.scaler.transform(X_test)
         
         # Criar e treinar modelo
-        self.model = RandomForestClassifier(n_estimators=100, random_state=42)
+        self.model = RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=N_JOBS)
         self.model.fit(X_train_scaled, y_train)
         
         # Avaliar modelo
         y_pred = self.model.predict(X_test_scaled)
         accuracy = accuracy_score(y_test, y_pred)
         
-        # Salvar modelo
+        # Salvar modelo e a marca d'água (última leitura usada no treino)
         self.save_model()
+        self._record_training(keys, "full", len(X))
         
         return {
             "success": True,
@@ -206,22 +198,153 @@ class MLService:
             "classification_report": classification_report(y_test, y_pred)
         }
     
+    def train_from_store(self, start_date=None, end_date=None):
+        """
+        Treina com o histórico completo lido em colunas (banco + arquivo
+        Parquet), sem materializar objetos ORM.
+        """
+        sensor_frame = SensorRecordRepository(self.session).read_frame(
+            ['id', 'timestamp'] + SENSOR_COLUMNS, start_date, end_date)
+        climate_frame = ClimateDataRepository(self.session).read_frame(
+            ['timestamp'] + CLIMATE_COLUMNS, start_date, end_date)
+        return self.train_model(sensor_frame, climate_frame)
+    
+    def search_hyperparameters(self, sensor_data, climate_data, param_grid=None, mode="grid",
+                               n_iter=10, cv=5, max_workers=None):
+        """
+        Busca de hiperparâmetros (grid ou aleatória) com validação cruzada,
+        avaliando os candidatos em paralelo em um pool de processos.
+        O melhor candidato é retreinado com todos os dados e salvo.
+        """
+        if mode not in ("grid", "random"):
+            raise ValueError(f"Modo de busca inválido: {mode} (use 'grid' ou 'random')")
+        
+        data = self.prepare_data(sensor_data, climate_data, with_keys=True)
+        X, y, keys = data if data is not None else (None, None, None)
+        if X is None or len(X) < MIN_TRAINING_SAMPLES:
+            return {"success": False, "message": f"Dados insuficientes para treinamento (mínimo {MIN_TRAINING_SAMPLES} registros, obtidos: {len(X) if X is not None else 0})"}
+        
+        param_grid = param_grid or DEFAULT_PARAM_GRID
+        if mode == "grid":
+            candidates = list(ParameterGrid(param_grid))
+        else:
+            candidates = list(ParameterSampler(param_grid, n_iter=n_iter, random_state=42))
+        
+        print(f"🔍 Avaliando {len(candidates)} candidatos ({cv} folds, {len(X)} amostras)...")
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(_evaluate_candidate, candidates,
+                                    [X] * len(candidates), [y] * len(candidates), [cv] * len(candidates)))
+        elapsed = time.perf_counter() - start
+        
+        results.sort(key=lambda result: result["mean_accuracy"], reverse=True)
+        for result in results:
+            print(f"  {result['mean_accuracy']:.3f} ± {result['std_accuracy']:.3f} "
+                  f"({result['seconds']:.1f}s) {result['params']}")
+        
+        # Retreinar o melhor candidato com todos os dados, usando todos os núcleos
+        best = results[0]
+        self.scaler = StandardScaler()
+        self.model = RandomForestClassifier(random_state=42, n_jobs=N_JOBS, **best["params"])
+        self.model.fit(self.scaler.fit_transform(X), y)
+        self.save_model()
+        self._record_training(keys, f"search:{mode}", len(X))
+        
+        return {
+            "success": True,
+            "best_params": best["params"],
+            "best_accuracy": best["mean_accuracy"],
+            "candidates": results,
+            "search_seconds": elapsed
+        }
+    
+    def train_incremental(self, trees_per_update=INCREMENTAL_TREES, max_estimators=MAX_ESTIMATORS,
+                          page_size=5000):
+        """
+        Atualiza o modelo apenas com leituras posteriores à marca d'água do
+        último treino: novas árvores são treinadas só com os dados novos
+        (warm start) e somadas à floresta, que mantém no máximo
+        max_estimators árvores (as mais antigas são descartadas).
+        O scaler é mantido para não alterar a entrada das árvores existentes.
+        """
+        state = self._load_training_state()
+        if self.model is None or not state.get("watermark"):
+            return {"success": False, "message": "Treine o modelo completo antes da atualização incremental"}
+        
+        watermark = datetime.fromisoformat(state["watermark"])
+        # Chave (timestamp, id): leituras com o mesmo timestamp da marca d'água ainda não usadas também entram
+        sensor_data = self._fetch_since(SensorRecordRepository(self.session), watermark, page_size,
+                                        after_id=state.get("watermark_id"))
+        if not sensor_data:
+            return {"success": False, "message": "Nenhuma leitura nova desde o último treino"}
+        
+        # O clima anterior à marca d'água ainda pode casar com as primeiras leituras novas
+        climate_data = self._fetch_since(ClimateDataRepository(self.session),
+                                         watermark - pd.Timedelta(DEFAULT_TOLERANCE), page_size)
+        
+        data = self.prepare_data(sensor_data, climate_data, with_keys=True)
+        X, y, keys = data if data is not None else (None, None, None)
+        if X is None or len(X) < MIN_TRAINING_SAMPLES:
+            return {"success": False, "message": f"Dados novos insuficientes (mínimo {MIN_TRAINING_SAMPLES}, obtidos: {len(X) if X is not None else 0})"}
+        if set(np.unique(y)) != set(self.model.classes_):
+            # Árvores com outro conjunto de classes não podem ser somadas à floresta: retreina do zero
+            print("⚠️ Classes dos dados novos diferem das do modelo; retreinando com o histórico completo...")
+            return {**self.train_from_store(), "mode": "full"}
+        
+        X_scaled = self.scaler.transform(X)
+        # Avaliação prequencial: acurácia do modelo atual nos dados ainda não vistos
+        accuracy_before = accuracy_score(y, self.model.predict(X_scaled))
+        
+        print(f"🔁 Atualizando modelo com {len(X)} amostras novas (+{trees_per_update} árvores)...")
+        # O modelo atual é compartilhado pelo registro com as demais sessões do processo:
+        # a atualização é feita em uma cópia, que só substitui o modelo ao final
+        model = copy.deepcopy(self.model)
+        model.set_params(warm_start=True, n_estimators=len(model.estimators_) + trees_per_update)
+        model.fit(X_scaled, y)
+        if len(model.estimators_) > max_estimators:
+            model.estimators_ = model.estimators_[-max_estimators:]
+            model.n_estimators = max_estimators
+        
+        self.model = model
+        self.save_model()
+        self._record_training(keys, "incremental", state.get("samples", 0) + len(X))
+        
+        return {
+            "success": True,
+            "mode": "incremental",
+            "new_samples": len(X),
+            "accuracy_before_update": accuracy_before,
+            "n_estimators": len(self.model.estimators_)
+        }
+    
+    @staticmethod
+    def _fetch_since(repo, after_timestamp, page_size, after_id=None):
+        """
+        Lê, por paginação de chave, todos os registros posteriores à chave
+        (after_timestamp, after_id); sem after_id, os posteriores ao timestamp.
+        """
+        rows = []
+        last = None
+        while True:
+            page = repo.get_page(after_timestamp=last.timestamp if last else after_timestamp,
+                                 after_id=last.id if last else after_id, limit=page_size)
+            rows.extend(record.to_dict() for record in page)
+            if len(page) < page_size:
+                return rows
+            last = page[-1]
+    
     def predict_irrigation(self, soil_moisture, soil_ph, phosphorus_present, 
                           potassium_present, temperature, air_humidity, 
                           rain_forecast, hour=None, month=None):
         """
         Prediz se deve irrigar baseado nos dados atuais
         """
-        if self.model is None:
-            return {"success": False, "message": "Modelo não treinado"}
-        
         if hour is None:
             hour = datetime.now().hour
         if month is None:
             month = datetime.now().month
         
-        # Criar feature vector
-        features = np.array([[
+        result = self.predict_batch([
             soil_moisture,
             soil_ph,
             float(phosphorus_present),
@@ -231,20 +354,36 @@ class MLService:
             float(rain_forecast),
             hour,
             month
-        ]])
+        ])
+        if not result["success"]:
+            return result
         
-        # Normalizar features
-        features_scaled = self.scaler.transform(features)
+        return {
+            "success": True,
+            "should_irrigate": bool(result["should_irrigate"][0]),
+            "confidence": float(result["confidence"][0]),
+            "irrigation_probability": float(result["irrigation_probability"][0])
+        }
+    
+    def predict_batch(self, samples):
+        """
+        Prediz a irrigação para várias amostras em uma única chamada vetorizada.
+        Recebe DataFrame ou ndarray (ver as_feature_matrix) e retorna arrays
+        alinhados às amostras. A classe é derivada de um único predict_proba.
+        """
+        if self.model is None:
+            return {"success": False, "message": "Modelo não treinado"}
         
-        # Fazer predição
-        prediction = self.model.predict(features_scaled)[0]
-        probability = self.model.predict_proba(features_scaled)[0]
+        features_scaled = self.scaler.transform(as_feature_matrix(samples))
+        probabilities = self.model.predict_proba(features_scaled)
+        classes = self.model.classes_
+        positive = np.flatnonzero(classes == 1)
         
         return {
             "success": True,
-            "should_irrigate": bool(prediction),
-            "confidence": float(max(probability)),
-            "irrigation_probability": float(probability[1]) if len(probability) > 1 else 0.0
+            "should_irrigate": classes[probabilities.argmax(axis=1)].astype(bool),
+            "confidence": probabilities.max(axis=1),
+            "irrigation_probability": probabilities[:, positive[0]] if positive.size else np.zeros(len(probabilities))
         }
     
     def get_feature_importance(self):
@@ -268,22 +407,72 @@ class MLService:
         Salva o modelo treinado
         """
         if self.model is not None:
-            joblib.dump(self.model, self.model_path)
-            joblib.dump(self.scaler, self.scaler_path)
+            save_artifact(self.model, self.model_path)
+            save_artifact(self.scaler, self.scaler_path)
+            self.export_compiled()
+    
+    def export_compiled(self, path=None):
+        """
+        Exporta floresta e scaler para o formato compilado (services/compiled_forest.py),
+        lido pelo daemon de ingestão sem scikit-learn. Retorna caminho, tamanho,
+        árvores e nós do arquivo gerado.
+        """
+        if self.model is None:
+            return {"success": False, "message": "Modelo não treinado"}
+        
+        path = path or self.compiled_path
+        compiled = compile_forest(self.model, self.scaler, FEATURE_COLUMNS)
+        size = save_compiled(compiled, path)
+        return {
+            "success": True,
+            "path": path,
+            "bytes": size,
+            "trees": len(compiled["roots"]),
+            "nodes": len(compiled["feature"])
+        }
     
     def load_model(self):
         """
-        Carrega modelo salvo
+        Carrega modelo salvo (uma vez por processo, via registro de modelos)
         """
         try:
             if os.path.exists(self.model_path) and os.path.exists(self.scaler_path):
-                self.model = joblib.load(self.model_path)
-                self.scaler = joblib.load(self.scaler_path)
+                self.model = load_artifact(self.model_path)
+                self.scaler = load_artifact(self.scaler_path)
                 return True
         except Exception as e:
             print(f"Erro ao carregar modelo: {e}")
         return False
     
+    def _load_training_state(self):
+        if not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path, encoding="utf-8") as file:
+            return json.load(file)
+    
+    def _record_training(self, keys, mode, samples):
+        """
+        Grava a marca d'água (chave timestamp e id da última leitura usada no
+        treino, na ordem da paginação) e o modo de treino. keys são as chaves
+        das leituras que casaram com o clima (prepare_data com with_keys):
+        as últimas leituras ainda sem clima não avançam a marca e entram na
+        próxima atualização.
+        """
+        frame = pd.DataFrame(keys)
+        frame['timestamp'] = to_naive_utc(frame['timestamp'])
+        if 'id' not in frame:
+            frame['id'] = None
+        last = frame.sort_values(['timestamp', 'id'], na_position='first').iloc[-1]
+        state = {
+            "watermark": last['timestamp'].isoformat(),
+            "watermark_id": last['id'] if isinstance(last['id'], str) else None,
+            "mode": mode,
+            "samples": samples,
+            "trained_at": datetime.now().isoformat()
+        }
+        with open(self.state_path, "w", encoding="utf-8") as file:
+            json.dump(state, file, indent=2)
+    
     def get_model_status(self):
         """
         Retorna o status atual do modelo
@@ -291,5 +480,7 @@ class MLService:
         return {
             "model_loaded": self.model is not None,
             "model_path": self.model_path,
-            "scaler_path": self.scaler_path
+            "scaler_path": self.scaler_path,
+            "compiled_path": self.compiled_path if os.path.exists(self.compiled_path) else None,
+            "watermark": self._load_training_state().get("watermark")
         } 
\ No newline at end of file
@@ -0,0 +1,43 @@
+import os
+import threading
+
+import joblib
+
+# Artefatos já carregados no processo, por caminho absoluto: (mtime, objeto)
+_artifacts = {}
+_lock = threading.Lock()
+
+
+def load_artifact(path: str):
+    """
+    Carrega um artefato salvo com joblib uma única vez por processo: as
+    instâncias do MLService no mesmo processo compartilham o objeto carregado.
+    O artefato é recarregado automaticamente se o arquivo for modificado.
+
+    O objeto compartilhado não deve ser alterado in-place; quem precisar
+    modificá-lo (ex.: treino incremental) trabalha em uma cópia e a registra
+    com save_artifact.
+    """
+    path = os.path.abspath(path)
+    mtime = os.path.getmtime(path)
+    with _lock:
+        cached = _artifacts.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+    artifact = joblib.load(path)
+    with _lock:
+        _artifacts[path] = (mtime, artifact)
+    return artifact
+
+
+def save_artifact(artifact, path: str):
+    """Salva o artefato e o registra como a versão corrente do arquivo."""
+    joblib.dump(artifact, path)
+    path = os.path.abspath(path)
+    with _lock:
+        _artifacts[path] = (os.path.getmtime(path), artifact)
+
+
+def clear():
+    with _lock:
+        _artifacts.clear()
@@ -4,6 +4,7 @@ from sqlalchemy.exc import SQLAlchemyError
 from datetime import datetime, date
 
 from database import ProducerRepository
+from services.state_cache import data_versions
 
 
 class ProducerService:
@@ -17,6 +18,7 @@ class ProducerService:
                 email=data['email'],
                 phone=data['phone']
             )
+            data_versions.bump('producers')
             return producer.__dict__
         except SQLAlchemyError as e:
             self.repo.session.rollback()
@@ -27,11 +29,12 @@ class ProducerService:
         return producer.__dict__ if producer else None
 
     def list_producers(self) -> List[dict]:
-        return [producer.__dict__ for producer in self.repo.get_all()]
+        return self.repo.get_all_rows()
 
     def update_producer(self, producer_id: str, data: dict) -> Optional[dict]:
         try:
             updated_producer = self.repo.update(producer_id, **data)
+            data_versions.bump('producers')
             return updated_producer.__dict__ if updated_producer else None
         except SQLAlchemyError as e:
             self.repo.session.rollback()
@@ -39,7 +42,11 @@ class ProducerService:
 
     def delete_producer(self, producer_id: str) -> bool:
         try:
-            return self.repo.delete(producer_id)
+            deleted = self.repo.delete(producer_id)
+            # Registros dependentes são removidos em cascata
+            data_versions.bump('producers', 'crops', 'components', 'sensor_records', 'applications',
+                               'irrigation_decisions')
+            return deleted
         except SQLAlchemyError as e:
             self.repo.session.rollback()
             raise e
@@ -0,0 +1,143 @@
+"""
+Simulação vetorizada de leituras de sensores e dados climáticos.
+
+Usada pelo script generate_sample_data.py e pela carga em escala de
+database/seed.py: gera o clima e as leituras de vários sensores em blocos
+com NumPy e grava no banco (inserts em lote) ou no arquivo Parquet (mesmo
+layout de database/archive.py).
+"""
+import time
+import uuid
+from datetime import datetime
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from database.archive import write_archive
+from database.models import ClimateData, SensorRecord
+from database.repositories import ClimateDataRepository, ComponentRepository, SensorRecordRepository
+from services.irrigation_rules import irrigation_rules
+
+# Horários das leituras quando não há intervalo fixo (a cada 4 horas, das 6h às 22h)
+DEFAULT_HOURS = (6, 10, 14, 18, 22)
+
+# Faixa de variação da temperatura sobre a base de 20 °C por hora do dia:
+# noite (-3, 3), manhã (-2, 5), meio da manhã (2, 8), tarde (8, 15), fim da tarde (3, 10)
+BASE_TEMPERATURE = 20.0
+_DIURNAL_BANDS = [((0, 6), (-3, 3)), ((6, 10), (-2, 5)), ((10, 14), (2, 8)),
+                  ((14, 18), (8, 15)), ((18, 22), (3, 10)), ((22, 24), (-3, 3))]
+TEMPERATURE_LOW = np.zeros(24)
+TEMPERATURE_HIGH = np.zeros(24)
+for (first_hour, last_hour), (low, high) in _DIURNAL_BANDS:
+    TEMPERATURE_LOW[first_hour:last_hour] = low
+    TEMPERATURE_HIGH[first_hour:last_hour] = high
+
+
+def reading_timestamps(start_date: datetime, days: int, interval_minutes: Optional[int],
+                       rng: np.random.Generator) -> np.ndarray:
+    """
+    Instantes das leituras: a cada interval_minutes a partir de start_date
+    ou, sem intervalo, nos horários DEFAULT_HOURS com minuto aleatório.
+    """
+    start = np.datetime64(start_date, 'm')
+    if interval_minutes:
+        return start + np.arange(0, days * 24 * 60, interval_minutes).astype('timedelta64[m]')
+    offsets = (np.arange(days)[:, None] * 24 * 60 + np.array(DEFAULT_HOURS) * 60
+               + rng.integers(0, 60, size=(days, len(DEFAULT_HOURS))))
+    return start + offsets.ravel().astype('timedelta64[m]')
+
+
+def simulate_climate(timestamps: np.ndarray, rng: np.random.Generator) -> pd.DataFrame:
+    """Temperatura com ciclo diário, umidade do ar inversa à temperatura e chuva mais provável à tarde."""
+    hours = pd.DatetimeIndex(timestamps).hour.to_numpy()
+    temperature = BASE_TEMPERATURE + rng.uniform(TEMPERATURE_LOW[hours], TEMPERATURE_HIGH[hours])
+    air_humidity = np.clip(80 - temperature * 1.5 + rng.uniform(-10, 10, len(hours)), 30, 95)
+    rain_forecast = rng.random(len(hours)) < np.where(hours >= 14, 0.3, 0.1)
+    return pd.DataFrame({
+        'timestamp': timestamps.astype('datetime64[us]'),
+        'temperature': temperature.round(1),
+        'air_humidity': air_humidity.round(1),
+        'rain_forecast': rain_forecast,
+    })
+
+
+def simulate_sensor_readings(climate: pd.DataFrame, sensor_ids: List[str], rng: np.random.Generator) -> pd.DataFrame:
+    """
+    Uma leitura por sensor em cada instante do clima: a umidade do solo cai
+    com temperatura acima de 25 °C e sobe com previsão de chuva.
+    """
+    shape = (len(climate), len(sensor_ids))
+    temperature = climate['temperature'].to_numpy()[:, None]
+    rain_forecast = np.broadcast_to(climate['rain_forecast'].to_numpy()[:, None], shape)
+    base_moisture = 60 - 15 * (temperature > 25) + 20 * rain_forecast
+    soil_moisture = np.clip(base_moisture + rng.uniform(-10, 10, shape), 10, 90)
+    soil_ph = 6.0 + rng.uniform(-0.5, 0.5, shape)
+    phosphorus_present = rng.random(shape) > 0.3  # 70% de chance de estar presente
+    potassium_present = rng.random(shape) > 0.2   # 80% de chance de estar presente
+    status = irrigation_rules.statuses({
+        'soil_moisture': soil_moisture.ravel(),
+        'soil_ph': soil_ph.ravel(),
+        'phosphorus_present': phosphorus_present.ravel(),
+        'potassium_present': potassium_present.ravel(),
+        'rain_forecast': rain_forecast.ravel(),
+    })
+
+    return pd.DataFrame({
+        'id': [str(uuid.uuid4()) for _ in range(soil_moisture.size)],
+        'sensor_id': np.tile(np.asarray(sensor_ids, dtype=object), shape[0]),
+        'timestamp': np.repeat(climate['timestamp'].to_numpy(), shape[1]),
+        'soil_moisture': soil_moisture.ravel().round(1),
+        'phosphorus_present': phosphorus_present.ravel(),
+        'potassium_present': potassium_present.ravel(),
+        'soil_ph': soil_ph.ravel().round(1),
+        'irrigation_status': status,
+    })
+
+
+def ensure_sensors(session, count: int) -> List[str]:
+    """Reaproveita os sensores cadastrados e cria os que faltam para chegar a count."""
+    repo = ComponentRepository(session)
+    sensor_ids = [row['id'] for row in repo.get_all_rows() if row['type'] == 'Sensor'][:count]
+    for index in range(len(sensor_ids), count):
+        sensor_ids.append(repo.create(name=f"Sensor Simulado {index + 1:03d}", type="Sensor").id)
+    return sensor_ids
+
+
+def write_readings(session, sensor_ids: List[str], timestamps: np.ndarray, rng: np.random.Generator,
+                   parquet_dir: Optional[str] = None, batch_size: int = 100_000) -> dict:
+    """
+    Simula e grava clima e leituras dos sensores nos instantes dados, em
+    blocos de cerca de batch_size leituras, no banco (bulk_create) ou no
+    arquivo Parquet. Devolve as contagens, os tempos e a vazão em linhas/s.
+    """
+    climate_repo = ClimateDataRepository(session)
+    sensor_repo = SensorRecordRepository(session)
+    stats = {'climate_records': 0, 'sensor_records': 0, 'generate_seconds': 0.0, 'write_seconds': 0.0}
+    # Cada bloco cobre os instantes que somam cerca de batch_size leituras de sensor
+    step = max(1, batch_size // len(sensor_ids))
+
+    for first in range(0, len(timestamps), step):
+        started = time.perf_counter()
+        climate = simulate_climate(timestamps[first:first + step], rng)
+        readings = simulate_sensor_readings(climate, sensor_ids, rng)
+        generated = time.perf_counter()
+
+        if parquet_dir:
+            climate.insert(0, 'id', [str(uuid.uuid4()) for _ in range(len(climate))])
+            write_archive(climate, ClimateData, parquet_dir)
+            write_archive(readings, SensorRecord, parquet_dir)
+        else:
+            climate_repo.bulk_create(climate.to_dict('records'), batch_size=10_000)
+            sensor_repo.bulk_create(readings.to_dict('records'), batch_size=10_000)
+
+        stats['generate_seconds'] += generated - started
+        stats['write_seconds'] += time.perf_counter() - generated
+        stats['climate_records'] += len(climate)
+        stats['sensor_records'] += len(readings)
+        print(f"   ... {stats['sensor_records']:,} leituras de sensor")
+
+    total = stats['climate_records'] + stats['sensor_records']
+    elapsed = stats['generate_seconds'] + stats['write_seconds']
+    stats['rows_per_second'] = total / elapsed if elapsed else 0.0
+    return stats
@@ -1,8 +1,17 @@
-from typing import Optional, List
+from typing import Optional, List, Iterable
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
+import uuid
+from datetime import datetime, timezone
+import pandas as pd
 
 from database import SensorRecordRepository
+from database.repositories.projections import SensorFilter
+from database.archive import ARCHIVE_DIR
+from database.models import SensorRecord
+from services.exporter import EXPORT_CHUNK_SIZE, Sink, arrow_schema, export_frames
+from services.irrigation_rules import irrigation_rules
+from services.state_cache import data_versions, latest_state, snapshot, sensor_key, time_key, LATEST_SENSOR_RECORD
 
 
 class SensorRecordService:
@@ -11,32 +20,75 @@ class SensorRecordService:
 
     def create_sensor_record(self, data: dict) -> dict:
         try:
+            # A decisão de irrigação é avaliada antes do insert: um único commit por leitura
             record = self.repo.create(
                 sensor_id=data['sensor_id'],
                 soil_moisture=data['soil_moisture'],
                 phosphorus_present=data['phosphorus_present'],
                 potassium_present=data['potassium_present'],
                 soil_ph=data['soil_ph'],
-                irrigation_status=data.get('irrigation_status', 'DESLIGADA')
+                irrigation_status=irrigation_rules.status(data)
             )
-            record = self._process_irrigation_logic(record)
+            self._publish_latest(snapshot(record))
+            data_versions.bump('sensor_records')
             return record.__dict__
         except SQLAlchemyError as e:
             self.repo.session.rollback()
             raise e
 
+    def bulk_create_sensor_records(self, records: Iterable[dict], batch_size: int = 1000) -> int:
+        """
+        Ingestão em lote: avalia a lógica de irrigação em memória e grava as
+        leituras com um executemany e um commit por lote. Retorna o total inserido.
+        """
+        latest_by_sensor = {}
+
+        def rows():
+            for data in records:
+                row = {
+                    **data,
+                    'id': data.get('id') or str(uuid.uuid4()),
+                    'timestamp': data.get('timestamp') or datetime.now(timezone.utc),
+                    'irrigation_status': irrigation_rules.status(data)
+                }
+                current = latest_by_sensor.get(row['sensor_id'])
+                if current is None or time_key(row['timestamp']) >= time_key(current['timestamp']):
+                    latest_by_sensor[row['sensor_id']] = row
+                yield row
+
+        try:
+            total = self.repo.bulk_create(rows(), batch_size=batch_size)
+        except SQLAlchemyError as e:
+            self.repo.session.rollback()
+            # Lotes anteriores podem ter sido gravados: força a releitura desses sensores
+            for sensor_id in latest_by_sensor:
+                latest_state.evict(sensor_key(sensor_id))
+            latest_state.evict(LATEST_SENSOR_RECORD)
+            data_versions.bump('sensor_records')
+            raise e
+        for row in latest_by_sensor.values():
+            self._publish_latest({key: row.get(key) for key in self._CACHED_COLUMNS})
+        data_versions.bump('sensor_records')
+        return total
+
     def get_sensor_record(self, record_id: str) -> Optional[dict]:
         record = self.repo.get_by_id(record_id)
         return record.__dict__ if record else None
 
     def list_sensor_records(self) -> List[dict]:
-        return [record.__dict__ for record in self.repo.get_all()]
+        return self.repo.get_all_rows()
+
+    def list_recent_ids(self, sensor_id: SensorFilter = None, start_date: Optional[datetime] = None,
+                        end_date: Optional[datetime] = None, limit: int = 500) -> List[str]:
+        return self.repo.get_recent_ids(start_date, end_date, sensor_id, limit)
 
     def update_sensor_record(self, record_id: str, data: dict) -> Optional[dict]:
         try:
             updated_record = self.repo.update(record_id, **data)
             if updated_record:
                 updated_record = self._process_irrigation_logic(updated_record)
+                latest_state.evict_record(record_id)
+            data_versions.bump('sensor_records')
             return updated_record.__dict__ if updated_record else None
         except SQLAlchemyError as e:
             self.repo.session.rollback()
@@ -44,28 +96,75 @@ class SensorRecordService:
 
     def delete_sensor_record(self, record_id: str) -> bool:
         try:
-            return self.repo.delete(record_id)
+            latest_state.evict_record(record_id)
+            deleted = self.repo.delete(record_id)
+            data_versions.bump('sensor_records')
+            return deleted
         except SQLAlchemyError as e:
             self.repo.session.rollback()
             raise e
 
     def list_records_by_sensor(self, sensor_id: str) -> List[dict]:
-        return [record.__dict__ for record in self.repo.get_by_sensor(sensor_id)]
+        return self.repo.get_rows_by_sensor(sensor_id)
 
     def get_latest_record_by_sensor(self, sensor_id: str) -> Optional[dict]:
-        record = self.repo.get_latest_by_sensor(sensor_id)
-        return record.__dict__ if record else None
+        def load():
+            record = self.repo.get_latest_by_sensor(sensor_id)
+            return snapshot(record) if record else None
+        return latest_state.get(sensor_key(sensor_id), load)
+
+    def get_latest_record(self) -> Optional[dict]:
+        """Leitura mais recente entre todos os sensores (servida pelo cache de estado)."""
+        def load():
+            record = self.repo.get_latest()
+            return snapshot(record) if record else None
+        return latest_state.get(LATEST_SENSOR_RECORD, load)
 
     def get_average_values_by_sensor(self, sensor_id: str) -> dict:
         return self.repo.get_average_values_by_sensor(sensor_id)
 
+    def get_sensor_series(self, bucket: str = '1h', sensor_id: SensorFilter = None,
+                          start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> List[dict]:
+        """Série agregada por bucket e sensor (banco + arquivo Parquet)."""
+        return self.repo.read_series(bucket, sensor_id, start_date, end_date)
+
+    def count_sensor_records(self, sensor_id: SensorFilter = None, start_date: Optional[datetime] = None,
+                             end_date: Optional[datetime] = None) -> int:
+        return self.repo.count_rows(start_date, end_date, sensor_id)
+
+    def get_sensor_records_frame(self, columns: Optional[List[str]] = None, sensor_id: SensorFilter = None,
+                                 start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> pd.DataFrame:
+        """Leituras como DataFrame tipado, lidas em colunas (banco + arquivo Parquet)."""
+        return self.repo.read_frame(columns, start_date, end_date, sensor_id)
+
+    def export_sensor_records(self, sink: Sink, fmt: str = 'csv', compression: Optional[str] = None,
+                              columns: Optional[List[str]] = None, sensor_id: SensorFilter = None,
+                              start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
+                              chunk_size: int = EXPORT_CHUNK_SIZE, archive_dir: str = ARCHIVE_DIR) -> int:
+        """
+        Exporta as leituras para CSV, Parquet ou Arrow IPC em blocos, direto
+        do cursor para o destino (caminho ou arquivo binário). Inclui as
+        leituras já arquivadas em Parquet (exportadas antes das do banco).
+        Retorna o total de linhas exportadas.
+        """
+        frames = self.repo.iter_tiered_frames(columns, start_date, end_date, sensor_id, chunk_size, archive_dir)
+        schema = arrow_schema(SensorRecord, columns) if fmt != 'csv' else None
+        return export_frames(frames, sink, fmt, compression, schema)
+
+    _CACHED_COLUMNS = ('id', 'sensor_id', 'timestamp', 'soil_moisture', 'phosphorus_present',
+                       'potassium_present', 'soil_ph', 'irrigation_status')
+
+    @staticmethod
+    def _publish_latest(record: dict):
+        latest_state.offer(sensor_key(record['sensor_id']), record)
+        latest_state.offer(LATEST_SENSOR_RECORD, record)
+
     def _process_irrigation_logic(self, record) -> SensorRecordRepository:
-        should_irrigate = (
-            record.soil_moisture < 30.0 or  # Umidade muito baixa
-            record.soil_ph < 5.0 or record.soil_ph > 8.0 or  # pH fora do ideal
-            not record.phosphorus_present or  # Falta de fósforo
-            not record.potassium_present  # Falta de potássio
-        )
-        record.irrigation_status = "ATIVADA" if should_irrigate else "DESLIGADA"
+        record.irrigation_status = irrigation_rules.status({
+            'soil_moisture': record.soil_moisture,
+            'soil_ph': record.soil_ph,
+            'phosphorus_present': record.phosphorus_present,
+            'potassium_present': record.potassium_present
+        })
         self.repo.session.commit()
         return record
@@ -0,0 +1,262 @@
+import os
+import queue
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+
+import serial
+
+from logs.logger import Logger
+
+logger = Logger(__name__)()
+
+BAUDRATE = int(os.getenv("SERIAL_BAUDRATE", "115200"))
+RECONNECT_DELAY = float(os.getenv("SERIAL_RECONNECT_DELAY", "2"))
+WRITE_QUEUE_SIZE = int(os.getenv("SERIAL_WRITE_QUEUE_SIZE", "100"))
+
+# Linha impressa pelo ESP32 a cada leitura (src/esp32/src/main.cpp):
+# "Umidade: 45.00% | Fosforo: Presente | Potassio: Ausente | pH: 6.5"
+READING_PATTERN = re.compile(
+    r"Umidade:\s*(?P<moisture>-?[\d.]+)\s*%\s*\|\s*"
+    r"F[oó]sforo:\s*(?P<phosphorus>Presente|Ausente)\s*\|\s*"
+    r"Pot[aá]ssio:\s*(?P<potassium>Presente|Ausente)\s*\|\s*"
+    r"pH:\s*(?P<ph>-?[\d.]+)",
+    re.IGNORECASE
+)
+
+
+def parse_reading(line: str) -> Optional[dict]:
+    """
+    Converte uma linha de leitura do ESP32 nos campos de um registro de sensor.
+    Retorna None para linhas que não são leituras (mensagens de status, clima etc.).
+    """
+    match = READING_PATTERN.search(line)
+    if not match:
+        return None
+    return {
+        "soil_moisture": float(match["moisture"]),
+        "phosphorus_present": match["phosphorus"].lower() == "presente",
+        "potassium_present": match["potassium"].lower() == "presente",
+        "soil_ph": float(match["ph"])
+    }
+
+
+def parse_ports(value: str) -> Dict[str, Optional[str]]:
+    """
+    Interpreta a lista de portas no formato "porta[=sensor_id],porta[=sensor_id]".
+    """
+    ports = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        port, _, sensor_id = item.partition("=")
+        ports[port.strip()] = sensor_id.strip() or None
+    return ports
+
+
+class SerialLink:
+    """
+    Conexão serial de longa duração com uma placa ESP32.
+
+    A porta é aberta uma única vez (com DTR/RTS desligados, para não
+    reiniciar a placa) e mantida aberta. Escritas entram em uma fila e são
+    enviadas por uma thread própria; outra thread lê as linhas da placa e
+    entrega as leituras de sensor ao callback `on_reading`. Em caso de falha
+    a porta é fechada e reaberta após `reconnect_delay` segundos, sem perder
+    a mensagem que estava sendo enviada.
+    """
+
+    def __init__(self, port: str, sensor_id: Optional[str] = None, baudrate: int = BAUDRATE,
+                 on_reading: Optional[Callable[[dict], None]] = None,
+                 reconnect_delay: float = RECONNECT_DELAY, queue_size: int = WRITE_QUEUE_SIZE):
+        self.port = port
+        self.sensor_id = sensor_id
+        self.baudrate = baudrate
+        self.on_reading = on_reading
+        self.reconnect_delay = reconnect_delay
+        self.reconnects = 0
+        self.dropped_writes = 0
+        self._writes = queue.Queue(maxsize=queue_size)
+        self._serial = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads = []
+
+    @property
+    def connected(self) -> bool:
+        return self._serial is not None and self._serial.is_open
+
+    def start(self):
+        if self._threads:
+            return self
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._write_loop, name=f"serial-writer-{self.port}", daemon=True),
+            threading.Thread(target=self._read_loop, name=f"serial-reader-{self.port}", daemon=True)
+        ]
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        self._close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def send(self, line: str) -> bool:
+        """
+        Enfileira uma linha para envio. Com a fila cheia (placa desconectada
+        por muito tempo) a mensagem mais antiga é descartada.
+        """
+        while True:
+            try:
+                self._writes.put_nowait(line)
+                return True
+            except queue.Full:
+                try:
+                    self._writes.get_nowait()
+                    # A mensagem descartada não chega ao _write_loop: é concluída aqui para o flush
+                    self._writes.task_done()
+                    self.dropped_writes += 1
+                except queue.Empty:
+                    pass
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Aguarda o envio de todas as mensagens enfileiradas."""
+        deadline = time.monotonic() + timeout
+        while self._writes.unfinished_tasks:
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def _connect(self):
+        with self._lock:
+            if self.connected:
+                return self._serial
+            connection = serial.Serial()
+            connection.port = self.port
+            connection.baudrate = self.baudrate
+            connection.timeout = 0.5
+            connection.write_timeout = 2
+            connection.dtr = False
+            connection.rts = False
+            connection.open()
+            self._serial = connection
+            logger.info(f"[OK] Porta serial {self.port} conectada")
+            return connection
+
+    def _close(self):
+        with self._lock:
+            if self._serial is not None:
+                try:
+                    self._serial.close()
+                except serial.SerialException:
+                    pass
+                self._serial = None
+
+    def _handle_failure(self, error: Exception):
+        logger.error(f"[ERRO] Porta serial {self.port} indisponível: {error}")
+        self._close()
+        self.reconnects += 1
+        self._stop.wait(self.reconnect_delay)
+
+    def _write_loop(self):
+        while not self._stop.is_set():
+            try:
+                line = self._writes.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            while not self._stop.is_set():
+                try:
+                    self._connect().write((line.rstrip("\n") + "\n").encode())
+                    break
+                except (serial.SerialException, OSError) as e:
+                    self._handle_failure(e)
+            self._writes.task_done()
+
+    def _read_loop(self):
+        buffer = b""
+        while not self._stop.is_set():
+            try:
+                chunk = self._connect().read(256)
+            except (serial.SerialException, OSError, TypeError) as e:
+                # TypeError: pyserial ao ler de uma porta fechada por outra thread
+                buffer = b""
+                self._handle_failure(e)
+                continue
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for raw in lines:
+                self._handle_line(raw.decode("utf-8", errors="replace").strip())
+
+    def _handle_line(self, line: str):
+        reading = parse_reading(line)
+        if reading is None or self.on_reading is None:
+            return
+        reading["sensor_id"] = self.sensor_id
+        reading["timestamp"] = datetime.now(timezone.utc)
+        try:
+            self.on_reading(reading)
+        except Exception as e:
+            logger.exception(f"[ERRO] Falha ao processar leitura de {self.port}: {e}")
+
+
+class SerialLinkManager:
+    """Conjunto de conexões seriais, uma por placa (porta)."""
+
+    def __init__(self, on_reading: Optional[Callable[[dict], None]] = None, **link_options):
+        self.on_reading = on_reading
+        self.link_options = link_options
+        self.links: Dict[str, SerialLink] = {}
+
+    def add(self, port: str, sensor_id: Optional[str] = None) -> SerialLink:
+        """
+        Abre (uma vez) a conexão com a porta. Com on_reading, o sensor_id é
+        obrigatório: sem ele as leituras da placa seriam rejeitadas na validação.
+        """
+        if port not in self.links:
+            if sensor_id is None and self.on_reading is not None:
+                raise ValueError(f"Porta {port} sem sensor_id: use SERIAL_PORTS=porta=sensor_id ou SENSOR_ID")
+            self.links[port] = SerialLink(port, sensor_id=sensor_id, on_reading=self.on_reading,
+                                          **self.link_options).start()
+        return self.links[port]
+
+    def send(self, port: str, line: str) -> bool:
+        return self.add(port).send(line)
+
+    def broadcast(self, line: str):
+        for link in self.links.values():
+            link.send(line)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        return all([link.flush(timeout) for link in self.links.values()])
+
+    def stop(self):
+        for link in self.links.values():
+            link.stop()
+        self.links.clear()
+
+    @classmethod
+    def from_env(cls, default_port: str, **options) -> "SerialLinkManager":
+        """
+        Cria o gerenciador com as portas de SERIAL_PORTS (ou apenas a porta
+        padrão). Portas sem "=sensor_id" usam o sensor de SENSOR_ID.
+        """
+        manager = cls(**options)
+        default_sensor_id = os.getenv("SENSOR_ID") or None
+        try:
+            for port, sensor_id in parse_ports(os.getenv("SERIAL_PORTS", default_port)).items():
+                manager.add(port, sensor_id or default_sensor_id)
+        except ValueError:
+            manager.stop()
+            raise
+        return manager
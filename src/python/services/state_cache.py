@@ -0,0 +1,107 @@
+import os
+import threading
+import time
+from datetime import timezone
+from typing import Callable, Optional
+
+# Tempo máximo (s) que uma entrada é considerada atual. Escritas feitas por
+# outros processos (ex.: daemon de ingestão) ficam visíveis após esse prazo.
+LATEST_STATE_TTL = float(os.getenv("LATEST_STATE_TTL", "10"))
+
+
+def snapshot(instance) -> dict:
+    """Copia as colunas de um objeto ORM para um dict simples."""
+    return {column.key: getattr(instance, column.key) for column in instance.__table__.columns}
+
+
+def time_key(value):
+    """Normaliza timestamps com e sem fuso para comparação (UTC sem fuso)."""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class LatestStateCache:
+    """
+    Último estado conhecido por sensor e do clima, mantido em memória pelo
+    processo e atualizado nas escritas dos serviços.
+
+    Uma entrada só é atualizada por escrita depois de ter sido carregada do
+    banco ao menos uma vez; assim, a gravação de uma leitura retroativa nunca
+    é confundida com a mais recente. Entradas ausentes ou vencidas pelo TTL
+    são recarregadas pela função de fallback informada na leitura.
+    """
+
+    def __init__(self, ttl: float = LATEST_STATE_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get(self, key, loader: Callable[[], Optional[dict]]) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                return entry[1]
+        value = loader()
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+        return value
+
+    def offer(self, key, value: dict):
+        """Registra uma escrita; substitui a entrada apenas se for mais recente."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            current = entry[1]
+            if current is None or time_key(value['timestamp']) >= time_key(current['timestamp']):
+                self._entries[key] = (time.monotonic(), value)
+
+    def evict(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def evict_record(self, record_id: str):
+        """Remove as entradas que apontam para um registro alterado ou excluído."""
+        with self._lock:
+            for key in [key for key, (_, value) in self._entries.items() if value and value.get('id') == record_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class DataVersions:
+    """
+    Contador de versão por tabela, incrementado pelos métodos de escrita dos
+    serviços. Caches de leitura (ex.: st.cache_data do dashboard) usam a
+    versão como parte da chave: qualquer escrita neste processo invalida as
+    entradas da tabela, e o TTL do cache cobre escritas de outros processos.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions = {}
+
+    def get(self, table: str) -> int:
+        with self._lock:
+            return self._versions.get(table, 0)
+
+    def bump(self, *tables: str):
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+
+# Chaves usadas pelos serviços
+LATEST_SENSOR_RECORD = ('sensor_records', None)
+LATEST_CLIMATE = ('climate_data', None)
+
+
+def sensor_key(sensor_id: str):
+    return ('sensor_records', sensor_id)
+
+
+latest_state = LatestStateCache()
+data_versions = DataVersions()
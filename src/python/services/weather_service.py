@@ -1,11 +1,16 @@
 import os
 import time
 import json
-import serial
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from logs.logger import Logger
-from services.climate_service import create_climate_data
+from database.oracle import get_session
+from services.climate_service import ClimateService
+from services.serial_link import SerialLinkManager
 
 logger = Logger(__name__)() 
 
@@ -13,78 +18,202 @@ logger = Logger(__name__)()
 SERIAL_DOOR = os.getenv("PORTA_SERIAL", "/dev/ttyUSB0")
 API_KEY = os.getenv("OPEN_WEATHER_API_KEY")
 CITY = os.getenv("OPEN_WEATHER_CITY")
+# Lista de municípios separados por vírgula; sem ela, usa apenas OPEN_WEATHER_CITY
+CITIES = [c.strip() for c in os.getenv("OPEN_WEATHER_CITIES", CITY or "").split(",") if c.strip()]
+API_URL = os.getenv("OPEN_WEATHER_URL", "http://api.openweathermap.org/data/2.5/weather")
+TIMEOUT = float(os.getenv("WEATHER_TIMEOUT", "5"))
+RETRIES = int(os.getenv("WEATHER_RETRIES", "3"))
+BACKOFF = float(os.getenv("WEATHER_BACKOFF", "0.5"))
+CACHE_TTL = float(os.getenv("WEATHER_CACHE_TTL", "600"))
+CACHE_FILE = os.getenv("WEATHER_CACHE_FILE")
+MAX_WORKERS = int(os.getenv("WEATHER_MAX_WORKERS", "16"))
+
+
+_serial_links = None
+
+
+def get_serial_links() -> SerialLinkManager:
+    """Conexões seriais persistentes com as placas (abertas uma vez por processo)."""
+    global _serial_links
+    if _serial_links is None:
+        _serial_links = SerialLinkManager.from_env(SERIAL_DOOR)
+    return _serial_links
 
 
 def send_to_serial(json_data: str):
     """
-    Envia dados JSON ao ESP32 via conexão serial.
+    Envia dados JSON às placas ESP32 pelas conexões seriais persistentes
+    (a porta não é reaberta a cada envio, então a placa não reinicia).
     """
     try:
-        with serial.Serial(SERIAL_DOOR, 115200, timeout=2) as ser:
-            time.sleep(2)
-            ser.write((json_data + "\n").encode())
+        links = get_serial_links()
+        links.broadcast(json_data)
+        if links.flush(timeout=5):
             logger.info("[OK] Dados enviados ao ESP32 via serial")
-    except serial.SerialException as e:
-        logger.error(f"[ERRO] Porta serial indisponível: {e}")
+        else:
+            logger.warning("[ERRO] Envio serial pendente; a mensagem continua na fila")
     except Exception as e:
         logger.exception(f"[ERRO] Erro inesperado ao enviar dados via serial: {e}")
 
 
-def fetch_weather_data():
+class WeatherFetcher:
     """
-    Busca dados climáticos atuais da API OpenWeatherMap.
-    Retorna um dicionário com: temperatura, umidade e previsão de chuva.
+    Cliente da API OpenWeatherMap para vários municípios.
+    Reutiliza conexões (requests.Session com pool), aplica timeout e novas
+    tentativas com backoff exponencial e busca as cidades em paralelo.
+    Respostas ficam em cache por cidade (memória e, opcionalmente, arquivo JSON)
+    durante `ttl` segundos.
     """
-    if not API_KEY or not CITY:
-        raise ValueError("API_KEY ou CIDADE não configurados no .env")
 
-    url = f"http://api.openweathermap.org/data/2.5/weather?q={CITY}&appid={API_KEY}&units=metric&lang=pt_br"
+    def __init__(self, api_key=API_KEY, url=API_URL, timeout=TIMEOUT, retries=RETRIES,
+                 backoff=BACKOFF, ttl=CACHE_TTL, cache_file=CACHE_FILE, max_workers=MAX_WORKERS):
+        self.api_key = api_key
+        self.url = url
+        self.timeout = timeout
+        self.ttl = ttl
+        self.cache_file = cache_file
+        self.max_workers = max_workers
+        self._cache = {}
+        self._lock = threading.Lock()
+
+        retry = Retry(total=retries, backoff_factor=backoff,
+                      status_forcelist=(429, 500, 502, 503, 504), allowed_methods=("GET",))
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        if cache_file:
+            self._cache.update(self._read_cache_file())
+
+    @staticmethod
+    def parse(payload: dict) -> dict:
+        return {
+            "temperature": payload["main"]["temp"],
+            "air_humidity": payload["main"]["humidity"],
+            "rain_forecast": "rain" in payload
+        }
 
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
+    def fetch(self, city: str):
+        """
+        Dados climáticos atuais de uma cidade (do cache, se ainda válido).
+        Retorna None se a API falhar.
+        """
+        with self._lock:
+            cached = self._cache.get(city)
+        if cached and time.time() - cached["fetched_at"] < self.ttl:
+            return cached["data"]
+
+        params = {"q": city, "appid": self.api_key, "units": "metric", "lang": "pt_br"}
+        try:
+            response = self.session.get(self.url, params=params, timeout=self.timeout)
+            response.raise_for_status()
+            data = self.parse(response.json())
+        except requests.exceptions.HTTPError as http_err:
+            logger.error(f"[ERRO] Erro HTTP ({city}): {http_err}")
+            return None
+        except requests.exceptions.RequestException as err:
+            logger.error(f"[ERRO] Falha ao conectar à API ({city}): {err}")
+            return None
+        except (KeyError, ValueError) as e:
+            logger.error(f"[ERRO] Resposta inesperada da API ({city}): {e}")
+            return None
+
+        with self._lock:
+            self._cache[city] = {"fetched_at": time.time(), "data": data}
+            if self.cache_file:
+                self._write_cache_file()
+        return data
+
+    def fetch_many(self, cities) -> dict:
+        """Busca várias cidades em paralelo; retorna {cidade: dados ou None}."""
+        cities = list(dict.fromkeys(cities))
+        if not cities:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(cities))) as pool:
+            return dict(zip(cities, pool.map(self.fetch, cities)))
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def _read_cache_file(self) -> dict:
+        try:
+            with open(self.cache_file, encoding="utf-8") as file:
+                content = file.read()
+            return json.loads(content) if content.strip() else {}
+        except FileNotFoundError:
+            return {}
+        except ValueError as e:
+            logger.warning(f"[ERRO] Cache climático inválido em {self.cache_file}: {e}")
+            return {}
 
-        data = response.json()
+    def _write_cache_file(self):
+        temp_path = f"{self.cache_file}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(self._cache, file, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.cache_file)
 
-        print(f"Response from API: {data}")
 
-        return {
-            "temperature": data["main"]["temp"],
-            "air_humidity": data["main"]["humidity"],
-            "rain_forecast": "rain" in data
-        }
+_fetcher = None
 
-    except requests.exceptions.HTTPError as http_err:
-        print(f"[ERRO] Erro HTTP: {http_err}")
-    except requests.exceptions.RequestException as err:
-        print(f"[ERRO] Falha ao conectar à API: {err}")
-    except Exception as e:
-        print(f"[ERRO] Erro inesperado: {e}")
 
-    return None
+def get_fetcher() -> WeatherFetcher:
+    """Instância compartilhada do WeatherFetcher (pool de conexões único por processo)."""
+    global _fetcher
+    if _fetcher is None:
+        _fetcher = WeatherFetcher()
+    return _fetcher
+
+
+def fetch_weather_data(city: str = None):
+    """
+    Busca dados climáticos atuais da API OpenWeatherMap.
+    Retorna um dicionário com: temperatura, umidade e previsão de chuva.
+    """
+    city = city or CITY
+    if not API_KEY or not city:
+        raise ValueError("API_KEY ou CIDADE não configurados no .env")
+
+    return get_fetcher().fetch(city)
+
+
+def fetch_weather_for_cities(cities=None) -> dict:
+    """
+    Busca os dados climáticos de todos os municípios configurados
+    (OPEN_WEATHER_CITIES) concorrentemente.
+    """
+    cities = cities or CITIES
+    if not API_KEY or not cities:
+        raise ValueError("API_KEY ou CIDADES não configurados no .env")
+
+    return get_fetcher().fetch_many(cities)
 
 
 def run_weather_integration():
     """
     Executa o fluxo completo:
-    1. Busca dados do clima
+    1. Busca dados do clima da cidade principal (OPEN_WEATHER_CITY ou a
+       primeira de OPEN_WEATHER_CITIES): a tabela de clima não guarda a
+       cidade, então só ela é buscada
     2. Salva no banco de dados
     3. Envia via serial ao ESP32
     """
     logger.info("Iniciando integração climática...")
 
     try:
-        data = fetch_weather_data()
+        primary = CITY or (CITIES[0] if CITIES else None)
+        data = fetch_weather_data(primary)
 
         if not data:
-            logger.warning("[ERRO] Dados climáticos não foram obtidos da API.")
+            logger.warning(f"[ERRO] Dados climáticos não foram obtidos da API ({primary}).")
             return
 
-        logger.info("[OK] Dados climáticos obtidos com sucesso")
+        logger.info(f"[OK] Dados climáticos obtidos com sucesso ({primary})")
 
         # 1. Salva no banco de dados
         try:
-            record = create_climate_data(data)
+            record = ClimateService(get_session()).create_climate_data(data)
             logger.info(f"[OK] Registro salvo no banco: ID {record['id']}")
         except Exception as db_error:
             logger.exception(f"[ERRO] Falha ao salvar dados no banco: {db_error}")
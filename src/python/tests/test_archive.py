@@ -0,0 +1,134 @@
+import io
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from database import archive
+from database.archive import archive_older_than, count_archive, read_archive
+from database.models import ClimateData, SensorRecord
+from services.sensor_service import SensorRecordService
+
+
+@pytest.fixture
+def readings(component_repo, sensor_record_repo):
+    """Fixture com dois sensores e leituras de três meses."""
+    sensors = [component_repo.create(name=f"Sensor Arquivo {i}", type="Sensor") for i in range(2)]
+    base_time = datetime(2024, 1, 15)
+    sensor_record_repo.bulk_create(
+        {
+            "sensor_id": sensor.id,
+            "timestamp": base_time + timedelta(days=i),
+            "soil_moisture": float(i),
+            "phosphorus_present": True,
+            "potassium_present": False,
+            "soil_ph": 6.0
+        } for sensor in sensors for i in range(90)
+    )
+    yield sensors
+    for sensor in sensors:
+        component_repo.delete(sensor.id)
+
+
+def test_archive_moves_old_rows_to_partitioned_parquet(session, sensor_record_repo, readings, tmp_path):
+    """Testa o arquivamento particionado e a leitura unificada banco + Parquet."""
+    cutoff = datetime(2024, 3, 1)
+    archived = archive_older_than(session, SensorRecord, cutoff, str(tmp_path), chunk_size=50)
+
+    assert archived == 2 * 46
+    assert all(record.timestamp >= cutoff for record in sensor_record_repo.get_by_sensor(readings[0].id))
+    assert sorted(p.name for p in (tmp_path / "sensor_records" / f"sensor_id={readings[0].id}").iterdir()) == \
+        ["month=2024-01", "month=2024-02"]
+
+    frame = sensor_record_repo.read_frame(["timestamp", "soil_moisture"], sensor_id=readings[0].id,
+                                          archive_dir=str(tmp_path))
+    assert list(frame.columns) == ["timestamp", "soil_moisture"]
+    assert frame["soil_moisture"].tolist() == [float(i) for i in range(90)]
+    assert frame["timestamp"].is_monotonic_increasing
+
+    february = read_archive(SensorRecord, ["sensor_id", "soil_moisture"], datetime(2024, 2, 1),
+                            datetime(2024, 2, 10), readings[1].id, str(tmp_path))
+    assert len(february) == 10
+    assert set(february["sensor_id"]) == {readings[1].id}
+
+
+def test_read_archive_without_files_is_empty(tmp_path):
+    frame = read_archive(ClimateData, ["timestamp", "temperature"], archive_dir=str(tmp_path))
+    assert frame.empty
+    assert list(frame.columns) == ["timestamp", "temperature"]
+
+
+def test_tiered_count_and_series_span_both_tiers(session, sensor_record_repo, readings, tmp_path):
+    """Testa contagem e série por bucket unindo banco e Parquet, com filtro por lista de sensores."""
+    archive_older_than(session, SensorRecord, datetime(2024, 3, 1), str(tmp_path))
+    sensor_ids = [sensor.id for sensor in readings]
+    start, end = datetime(2024, 2, 20), datetime(2024, 3, 10)
+
+    # 20/02 a 10/03: 10 dias no arquivo e 10 no banco, por sensor
+    assert sensor_record_repo.count_rows(start, end, sensor_ids, str(tmp_path)) == 2 * 20
+    assert sensor_record_repo.count_rows(start, end, sensor_ids[0], str(tmp_path)) == 20
+    assert sensor_record_repo.count_rows(start, end, [], str(tmp_path)) == 0
+
+    series = sensor_record_repo.read_series('1d', sensor_ids[0], start, end, str(tmp_path))
+    assert len(series) == 20
+    assert [point['soil_moisture_avg'] for point in series] == [float(i) for i in range(36, 56)]
+    assert [point['bucket'] for point in series][:2] == [datetime(2024, 2, 20), datetime(2024, 2, 21)]
+
+
+def test_chunk_left_in_both_tiers_is_read_and_counted_once(session, sensor_record_repo, readings, tmp_path,
+                                                           monkeypatch):
+    """Falha entre a gravação do Parquet e a remoção: o bloco nas duas camadas conta uma vez só."""
+    def failing_delete(table):
+        raise RuntimeError("queda simulada antes da remoção")
+
+    monkeypatch.setattr(archive, "delete", failing_delete)
+    with pytest.raises(RuntimeError):
+        archive_older_than(session, SensorRecord, datetime(2024, 3, 1), str(tmp_path), chunk_size=50)
+    session.rollback()
+    monkeypatch.undo()
+    assert count_archive(SensorRecord, archive_dir=str(tmp_path)) == 50
+
+    sensor_ids = [sensor.id for sensor in readings]
+    for columns in (["timestamp", "soil_moisture"], ["id", "timestamp"]):
+        frame = sensor_record_repo.read_frame(columns, sensor_id=sensor_ids[0], archive_dir=str(tmp_path))
+        assert len(frame) == 90
+    assert sensor_record_repo.count_rows(sensor_id=sensor_ids, archive_dir=str(tmp_path)) == 2 * 90
+    series = sensor_record_repo.read_series('1d', sensor_ids[0], archive_dir=str(tmp_path))
+    assert [point['soil_moisture_avg'] for point in series] == [float(i) for i in range(90)]
+    assert all(point['count'] == 1 for point in series)
+    exported = io.BytesIO()
+    assert SensorRecordService(session).export_sensor_records(exported, columns=["id"], sensor_id=sensor_ids,
+                                                              archive_dir=str(tmp_path)) == 2 * 90
+    assert pd.read_csv(io.BytesIO(exported.getvalue()))["id"].is_unique
+
+    # A nova execução regrava o mesmo bloco no mesmo arquivo, sem duplicar linhas no Parquet
+    assert archive_older_than(session, SensorRecord, datetime(2024, 3, 1), str(tmp_path), chunk_size=50) == 2 * 46
+    assert count_archive(SensorRecord, archive_dir=str(tmp_path)) == 2 * 46
+    assert len(read_archive(SensorRecord, ["id"], archive_dir=str(tmp_path))) == 2 * 46
+    assert sensor_record_repo.count_rows(sensor_id=sensor_ids, archive_dir=str(tmp_path)) == 2 * 90
+
+
+def test_export_spans_archive_and_database(session, readings, tmp_path):
+    """Testa a exportação de um intervalo que cruza o horizonte de arquivamento."""
+    archive_older_than(session, SensorRecord, datetime(2024, 3, 1), str(tmp_path), chunk_size=50)
+    service = SensorRecordService(session)
+
+    buffer = io.BytesIO()
+    rows = service.export_sensor_records(buffer, columns=["timestamp", "soil_moisture"], sensor_id=readings[0].id,
+                                         start_date=datetime(2024, 2, 20), end_date=datetime(2024, 3, 10),
+                                         chunk_size=4, archive_dir=str(tmp_path))
+    frame = pd.read_csv(io.BytesIO(buffer.getvalue()), parse_dates=["timestamp"])
+    assert rows == len(frame) == 20
+    assert frame["soil_moisture"].tolist() == [float(i) for i in range(36, 56)]
+    assert frame["timestamp"].is_monotonic_increasing
+
+    pq = pytest.importorskip("pyarrow.parquet")
+    buffer = io.BytesIO()
+    assert service.export_sensor_records(buffer, "parquet", columns=["id", "sensor_id", "timestamp"],
+                                         sensor_id=[sensor.id for sensor in readings],
+                                         archive_dir=str(tmp_path)) == 2 * 90
+    buffer.seek(0)
+    table = pq.read_table(buffer)
+    assert len(set(table.column("id").to_pylist())) == 2 * 90
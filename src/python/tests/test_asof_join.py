@@ -0,0 +1,49 @@
+import pandas as pd
+import pytest
+
+from services.asof_join import asof_join
+
+
+@pytest.fixture
+def sensor_df():
+    """Fixture com leituras de dois sensores, várias na mesma hora."""
+    return pd.DataFrame({
+        'id': ['s1', 's2', 's3', 's4', 's5'],
+        'sensor_id': ['A', 'A', 'B', 'B', 'A'],
+        'timestamp': pd.to_datetime([
+            '2024-03-01 08:05', '2024-03-01 08:40', '2024-03-01 08:50',
+            '2024-03-01 10:30', '2024-03-01 07:00'
+        ]),
+        'soil_moisture': [35.0, 36.0, 50.0, 55.0, 30.0]
+    })
+
+
+@pytest.fixture
+def climate_df():
+    """Fixture com registros climáticos horários."""
+    return pd.DataFrame({
+        'id': ['c1', 'c2'],
+        'timestamp': pd.to_datetime(['2024-03-01 08:00', '2024-03-01 09:10']),
+        'temperature': [20.0, 25.0]
+    })
+
+
+def test_asof_join_backward_keeps_one_row_per_reading(sensor_df, climate_df):
+    merged = asof_join(sensor_df, climate_df, tolerance='1h', direction='backward')
+
+    # s5 (antes de todo clima) e s4 (clima a mais de 1h) ficam de fora
+    assert sorted(merged['id_sensor']) == ['s1', 's2', 's3']
+    assert set(merged['id_climate']) == {'c1'}
+    assert merged['timestamp_sensor'].is_monotonic_increasing
+
+
+def test_asof_join_nearest_direction(sensor_df, climate_df):
+    merged = asof_join(sensor_df, climate_df, tolerance='90min', direction='nearest')
+    matches = dict(zip(merged['id_sensor'], merged['id_climate']))
+
+    assert matches == {'s5': 'c1', 's1': 'c1', 's2': 'c2', 's3': 'c2', 's4': 'c2'}
+
+
+def test_asof_join_rejects_invalid_direction(sensor_df, climate_df):
+    with pytest.raises(ValueError):
+        asof_join(sensor_df, climate_df, direction='sideways')
@@ -0,0 +1,44 @@
+import pytest
+from sqlalchemy import inspect
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from database.backends import create_backend_engine, engine_options, normalize_url
+from database.models import Base, Component, SensorRecord
+from database.oracle import ENGINE_CONFIG
+
+
+def test_normalize_url_defaults_drivers():
+    assert normalize_url("oracle://u:p@host:1521/ORCL").drivername == "oracle+oracledb"
+    assert normalize_url("postgres://u:p@host/farm").drivername == "postgresql+psycopg2"
+    with pytest.raises(ValueError):
+        normalize_url("mysql://u:p@host/farm")
+
+
+def test_embedded_backends_skip_server_pool_options():
+    options = engine_options(normalize_url("sqlite://"), ENGINE_CONFIG)
+    assert options["poolclass"] is StaticPool
+    assert "pool_size" not in options
+    assert engine_options(normalize_url("sqlite:///farm.db"), ENGINE_CONFIG).get("poolclass") is None
+    assert engine_options(normalize_url("oracle://u:p@host/ORCL"), ENGINE_CONFIG)["pool_size"] == ENGINE_CONFIG["pool_size"]
+
+
+def test_sqlite_schema_matches_models_and_cascades(tmp_path):
+    """Testa o esquema completo (tabelas e índices) e o ON DELETE CASCADE no SQLite."""
+    engine = create_backend_engine(f"sqlite:///{tmp_path / 'farm.db'}", ENGINE_CONFIG)
+    Base.metadata.create_all(engine)
+
+    inspector = inspect(engine)
+    assert set(inspector.get_table_names()) == set(Base.metadata.tables)
+    assert {index["name"] for index in inspector.get_indexes("sensor_records")} == \
+        {index.name for index in SensorRecord.__table__.indexes}
+
+    session = sessionmaker(bind=engine)()
+    session.add(Component(id="sensor-1", name="Sensor", type="Sensor"))
+    session.add(SensorRecord(sensor_id="sensor-1", soil_moisture=40.0, phosphorus_present=True,
+                             potassium_present=True, soil_ph=6.5))
+    session.commit()
+    session.execute(Component.__table__.delete())
+    session.commit()
+    assert session.query(SensorRecord).count() == 0
+    engine.dispose()
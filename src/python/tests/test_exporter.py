@@ -0,0 +1,74 @@
+import gzip
+import io
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from services.sensor_service import SensorRecordService
+
+
+@pytest.fixture
+def export_sensor(component_repo, sensor_record_repo):
+    """Fixture com um sensor e 25 leituras em ordem cronológica."""
+    sensor = component_repo.create(name="Sensor Exportação", type="Sensor")
+    base_time = datetime(2024, 5, 1)
+    sensor_record_repo.bulk_create(
+        {
+            "sensor_id": sensor.id,
+            "timestamp": base_time + timedelta(minutes=i),
+            "soil_moisture": float(i),
+            "phosphorus_present": i % 2 == 0,
+            "potassium_present": True,
+            "soil_ph": 6.5
+        } for i in range(25)
+    )
+    yield sensor.id
+    component_repo.delete(sensor.id)
+
+
+def test_export_csv_in_chunks_with_gzip(session, export_sensor):
+    """Testa a exportação CSV comprimida em blocos: um único cabeçalho e todas as linhas."""
+    service = SensorRecordService(session)
+    buffer = io.BytesIO()
+    rows = service.export_sensor_records(buffer, "csv", "gzip", columns=["timestamp", "soil_moisture"],
+                                         sensor_id=export_sensor, chunk_size=10)
+
+    assert rows == 25
+    assert not buffer.closed
+    text = gzip.decompress(buffer.getvalue()).decode("utf-8")
+    assert text.count("timestamp,soil_moisture") == 1
+    frame = pd.read_csv(io.StringIO(text))
+    assert frame["soil_moisture"].tolist() == [float(i) for i in range(25)]
+
+
+@pytest.mark.parametrize("fmt, compression", [("parquet", "zstd"), ("arrow", "lz4")])
+def test_export_columnar_formats_keep_model_types(session, export_sensor, fmt, compression):
+    """Testa Parquet e Arrow IPC: tipos vindos do modelo e linhas em ordem."""
+    pa = pytest.importorskip("pyarrow")
+    service = SensorRecordService(session)
+    buffer = io.BytesIO()
+    rows = service.export_sensor_records(buffer, fmt, compression, sensor_id=export_sensor, chunk_size=7)
+
+    assert rows == 25
+    buffer.seek(0)
+    if fmt == "parquet":
+        table = pytest.importorskip("pyarrow.parquet").read_table(buffer)
+    else:
+        table = pa.ipc.open_file(buffer).read_all()
+    assert table.schema.field("phosphorus_present").type == pa.bool_()
+    assert table.schema.field("timestamp").type == pa.timestamp("us")
+    assert table.column("soil_moisture").to_pylist() == [float(i) for i in range(25)]
+
+
+def test_export_empty_selection_and_invalid_options(session):
+    """Testa a exportação sem linhas (só cabeçalho) e a validação de formato/compressão."""
+    service = SensorRecordService(session)
+    buffer = io.BytesIO()
+    assert service.export_sensor_records(buffer, columns=["sensor_id", "soil_ph"], sensor_id="inexistente") == 0
+    assert buffer.getvalue().decode("utf-8").strip() == "sensor_id,soil_ph"
+
+    with pytest.raises(ValueError):
+        service.export_sensor_records(io.BytesIO(), "xlsx")
+    with pytest.raises(ValueError):
+        service.export_sensor_records(io.BytesIO(), "arrow", "gzip")
@@ -0,0 +1,221 @@
+import json
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from database import ClimateDataRepository, IrrigationDecisionRepository
+from services.ingestion import HTTPReceiver, MicroBatcher, UDPReceiver, database_sink, parse_payload, scoring_sink
+from services.ml_service import MLService
+
+
+def reading(i=0, sensor_id="sensor-1"):
+    return {
+        "sensor_id": sensor_id,
+        "soil_moisture": 40.0 + i,
+        "soil_ph": 6.5,
+        "phosphorus_present": True,
+        "potassium_present": False
+    }
+
+
+class CollectingSink:
+    """Destino em memória que registra os lotes recebidos."""
+
+    def __init__(self, delay=0.0):
+        self.batches = []
+        self.delay = delay
+        self.event = threading.Event()
+
+    def __call__(self, batch):
+        time.sleep(self.delay)
+        self.batches.append(batch)
+        self.event.set()
+        return len(batch)
+
+
+def wait_for(condition, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_parse_payload_accepts_json_and_esp32_lines():
+    assert parse_payload(json.dumps(reading()))[0]["soil_moisture"] == 40.0
+    lines = parse_payload("abc;Umidade: 45.00% | Fosforo: Presente | Potassio: Ausente | pH: 6.5\n"
+                          "def;Umidade: 12.00% | Fosforo: Ausente | Potassio: Ausente | pH: 5.0")
+    assert [r["sensor_id"] for r in lines] == ["abc", "def"]
+    with pytest.raises(ValueError):
+        parse_payload("linha qualquer")
+    with pytest.raises(ValueError):
+        parse_payload("[1, 2]")
+
+
+def test_batches_by_size_and_by_time():
+    sink = CollectingSink()
+    batcher = MicroBatcher(sink, batch_size=10, max_latency=0.2).start()
+    try:
+        assert batcher.submit_many(reading(i) for i in range(25)) == 25
+        assert wait_for(lambda: batcher.metrics()["written"] == 25)
+    finally:
+        batcher.stop()
+
+    assert [len(batch) for batch in sink.batches] == [10, 10, 5]
+    assert batcher.metrics()["batches"] == 3
+
+
+def test_backpressure_rejects_when_queue_is_full():
+    sink = CollectingSink(delay=0.3)
+    batcher = MicroBatcher(sink, batch_size=2, max_latency=0.01, queue_size=3).start()
+    try:
+        accepted = batcher.submit_many(reading(i) for i in range(20))
+        metrics = batcher.metrics()
+        assert accepted < 20
+        assert metrics["rejected"] == 20 - accepted
+        assert metrics["queue_high_water"] == 3
+        assert not batcher.submit({"sensor_id": "sem campos"})
+    finally:
+        batcher.stop()
+
+    assert batcher.metrics()["written"] == accepted
+    assert batcher.metrics()["invalid"] == 1
+
+
+def test_udp_and_http_sources():
+    sink = CollectingSink()
+    batcher = MicroBatcher(sink, batch_size=100, max_latency=0.05).start()
+    udp = UDPReceiver(batcher, host="127.0.0.1", port=0).start()
+    http = HTTPReceiver(batcher, host="127.0.0.1", port=0).start()
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as client:
+            client.sendto(json.dumps([reading(1), reading(2)]).encode(), udp.address)
+
+        url = f"http://127.0.0.1:{http.address[1]}"
+        request = urllib.request.Request(f"{url}/readings", data=json.dumps(reading(3)).encode(), method="POST")
+        with urllib.request.urlopen(request) as response:
+            assert response.status == 202
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(urllib.request.Request(f"{url}/readings", data=b"lixo", method="POST"))
+        assert error.value.code == 400
+
+        assert wait_for(lambda: batcher.metrics()["written"] == 3)
+        with urllib.request.urlopen(f"{url}/metrics") as response:
+            assert json.load(response)["received"] == 3
+    finally:
+        udp.stop()
+        http.stop()
+        batcher.stop()
+
+
+def test_database_sink_writes_batch(component_repo, sensor_record_repo):
+    """Testa a gravação de um micro-lote no banco pelo serviço de registros."""
+    component = component_repo.create(name="Sensor Ingestão", type="Sensor")
+    base_time = datetime(2024, 4, 1, 6, 0)
+    batch = [{**reading(i, component.id), "timestamp": base_time + timedelta(seconds=i)} for i in range(30)]
+
+    batcher = MicroBatcher(database_sink, batch_size=50, max_latency=0.05).start()
+    batcher.submit_many(batch)
+    batcher.stop()
+
+    assert batcher.metrics()["written"] == 30
+    assert len(sensor_record_repo.get_by_sensor(component.id)) == 30
+
+    component_repo.delete(component.id)
+
+
+def test_invalid_readings_do_not_discard_valid_ones(component_repo, sensor_record_repo):
+    """Tipos inválidos são recusados no submit e um sensor inexistente só descarta a própria leitura."""
+    component = component_repo.create(name="Sensor Lote Misto", type="Sensor")
+    base_time = datetime(2024, 4, 2, 6, 0)
+    batch = [{**reading(i, component.id), "timestamp": base_time + timedelta(seconds=i)} for i in range(5)]
+
+    batcher = MicroBatcher(database_sink, batch_size=50, max_latency=0.05).start()
+    assert not batcher.submit({**reading(), "sensor_id": component.id, "soil_moisture": "abc"})
+    assert not batcher.submit({**reading(), "sensor_id": component.id, "phosphorus_present": "sim"})
+    batcher.submit_many(batch[:3] + [{**reading(), "sensor_id": "sensor-inexistente"}] + batch[3:])
+    batcher.stop()
+
+    metrics = batcher.metrics()
+    assert (metrics["invalid"], metrics["written"], metrics["failed"]) == (2, 5, 1)
+    assert len(sensor_record_repo.get_by_sensor(component.id)) == 5
+
+    component_repo.delete(component.id)
+
+
+def train_compiled(model_dir):
+    """Treina um modelo pequeno com dados sintéticos e exporta a versão compilada."""
+    rng = np.random.default_rng(3)
+    size = 200
+    timestamps = pd.date_range("2024-01-01", periods=size, freq="h")
+    sensors = pd.DataFrame({
+        'soil_moisture': rng.uniform(10, 90, size), 'soil_ph': rng.uniform(5, 7.5, size),
+        'phosphorus_present': rng.random(size) > 0.3, 'potassium_present': rng.random(size) > 0.2,
+        'timestamp': timestamps})
+    weather = pd.DataFrame({
+        'temperature': rng.uniform(15, 35, size), 'air_humidity': rng.uniform(30, 90, size),
+        'rain_forecast': rng.random(size) < 0.2, 'timestamp': timestamps})
+    ml_service = MLService(None, model_dir=str(model_dir))
+    assert ml_service.train_model(sensors.to_dict('records'), weather.to_dict('records'))["success"]
+    return ml_service
+
+
+def test_scoring_sink_records_compiled_model_decisions(session, component_repo, tmp_path):
+    """Com --model, o lote é gravado e cada leitura recebe a decisão do modelo compilado."""
+    ml_service = train_compiled(tmp_path)
+
+    climate_repo = ClimateDataRepository(session)
+    climate = climate_repo.create(temperature=24.0, air_humidity=60.0, rain_forecast=False)
+    component = component_repo.create(name="Sensor Pontuado", type="Sensor")
+    base_time = datetime(2024, 4, 1, 6, 0)
+    batch = [{**reading(i * 10, component.id), "timestamp": base_time + timedelta(hours=i)} for i in range(5)]
+
+    collected = CollectingSink()
+    assert scoring_sink(ml_service.compiled_path, collected)(batch) == 5
+
+    decisions = pd.DataFrame(IrrigationDecisionRepository(session).get_latest_frame(sensor_id=component.id))
+    assert len(decisions) == 1 and decisions['source'].iloc[0] == 'compiled'
+    rows = pd.DataFrame(collected.batches[0])
+    run = pd.DataFrame(IrrigationDecisionRepository(session).get_rows_by_run(decisions['run_id'].iloc[0]))
+    run = run.set_index('record_id').loc[rows['id']]
+    expected = ml_service.predict_batch(rows.assign(temperature=24.0, air_humidity=60.0, rain_forecast=False))
+    assert run['should_irrigate'].tolist() == expected['should_irrigate'].tolist()
+    np.testing.assert_allclose(run['irrigation_probability'], expected['irrigation_probability'])
+
+    component_repo.delete(component.id)
+    climate_repo.delete(climate.id)
+
+
+@pytest.mark.parametrize("target, method", [
+    ("services.ingestion.ClimateDataRepository", "get_latest"),
+    ("services.compiled_forest.CompiledForest", "predict_batch"),
+])
+def test_scoring_failure_keeps_batch_written_once(session, component_repo, tmp_path, monkeypatch, target, method):
+    """Uma falha na pontuação depois da gravação não faz o MicroBatcher dividir e regravar o lote."""
+    ml_service = train_compiled(tmp_path)
+    climate_repo = ClimateDataRepository(session)
+    climate = climate_repo.create(temperature=24.0, air_humidity=60.0, rain_forecast=False)
+    component = component_repo.create(name="Sensor Falha Pontuação", type="Sensor")
+
+    def failing(*args, **kwargs):
+        raise RuntimeError("falha simulada na pontuação")
+
+    monkeypatch.setattr(f"{target}.{method}", failing)
+    collected = CollectingSink()
+    batcher = MicroBatcher(scoring_sink(ml_service.compiled_path, collected), batch_size=10, max_latency=0.05).start()
+    batcher.submit_many(reading(i, component.id) for i in range(4))
+    batcher.stop()
+
+    assert [len(batch) for batch in collected.batches] == [4]
+    metrics = batcher.metrics()
+    assert (metrics["written"], metrics["failed"]) == (4, 0)
+    assert len(pd.DataFrame(IrrigationDecisionRepository(session).get_latest_frame(sensor_id=component.id))) == 0
+
+    component_repo.delete(component.id)
+    climate_repo.delete(climate.id)
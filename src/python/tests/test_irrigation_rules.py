@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.irrigation_rules import IrrigationRules, irrigation_rules
+
+
+def esp32_irrigation(soil_moisture, soil_ph, phosphorus_present, potassium_present, rain_forecast):
+    """Cascata do main.cpp escrita como no firmware, leitura a leitura."""
+    irrigate = False
+    if not rain_forecast:
+        if soil_moisture < 40 and phosphorus_present:
+            irrigate = True
+        if potassium_present and soil_moisture > 60:
+            irrigate = False
+        if soil_moisture < 40 and (soil_ph < 5.5 or soil_ph > 7.0):
+            irrigate = False
+        if soil_moisture > 70:
+            irrigate = False
+        if (not phosphorus_present or not potassium_present) and 30 <= soil_moisture <= 50:
+            irrigate = True
+    return irrigate
+
+
+@pytest.fixture
+def readings():
+    """5000 leituras aleatórias cobrindo todas as faixas das regras (inclusive os limites)."""
+    rng = np.random.default_rng(7)
+    size = 5000
+    moisture = rng.uniform(10, 90, size)
+    moisture[:8] = [30, 40, 50, 60, 70, 29.9, 50.1, 70.1]
+    return pd.DataFrame({
+        'soil_moisture': moisture,
+        'soil_ph': rng.uniform(5.0, 7.5, size),
+        'phosphorus_present': rng.random(size) > 0.3,
+        'potassium_present': rng.random(size) > 0.2,
+        'rain_forecast': rng.random(size) < 0.2,
+    })
+
+
+def test_scalar_and_vectorized_evaluators_match_firmware(readings):
+    """Os dois avaliadores compilados decidem igual à cascata do ESP32."""
+    expected = [esp32_irrigation(*row) for row in readings.itertuples(index=False)]
+    scalar = [irrigation_rules.evaluate(row) for row in readings.to_dict('records')]
+
+    assert scalar == expected
+    assert irrigation_rules.evaluate_many(readings).tolist() == expected
+    assert set(irrigation_rules.statuses(readings)) == {"ATIVADA", "DESLIGADA"}
+
+
+def test_rules_without_their_fields_are_skipped():
+    """Sem previsão de chuva na leitura, a regra de chuva não se aplica (escalar e vetorizado)."""
+    reading = {'soil_moisture': 35.0, 'soil_ph': 6.5, 'phosphorus_present': True, 'potassium_present': True}
+
+    assert irrigation_rules.status(reading) == "ATIVADA"
+    assert irrigation_rules.status({**reading, 'rain_forecast': None}) == "ATIVADA"
+    assert irrigation_rules.status({**reading, 'rain_forecast': True}) == "DESLIGADA"
+    columns = {field: np.array([value]) for field, value in reading.items()}
+    assert irrigation_rules.evaluate_many(columns).tolist() == [True]
+    with pytest.raises(ValueError):
+        irrigation_rules.evaluate_many({'temperature': np.array([20.0])})
+
+
+def test_missing_values_skip_their_rules_in_both_evaluators(readings):
+    """None/NaN (ex.: leitura sem clima após o as-of join) desativa a regra nos dois avaliadores."""
+    rng = np.random.default_rng(11)
+    frame = readings.astype(object)
+    for field in frame.columns:
+        frame.loc[rng.random(len(frame)) < 0.15, field] = rng.choice([None, np.nan])
+    frame['soil_moisture'] = frame['soil_moisture'].astype(float)
+
+    scalar = [irrigation_rules.evaluate(row) for row in frame.to_dict('records')]
+    assert irrigation_rules.evaluate_many(frame).tolist() == scalar
+
+    # Sem previsão de chuva as demais regras decidem, como se o campo não existisse
+    no_rain = frame['rain_forecast'].isna()
+    without_rain = irrigation_rules.evaluate_many(frame.drop(columns='rain_forecast'))
+    assert (irrigation_rules.evaluate_many(frame)[no_rain] == without_rain[no_rain]).all()
+
+
+def test_custom_rules_compile_with_or_clauses():
+    """Regras próprias: cláusulas em lista são combinadas com OU e a última regra que casa vence."""
+    rules = IrrigationRules([
+        ("seco", [('soil_moisture', '<', 30)], True),
+        ("pH extremo", [[('soil_ph', '<', 5.0), ('soil_ph', '>', 8.0)]], True),
+        ("encharcado", [('soil_moisture', '>=', 80)], False),
+    ])
+    columns = {'soil_moisture': np.array([20.0, 50.0, 50.0, 85.0]), 'soil_ph': np.array([6.0, 4.5, 6.0, 9.0])}
+
+    assert rules.evaluate_many(columns).tolist() == [True, True, False, False]
+    assert [rules.evaluate({'soil_moisture': m, 'soil_ph': p})
+            for m, p in zip(columns['soil_moisture'], columns['soil_ph'])] == [True, True, False, False]
@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from database import ClimateDataRepository
+from services.irrigation_rules import irrigation_rules
+from services.irrigation_service import IrrigationDecisionService
+from services.ml_service import MLService
+
+
+@pytest.fixture
+def fleet(component_repo, sensor_record_repo):
+    """Fixture com três sensores e quatro leituras cada; a última tem umidade i * 30."""
+    sensors = [component_repo.create(name=f"Sensor Frota {i}", type="Sensor") for i in range(3)]
+    base_time = datetime(2024, 6, 1, 8)
+    sensor_record_repo.bulk_create(
+        {
+            "id": f"frota-{i}-{step}",
+            "sensor_id": sensor.id,
+            "timestamp": base_time + timedelta(hours=step),
+            "soil_moisture": 35.0 if step < 3 else 10.0 + i * 30,
+            "phosphorus_present": True,
+            "potassium_present": True,
+            "soil_ph": 6.5
+        } for i, sensor in enumerate(sensors) for step in range(4)
+    )
+    yield [sensor.id for sensor in sensors]
+    for sensor in sensors:
+        component_repo.delete(sensor.id)
+
+
+@pytest.fixture
+def climate(session):
+    repo = ClimateDataRepository(session)
+    record = repo.create(temperature=24.0, air_humidity=60.0, rain_forecast=False)
+    yield record
+    repo.delete(record.id)
+
+
+def test_score_fleet_uses_latest_reading_per_sensor_and_rules_without_model(session, fleet, climate, tmp_path):
+    """Sem modelo, cada sensor recebe a decisão das regras sobre sua última leitura, em uma única rodada."""
+    service = IrrigationDecisionService(session, MLService(None, model_dir=str(tmp_path)))
+    # As leituras são de 2024: fora da idade máxima padrão, nenhum sensor é avaliado
+    assert service.score_fleet(sensor_id=fleet)['sensors'] == 0
+
+    stats = service.score_fleet(sensor_id=fleet, max_age_hours=None)
+    decisions = pd.DataFrame(service.list_run_decisions(stats['run_id'])).set_index('sensor_id').loc[fleet]
+
+    assert stats['sensors'] == 3 and stats['source'] == 'rules'
+    assert decisions['record_id'].tolist() == [f"frota-{i}-3" for i in range(3)]
+    assert (decisions['climate_id'] == climate.id).all()
+    expected = irrigation_rules.evaluate_many({
+        'soil_moisture': np.array([10.0, 40.0, 70.0]), 'soil_ph': np.full(3, 6.5),
+        'phosphorus_present': np.ones(3, bool), 'potassium_present': np.ones(3, bool),
+        'rain_forecast': np.zeros(3, bool)})
+    assert decisions['should_irrigate'].tolist() == expected.tolist()
+
+    # Nova rodada: a consulta de janela devolve só a decisão mais recente de cada sensor
+    second = service.score_fleet(sensor_id=fleet, max_age_hours=None)
+    latest = service.get_latest_decisions(sensor_id=fleet)
+    assert len(latest) == 3 and set(latest['run_id']) == {second['run_id']}
+
+
+def test_score_fleet_predicts_in_one_batch_with_trained_model(session, fleet, climate, tmp_path):
+    """Com modelo treinado, as decisões vêm do predict_batch com o clima mais recente."""
+    rng = np.random.default_rng(1)
+    size = 300
+    timestamps = pd.date_range("2024-01-01", periods=size, freq="h")
+    sensors = pd.DataFrame({
+        'soil_moisture': rng.uniform(10, 90, size), 'soil_ph': rng.uniform(5, 7.5, size),
+        'phosphorus_present': rng.random(size) > 0.3, 'potassium_present': rng.random(size) > 0.2,
+        'timestamp': timestamps})
+    weather = pd.DataFrame({
+        'temperature': rng.uniform(15, 35, size), 'air_humidity': rng.uniform(30, 90, size),
+        'rain_forecast': rng.random(size) < 0.2, 'timestamp': timestamps})
+    ml_service = MLService(None, model_dir=str(tmp_path))
+    assert ml_service.train_model(sensors.to_dict('records'), weather.to_dict('records'))["success"]
+
+    service = IrrigationDecisionService(session, ml_service)
+    stats = service.score_fleet(sensor_id=fleet, max_age_hours=None)
+    decisions = pd.DataFrame(service.list_run_decisions(stats['run_id'])).set_index('sensor_id').loc[fleet]
+
+    assert stats['source'] == 'ml' and stats['sensors'] == 3
+    readings = decisions.rename(columns={'reading_timestamp': 'timestamp'}).assign(
+        soil_moisture=[10.0, 40.0, 70.0], soil_ph=6.5, phosphorus_present=True, potassium_present=True,
+        temperature=24.0, air_humidity=60.0, rain_forecast=False)
+    expected = ml_service.predict_batch(readings)
+    assert decisions['should_irrigate'].tolist() == expected['should_irrigate'].tolist()
+    np.testing.assert_allclose(decisions['irrigation_probability'], expected['irrigation_probability'])
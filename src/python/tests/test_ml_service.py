@@ -0,0 +1,291 @@
+from datetime import datetime, timedelta
+
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.compiled_forest import CompiledForest
+from services.ml_service import MLService, build_feature_matrix, build_irrigation_labels
+
+
+def _legacy_row_loop(merged_df):
+    """Implementação original (linha a linha) usada como referência."""
+    features = []
+    targets = []
+    for _, row in merged_df.iterrows():
+        features.append([
+            row['soil_moisture'],
+            row['soil_ph'],
+            float(row['phosphorus_present']),
+            float(row['potassium_present']),
+            row['temperature'],
+            row['air_humidity'],
+            float(row['rain_forecast']),
+            row['timestamp_sensor'].hour,
+            row['timestamp_sensor'].month
+        ])
+
+        irrigate = False
+        if not row['rain_forecast']:
+            if row['soil_moisture'] < 40 and row['phosphorus_present']:
+                irrigate = True
+            if row['potassium_present'] and row['soil_moisture'] > 60:
+                irrigate = False
+            if row['soil_moisture'] < 40 and (row['soil_ph'] < 5.5 or row['soil_ph'] > 7.0):
+                irrigate = False
+            if row['soil_moisture'] > 70:
+                irrigate = False
+            if (not row['phosphorus_present'] or not row['potassium_present']) and \
+               (row['soil_moisture'] >= 30 and row['soil_moisture'] <= 50):
+                irrigate = True
+        targets.append(1 if irrigate else 0)
+    return np.array(features), np.array(targets)
+
+
+@pytest.fixture
+def merged_df():
+    """Fixture com leituras aleatórias incluindo os limiares exatos das regras."""
+    rng = np.random.default_rng(42)
+    size = 2000
+    moisture = rng.uniform(0, 100, size).round(1)
+    moisture[:10] = [30, 40, 50, 60, 70, 29.9, 39.9, 50.1, 60.1, 70.1]
+    ph = rng.uniform(4.0, 9.0, size).round(1)
+    ph[10:14] = [5.5, 7.0, 5.4, 7.1]
+    return pd.DataFrame({
+        'soil_moisture': moisture,
+        'soil_ph': ph,
+        'phosphorus_present': rng.random(size) > 0.3,
+        'potassium_present': rng.random(size) > 0.2,
+        'temperature': rng.uniform(10, 40, size),
+        'air_humidity': rng.uniform(20, 100, size),
+        'rain_forecast': rng.random(size) < 0.2,
+        'timestamp_sensor': pd.date_range('2024-01-01', periods=size, freq='37min')
+    })
+
+
+def test_feature_matrix_matches_row_loop(merged_df):
+    expected_X, _ = _legacy_row_loop(merged_df)
+    X = build_feature_matrix(merged_df, timestamp_column='timestamp_sensor')
+
+    assert X.dtype == np.float32
+    assert X.shape == (len(merged_df), 9)
+    np.testing.assert_allclose(X, expected_X.astype(np.float32))
+
+
+def test_irrigation_labels_match_row_loop(merged_df):
+    _, expected_y = _legacy_row_loop(merged_df)
+    y = build_irrigation_labels(merged_df)
+
+    np.testing.assert_array_equal(y, expected_y)
+    assert set(np.unique(y)) == {0, 1}
+
+
+@pytest.fixture
+def trained_service(merged_df, tmp_path):
+    """Fixture com um MLService treinado em um diretório temporário."""
+    sensors = merged_df[['soil_moisture', 'soil_ph', 'phosphorus_present', 'potassium_present']].assign(
+        timestamp=merged_df['timestamp_sensor'])
+    climate = merged_df[['temperature', 'air_humidity', 'rain_forecast']].assign(
+        timestamp=merged_df['timestamp_sensor'])
+    service = MLService(None, model_dir=str(tmp_path))
+    result = service.train_model(sensors.to_dict('records'), climate.to_dict('records'))
+    assert result["success"]
+    return service
+
+
+def test_predict_batch_matches_single_predictions(trained_service, merged_df):
+    samples = build_feature_matrix(merged_df)[:50]
+    batch = trained_service.predict_batch(samples)
+
+    assert batch["success"]
+    assert batch["should_irrigate"].shape == (50,)
+    for i, row in enumerate(samples[:10]):
+        single = trained_service.predict_irrigation(*row)
+        assert single["should_irrigate"] == batch["should_irrigate"][i]
+        assert single["irrigation_probability"] == pytest.approx(batch["irrigation_probability"][i])
+
+
+def test_compiled_forest_matches_predict_batch(trained_service, merged_df):
+    """O modelo exportado prediz o mesmo que o scikit-learn e carrega sem importá-lo."""
+    exported = trained_service.export_compiled()
+    assert exported["success"] and exported["trees"] == 100
+
+    samples = build_feature_matrix(merged_df)
+    expected = trained_service.predict_batch(samples)
+    compiled = CompiledForest.load(exported["path"]).predict_batch(samples)
+    np.testing.assert_array_equal(compiled["should_irrigate"], expected["should_irrigate"])
+    np.testing.assert_allclose(compiled["irrigation_probability"], expected["irrigation_probability"])
+    np.testing.assert_allclose(compiled["confidence"], expected["confidence"])
+
+    script = ("import sys; from services.compiled_forest import load_compiled; "
+              f"load_compiled({exported['path']!r}).predict_proba([0.0] * 9); "
+              "sys.exit('sklearn' in sys.modules)")
+    assert subprocess.run([sys.executable, "-c", script]).returncode == 0
+
+
+def test_model_registry_shares_loaded_model(trained_service, tmp_path):
+    first = MLService(None, model_dir=str(tmp_path))
+    second = MLService(None, model_dir=str(tmp_path))
+
+    assert first.model is second.model
+    assert first.model is trained_service.model
+
+
+
+def test_search_hyperparameters_saves_best_candidate(merged_df, tmp_path):
+    """Testa a busca de hiperparâmetros em pool de processos."""
+    sensors = merged_df[['soil_moisture', 'soil_ph', 'phosphorus_present', 'potassium_present']].assign(
+        timestamp=merged_df['timestamp_sensor'])
+    climate = merged_df[['temperature', 'air_humidity', 'rain_forecast']].assign(
+        timestamp=merged_df['timestamp_sensor'])
+    service = MLService(None, model_dir=str(tmp_path))
+    grid = {'n_estimators': [10, 20], 'max_depth': [2, None]}
+
+    result = service.search_hyperparameters(sensors.to_dict('records'), climate.to_dict('records'),
+                                            param_grid=grid, cv=3, max_workers=2)
+
+    assert result["success"]
+    assert len(result["candidates"]) == 4
+    assert all(candidate["seconds"] > 0 for candidate in result["candidates"])
+    assert result["best_accuracy"] == max(c["mean_accuracy"] for c in result["candidates"])
+    assert MLService(None, model_dir=str(tmp_path)).model.get_params()["n_estimators"] == \
+        result["best_params"]["n_estimators"]
+
+    with pytest.raises(ValueError):
+        service.search_hyperparameters([], [], mode="bayes")
+
+
+def test_train_incremental_consumes_only_new_readings(session, tmp_path):
+    """Testa a atualização incremental a partir da marca d'água do último treino."""
+    from database.models import ClimateData
+    from database.repositories import ComponentRepository, SensorRecordRepository
+
+    component = ComponentRepository(session).create(name="Sensor Incremental", type="Sensor")
+    rng = np.random.default_rng(7)
+    base_time = datetime(2024, 5, 1)
+
+    def readings(start, size, prefix):
+        return [{
+            "id": f"{prefix}-{i:03d}",
+            "sensor_id": component.id,
+            "timestamp": start + timedelta(minutes=30 * i),
+            "soil_moisture": float(rng.uniform(20, 80)),
+            "soil_ph": float(rng.uniform(5, 8)),
+            "phosphorus_present": bool(rng.random() > 0.3),
+            "potassium_present": bool(rng.random() > 0.3),
+            "irrigation_status": "DESLIGADA"
+        } for i in range(size)]
+
+    old = readings(base_time, 200, "incremental-a")
+    SensorRecordRepository(session).bulk_create(old)
+    climate = [ClimateData(temperature=25.0, air_humidity=60.0, rain_forecast=False,
+                           timestamp=base_time + timedelta(hours=h)) for h in range(220)]
+    session.add_all(climate)
+    session.commit()
+
+    service = MLService(session, model_dir=str(tmp_path))
+    assert service.train_model(old, [c.to_dict() for c in climate])["success"]
+    assert service.get_model_status()["watermark"] == old[-1]["timestamp"].isoformat()
+
+    # Uma leitura com o mesmo timestamp da marca d'água, gravada depois do treino, também é usada
+    late = {**readings(old[-1]["timestamp"], 1, "incremental-b")[0]}
+    new = readings(old[-1]["timestamp"] + timedelta(minutes=30), 99, "incremental-c")
+    SensorRecordRepository(session).bulk_create([late] + new)
+
+    # Outra sessão do processo compartilha o modelo pelo registro
+    shared = MLService(session, model_dir=str(tmp_path)).model
+    assert shared is service.model
+
+    result = service.train_incremental(trees_per_update=5, max_estimators=102)
+    assert result["success"]
+    assert result["new_samples"] == 100
+    assert result["n_estimators"] == 102
+    # A atualização não altera o modelo compartilhado; as próximas instâncias recebem o novo
+    assert len(shared.estimators_) == 100 and not shared.warm_start
+    assert MLService(session, model_dir=str(tmp_path)).model is service.model is not shared
+    assert service.get_model_status()["watermark"] == new[-1]["timestamp"].isoformat()
+
+    # Sem leituras novas não há atualização
+    assert not service.train_incremental()["success"]
+
+    ComponentRepository(session).delete(component.id)
+
+
+def _incremental_readings(component_id, start, size, prefix, rng, soil_moisture=None):
+    return [{
+        "id": f"{prefix}-{i:03d}",
+        "sensor_id": component_id,
+        "timestamp": start + timedelta(minutes=30 * i),
+        "soil_moisture": soil_moisture if soil_moisture is not None else float(rng.uniform(20, 80)),
+        "soil_ph": float(rng.uniform(5, 8)),
+        "phosphorus_present": bool(rng.random() > 0.3),
+        "potassium_present": bool(rng.random() > 0.3),
+        "irrigation_status": "DESLIGADA"
+    } for i in range(size)]
+
+
+@pytest.fixture
+def incremental_base(session, tmp_path):
+    """Fixture com um modelo treinado em 200 leituras (a cada 30 min) e clima horário até 110h."""
+    from database.models import ClimateData
+    from database.repositories import ComponentRepository, SensorRecordRepository
+
+    component = ComponentRepository(session).create(name="Sensor Marca d'Água", type="Sensor")
+    rng = np.random.default_rng(11)
+    base_time = datetime(2025, 2, 1)
+    old = _incremental_readings(component.id, base_time, 200, "watermark-a", rng)
+    SensorRecordRepository(session).bulk_create(old)
+    climate = [ClimateData(temperature=25.0, air_humidity=60.0, rain_forecast=False,
+                           timestamp=base_time + timedelta(hours=h)) for h in range(110)]
+    session.add_all(climate)
+    session.commit()
+
+    service = MLService(session, model_dir=str(tmp_path))
+    assert service.train_model(old, [c.to_dict() for c in climate])["success"]
+    yield service, component.id, old[-1]["timestamp"] + timedelta(minutes=30), rng
+
+    ComponentRepository(session).delete(component.id)
+    session.query(ClimateData).filter(ClimateData.timestamp >= base_time,
+                                      ClimateData.timestamp < base_time + timedelta(days=30)).delete()
+    session.commit()
+
+
+def test_incremental_watermark_stops_at_last_joined_reading(session, incremental_base):
+    """Leituras ainda sem clima não avançam a marca d'água e entram na atualização seguinte."""
+    from database.models import ClimateData
+    from database.repositories import SensorRecordRepository
+
+    service, sensor_id, start, rng = incremental_base
+    # 100h a 119h30: o clima (até 109h, tolerância de 1h) cobre só as leituras até 110h
+    new = _incremental_readings(sensor_id, start, 40, "watermark-b", rng)
+    SensorRecordRepository(session).bulk_create(new)
+
+    result = service.train_incremental(trees_per_update=5)
+    assert result["success"] and result["mode"] == "incremental"
+    assert result["new_samples"] == 21
+    assert service.get_model_status()["watermark"] == new[20]["timestamp"].isoformat()
+
+    session.add_all([ClimateData(temperature=25.0, air_humidity=60.0, rain_forecast=False,
+                                 timestamp=start + timedelta(hours=h)) for h in range(10, 30)])
+    session.commit()
+    result = service.train_incremental(trees_per_update=5)
+    assert result["success"] and result["new_samples"] == 19
+    assert service.get_model_status()["watermark"] == new[-1]["timestamp"].isoformat()
+
+
+def test_incremental_with_different_classes_refits_from_store(session, incremental_base):
+    """Dados novos com outro conjunto de classes retreinam o modelo do zero em vez de somar árvores."""
+    from database.repositories import SensorRecordRepository
+
+    service, sensor_id, start, rng = incremental_base
+    # Umidade acima de 70%: nenhuma leitura nova pede irrigação
+    new = _incremental_readings(sensor_id, start, 20, "watermark-c", rng, soil_moisture=80.0)
+    SensorRecordRepository(session).bulk_create(new)
+
+    result = service.train_incremental(trees_per_update=5)
+    assert result["success"] and result["mode"] == "full"
+    assert len(service.model.estimators_) == 100 and not service.model.warm_start
+    assert service.get_model_status()["watermark"] == new[-1]["timestamp"].isoformat()
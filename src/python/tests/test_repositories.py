@@ -16,6 +16,7 @@ from database.repositories import (
     SensorRecordRepository,
     ApplicationRepository
 )
+from database.repositories.time_buckets import choose_bucket, merge_series
 
 
 @pytest.fixture
@@ -195,3 +196,166 @@ def test_application_repository(application_repo, crop_repo, producer_repo, sess
     application_repo.delete(application.id)
     application_deleted = application_repo.get_by_id(application.id)
     assert application_deleted is None
+
+
+def test_sensor_record_bulk_create(sensor_record_repo, component_repo, session):
+    """Testa a inserção em lote de registros de sensor."""
+    component = component_repo.create(name="Sensor em Lote", type="Sensor")
+    base_time = datetime(2024, 3, 1, 8, 0)
+
+    readings = [
+        {
+            "sensor_id": component.id,
+            "timestamp": base_time + timedelta(minutes=i),
+            "soil_moisture": 40.0 + i,
+            "phosphorus_present": True,
+            "potassium_present": i % 2 == 0,
+            "soil_ph": 6.5,
+            "irrigation_status": "DESLIGADA"
+        } for i in range(25)
+    ]
+
+    inserted = sensor_record_repo.bulk_create(readings, batch_size=10)
+    assert inserted == 25
+
+    records = sensor_record_repo.get_by_sensor(component.id)
+    assert len(records) == 25
+    assert sensor_record_repo.get_latest_by_sensor(component.id).soil_moisture == 64.0
+
+    component_repo.delete(component.id)
+
+
+def test_sensor_record_bucketed_series(sensor_record_repo, component_repo, session):
+    """Testa a série agregada por bucket de tempo dos registros de sensor."""
+    component = component_repo.create(name="Sensor Agregado", type="Sensor")
+    base_time = datetime(2024, 3, 1, 8, 0)
+    sensor_record_repo.bulk_create([
+        {
+            "sensor_id": component.id,
+            "timestamp": base_time + timedelta(minutes=20 * i),
+            "soil_moisture": float(i),
+            "phosphorus_present": True,
+            "potassium_present": True,
+            "soil_ph": 6.0
+        } for i in range(6)
+    ])
+
+    series = sensor_record_repo.get_bucketed_series('1h', sensor_id=component.id)
+    assert [point['count'] for point in series] == [3, 3]
+    assert series[0]['soil_moisture_min'] == 0.0
+    assert series[0]['soil_moisture_max'] == 2.0
+    assert series[1]['soil_moisture_avg'] == pytest.approx(4.0)
+
+    with pytest.raises(ValueError):
+        sensor_record_repo.get_bucketed_series('5min')
+
+    component_repo.delete(component.id)
+
+
+def test_sensor_record_keyset_pagination(sensor_record_repo, component_repo, session):
+    """Testa a paginação por chave e a leitura em streaming."""
+    component = component_repo.create(name="Sensor Paginado", type="Sensor")
+    base_time = datetime(2024, 3, 1, 8, 0)
+    # Pares de leituras com o mesmo timestamp exercitam o desempate por id
+    sensor_record_repo.bulk_create([
+        {
+            "sensor_id": component.id,
+            "timestamp": base_time + timedelta(minutes=i // 2),
+            "soil_moisture": 45.0,
+            "phosphorus_present": True,
+            "potassium_present": True,
+            "soil_ph": 6.5
+        } for i in range(11)
+    ])
+
+    seen = []
+    last = None
+    while True:
+        page = sensor_record_repo.get_page(
+            after_timestamp=last.timestamp if last else None,
+            after_id=last.id if last else None,
+            limit=3,
+            sensor_id=component.id
+        )
+        if not page:
+            break
+        seen.extend(record.id for record in page)
+        last = page[-1]
+
+    assert len(seen) == 11
+    assert len(set(seen)) == 11
+
+    streamed = list(sensor_record_repo.iter_by_date_range(base_time, base_time + timedelta(hours=1), chunk_size=4))
+    assert [record.id for record in streamed if record.sensor_id == component.id] == seen
+
+    component_repo.delete(component.id)
+
+
+def test_sensor_record_recent_ids_follow_filters(sensor_record_repo, component_repo, session):
+    """Testa os ids oferecidos para edição: filtrados por sensor e período, mais recentes primeiro e limitados."""
+    sensors = [component_repo.create(name=f"Sensor Edição {i}", type="Sensor") for i in range(2)]
+    base_time = datetime(2024, 3, 5, 8, 0)
+    sensor_record_repo.bulk_create([
+        {
+            "id": f"edicao-{n}-{i}",
+            "sensor_id": sensor.id,
+            "timestamp": base_time + timedelta(hours=i),
+            "soil_moisture": 45.0,
+            "phosphorus_present": True,
+            "potassium_present": True,
+            "soil_ph": 6.5
+        } for n, sensor in enumerate(sensors) for i in range(6)
+    ])
+
+    ids = sensor_record_repo.get_recent_ids(base_time + timedelta(hours=1), base_time + timedelta(hours=4),
+                                            sensors[0].id, limit=3)
+    assert ids == ["edicao-0-4", "edicao-0-3", "edicao-0-2"]
+    assert len(sensor_record_repo.get_recent_ids(sensor_id=[sensor.id for sensor in sensors])) == 12
+
+    for sensor in sensors:
+        component_repo.delete(sensor.id)
+
+def test_sensor_record_row_projections(sensor_record_repo, component_repo, session):
+    """Testa as leituras em colunas (dicts simples e DataFrame tipado)."""
+    component = component_repo.create(name="Sensor Projeção", type="Sensor")
+    base_time = datetime(2024, 3, 3, 8, 0)
+    sensor_record_repo.bulk_create(
+        {
+            "sensor_id": component.id,
+            "timestamp": base_time + timedelta(minutes=i),
+            "soil_moisture": 30.0 + i,
+            "phosphorus_present": True,
+            "potassium_present": i % 2 == 0,
+            "soil_ph": 6.0
+        } for i in range(5)
+    )
+
+    rows = sensor_record_repo.get_rows_by_sensor(component.id)
+    assert len(rows) == 5
+    assert set(rows[0]) == {column.key for column in SensorRecord.__table__.columns}
+    assert all(type(row) is dict for row in rows)
+
+    frame = sensor_record_repo.read_frame(["timestamp", "soil_moisture", "potassium_present"], sensor_id=component.id)
+    assert str(frame["timestamp"].dtype) == "datetime64[ns]"
+    assert str(frame["soil_moisture"].dtype) == "float64"
+    assert str(frame["potassium_present"].dtype) == "bool"
+    assert frame["soil_moisture"].tolist() == [30.0, 31.0, 32.0, 33.0, 34.0]
+
+    component_repo.delete(component.id)
+
+
+def test_choose_bucket_and_merge_series():
+    """Testa a escolha automática do bucket e a união de séries de camadas diferentes."""
+    start = datetime(2024, 1, 1)
+    assert choose_bucket(start, start + timedelta(hours=2), 500) == '1min'
+    assert choose_bucket(start, start + timedelta(days=30), 1000) == '1h'
+    assert choose_bucket(start, start + timedelta(days=365), 1000) == '1d'
+    assert choose_bucket(start, start + timedelta(days=5000), 1000) == '1d'
+
+    bucket = datetime(2024, 1, 1, 8)
+    cold = [{'bucket': bucket, 'count': 1, 'x_min': 1.0, 'x_max': 1.0, 'x_avg': 1.0}]
+    hot = [{'bucket': bucket, 'count': 3, 'x_min': 2.0, 'x_max': 6.0, 'x_avg': 4.0},
+           {'bucket': bucket + timedelta(hours=1), 'count': 1, 'x_min': 5.0, 'x_max': 5.0, 'x_avg': 5.0}]
+    merged = merge_series(['x'], cold, hot)
+    assert merged[0] == {'bucket': bucket, 'count': 4, 'x_min': 1.0, 'x_max': 6.0, 'x_avg': 3.25}
+    assert merged[1]['count'] == 1
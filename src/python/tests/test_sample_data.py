@@ -0,0 +1,28 @@
+from datetime import datetime
+
+import numpy as np
+
+from services.sample_data import reading_timestamps, simulate_climate, simulate_sensor_readings
+
+
+def test_simulation_is_seeded_and_shaped_per_sensor():
+    """A mesma semente gera os mesmos dados, com uma leitura por sensor em cada instante."""
+    def simulate(seed):
+        rng = np.random.default_rng(seed)
+        timestamps = reading_timestamps(datetime(2024, 1, 1), 2, 60, rng)
+        climate = simulate_climate(timestamps, rng)
+        return climate, simulate_sensor_readings(climate, ["s1", "s2", "s3"], rng)
+
+    climate, readings = simulate(42)
+    climate_again, readings_again = simulate(42)
+
+    assert len(climate) == 48
+    assert len(readings) == 48 * 3
+    assert readings['sensor_id'].tolist()[:4] == ["s1", "s2", "s3", "s1"]
+    assert (readings.groupby('timestamp').size() == 3).all()
+    assert climate.equals(climate_again)
+    assert readings.drop(columns='id').equals(readings_again.drop(columns='id'))
+    assert climate['temperature'].between(17, 35).all()
+    assert readings['soil_moisture'].between(10, 90).all()
+    assert not readings.loc[readings['timestamp'].isin(climate.loc[climate['rain_forecast'], 'timestamp']),
+                            'irrigation_status'].eq("ATIVADA").any()
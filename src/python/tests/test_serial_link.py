@@ -0,0 +1,139 @@
+import os
+import threading
+import time
+
+import pytest
+
+from services.serial_link import SerialLink, SerialLinkManager, parse_ports, parse_reading
+
+READING_LINE = "Umidade: 45.30% | Fosforo: Presente | Potassio: Ausente | pH: 6.5\n"
+
+
+@pytest.fixture
+def fake_device():
+    """Fixture com um pseudo-terminal: o lado mestre faz o papel do ESP32."""
+    master, slave = os.openpty()
+    yield master, os.ttyname(slave)
+    os.close(master)
+    os.close(slave)
+
+
+def read_lines(fd, count, timeout=3.0):
+    data = b""
+    deadline = time.monotonic() + timeout
+    while data.count(b"\n") < count and time.monotonic() < deadline:
+        data += os.read(fd, 256)
+    return data.decode().splitlines()
+
+
+def wait_connected(link, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not link.connected and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return link.connected
+
+
+def test_parse_reading():
+    assert parse_reading(READING_LINE) == {
+        "soil_moisture": 45.3,
+        "phosphorus_present": True,
+        "potassium_present": False,
+        "soil_ph": 6.5
+    }
+    assert parse_reading("Irrigação: ATIVADA") is None
+    assert parse_ports("/dev/ttyUSB0=abc, /dev/ttyUSB1") == {"/dev/ttyUSB0": "abc", "/dev/ttyUSB1": None}
+
+
+def test_link_writes_queued_lines_over_one_connection(fake_device):
+    master, port = fake_device
+    with SerialLink(port) as link:
+        link.send('{"temperature": 22.5}')
+        link.send('{"temperature": 23.0}')
+        assert link.flush()
+        assert read_lines(master, 2) == ['{"temperature": 22.5}', '{"temperature": 23.0}']
+        assert link.reconnects == 0
+
+
+def test_link_drops_oldest_write_when_queue_is_full(fake_device):
+    """Com a fila cheia a mensagem mais antiga é descartada e o flush continua funcionando."""
+    master, port = fake_device
+    link = SerialLink(port, queue_size=2)
+    for i in range(3):
+        assert link.send(f'{{"temperature": {i}}}')
+    assert link.dropped_writes == 1
+    # Só as duas mensagens ainda na fila contam como pendentes
+    assert link._writes.unfinished_tasks == 2
+
+    with link:
+        start = time.monotonic()
+        assert link.flush(timeout=2)
+        assert time.monotonic() - start < 1
+        assert link._writes.unfinished_tasks == 0
+        assert read_lines(master, 2) == ['{"temperature": 1}', '{"temperature": 2}']
+
+
+def test_link_parses_readings_from_device(fake_device):
+    master, port = fake_device
+    received = []
+    done = threading.Event()
+
+    def on_reading(reading):
+        received.append(reading)
+        done.set()
+
+    manager = SerialLinkManager(on_reading=on_reading)
+    link = manager.add(port, sensor_id="sensor-1")
+    try:
+        # A abertura da porta descarta o que chegou antes dela
+        assert wait_connected(link)
+        os.write(master, b"Sistema de irrigacao FarmTech inicializado\n" + READING_LINE.encode())
+        assert done.wait(3)
+    finally:
+        manager.stop()
+
+    assert received[0]["sensor_id"] == "sensor-1"
+    assert received[0]["soil_moisture"] == 45.3
+    assert received[0]["timestamp"] is not None
+
+
+def test_link_reconnects_when_port_appears(fake_device, tmp_path):
+    master, port = fake_device
+    alias = tmp_path / "ttyESP32"
+
+    with SerialLink(str(alias), reconnect_delay=0.05) as link:
+        link.send("ping")
+        time.sleep(0.2)
+        assert link.reconnects > 0 and not link.connected
+
+        alias.symlink_to(port)
+        assert link.flush()
+        assert read_lines(master, 1) == ["ping"]
+
+
+def test_manager_from_env_uses_default_sensor_id(fake_device, monkeypatch):
+    """A porta padrão (PORTA_SERIAL, sem "=sensor_id") usa SENSOR_ID; sem ele a ingestão não inicia."""
+    master, port = fake_device
+    received = []
+    done = threading.Event()
+
+    def on_reading(reading):
+        received.append(reading)
+        done.set()
+
+    monkeypatch.delenv("SERIAL_PORTS", raising=False)
+    monkeypatch.delenv("SENSOR_ID", raising=False)
+    with pytest.raises(ValueError):
+        SerialLinkManager.from_env(port, on_reading=on_reading)
+    writer = SerialLinkManager.from_env(port)
+    assert writer.links[port].sensor_id is None
+    writer.stop()
+
+    monkeypatch.setenv("SENSOR_ID", "sensor-padrao")
+    manager = SerialLinkManager.from_env(port, on_reading=on_reading)
+    try:
+        assert wait_connected(manager.links[port])
+        os.write(master, READING_LINE.encode())
+        assert done.wait(3)
+    finally:
+        manager.stop()
+    assert received[0]["sensor_id"] == "sensor-padrao"
@@ -0,0 +1,83 @@
+import re
+
+import pytest
+from sqlalchemy import func, inspect, select, text
+from sqlalchemy.orm import sessionmaker
+
+from database.backends import create_backend_engine
+from database.models import Base, ClimateData, Component, Crop, Producer, SensorRecord
+from database.oracle import ENGINE_CONFIG
+from database.seed import run_seed, seed_scale
+from database.setup import ensure_schema
+from database.utils import PARTITION_CLAUSE, PARTITIONED_TABLES, generate_ddl
+
+
+def test_ensure_schema_creates_only_missing_objects_and_keeps_data(tmp_path):
+    """Cria tabelas e índices ausentes sem apagar dados e não faz nada na segunda execução."""
+    engine = create_backend_engine(f"sqlite:///{tmp_path / 'farm.db'}", ENGINE_CONFIG)
+    Producer.__table__.create(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(Producer(name="João", email="joao@email.com", phone="(11) 99999-9999"))
+    session.commit()
+
+    created = ensure_schema(engine)
+    assert Producer.__tablename__ not in created['tables']
+    assert set(created['tables']) == set(Base.metadata.tables) - {Producer.__tablename__}
+    assert session.query(Producer).count() == 1
+
+    # Índice novo em tabela existente (o create_all não cria)
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_sensor_rec_ts_id"))
+    assert ensure_schema(engine) == {'tables': [], 'indexes': ['ix_sensor_rec_ts_id'], 'sequences': []}
+    assert ensure_schema(engine) == {'tables': [], 'indexes': [], 'sequences': []}
+    assert {index["name"] for index in inspect(engine).get_indexes("sensor_records")} == \
+        {index.name for index in SensorRecord.__table__.indexes}
+    session.close()
+    engine.dispose()
+
+
+def test_seed_scale_bulk_loads_volumes_and_demo_seed_is_skipped(tmp_path):
+    """A carga em escala gera as quantidades pedidas e a seed de demonstração não duplica dados."""
+    engine = create_backend_engine(f"sqlite:///{tmp_path / 'farm.db'}", ENGINE_CONFIG)
+    ensure_schema(engine)
+    session = sessionmaker(bind=engine)()
+
+    assert run_seed(session) is True
+    assert run_seed(session) is False
+    stats = seed_scale(session, producers=3, crops_per_producer=2, sensors_per_crop=2,
+                       actuators_per_crop=1, days=2, interval_minutes=60, seed=1)
+
+    def count(model, *filters):
+        return session.execute(select(func.count()).select_from(model.__table__).where(*filters)).scalar()
+
+    assert stats['producers'] == 3 and stats['crops'] == 6 and stats['components'] == 18
+    assert stats['sensor_records'] == 12 * 48
+    assert stats['climate_records'] == 48
+    assert count(Producer) == 2 + 3
+    assert count(Crop) == 2 + 6
+    assert count(Component, Component.type == 'Sensor') == 6 + 12
+    assert count(SensorRecord) == 4 + 12 * 48
+    assert count(ClimateData) == 4 + 48
+    session.close()
+    engine.dispose()
+
+
+@pytest.mark.parametrize("partition_by_month", [False, True])
+def test_oracle_ddl_partitions_time_series_tables(tmp_path, partition_by_month):
+    """DDL Oracle: particionamento mensal e índices LOCAL só nas tabelas de séries temporais."""
+    generate_ddl(str(tmp_path), partition_by_month=partition_by_month)
+    statements = [statement.strip() for statement in (tmp_path / "schema.ddl").read_text(encoding="utf-8").split(";")
+                  if statement.strip()]
+
+    tables = {re.match(r"CREATE TABLE (\w+)", s).group(1): s for s in statements if s.startswith("CREATE TABLE")}
+    assert set(tables) == set(Base.metadata.tables)
+    for name, statement in tables.items():
+        partitioned = partition_by_month and name in PARTITIONED_TABLES
+        assert statement.endswith(PARTITION_CLAUSE) == partitioned
+        assert ("PARTITION BY RANGE" in statement) == partitioned
+
+    indexes = [s for s in statements if s.startswith("CREATE INDEX")]
+    assert {re.search(r" ON (\w+)", s).group(1) for s in indexes} >= set(PARTITIONED_TABLES)
+    for statement in indexes:
+        table = re.search(r" ON (\w+)", statement).group(1)
+        assert statement.endswith(" LOCAL") == (partition_by_month and table in PARTITIONED_TABLES)
@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta, timezone
+
+from services.component_service import ComponentService
+from services.sensor_service import SensorRecordService
+from services.state_cache import LatestStateCache, data_versions
+
+
+def test_latest_state_cache_falls_back_once_and_tracks_writes():
+    cache = LatestStateCache(ttl=60)
+    calls = []
+    base_time = datetime(2024, 3, 1, 8, 0)
+
+    def load():
+        calls.append(1)
+        return {'id': 'r1', 'timestamp': base_time}
+
+    assert cache.get('sensor', load)['id'] == 'r1'
+    assert cache.get('sensor', load)['id'] == 'r1'
+    assert len(calls) == 1
+
+    # Leitura retroativa não substitui a mais recente
+    cache.offer('sensor', {'id': 'r0', 'timestamp': base_time - timedelta(hours=1)})
+    assert cache.get('sensor', load)['id'] == 'r1'
+
+    # Timestamps com fuso são comparados em UTC
+    cache.offer('sensor', {'id': 'r2', 'timestamp': (base_time + timedelta(minutes=1)).replace(tzinfo=timezone.utc)})
+    assert cache.get('sensor', load)['id'] == 'r2'
+
+    cache.evict_record('r2')
+    assert cache.get('sensor', load)['id'] == 'r1'
+    assert len(calls) == 2
+
+
+def test_latest_state_cache_ignores_writes_before_first_load():
+    cache = LatestStateCache(ttl=60)
+    cache.offer('sensor', {'id': 'old', 'timestamp': datetime(2020, 1, 1)})
+
+    assert cache.get('sensor', lambda: {'id': 'db', 'timestamp': datetime(2024, 1, 1)})['id'] == 'db'
+
+
+def test_latest_state_cache_expires_entries():
+    cache = LatestStateCache(ttl=0)
+    values = iter(['a', 'b'])
+
+    assert cache.get('climate', lambda: {'id': next(values)})['id'] == 'a'
+    assert cache.get('climate', lambda: {'id': next(values)})['id'] == 'b'
+
+
+def test_service_writes_bump_data_versions(session):
+    components = ComponentService(session)
+    records = SensorRecordService(session)
+    component_version = data_versions.get('components')
+    sensor_version = data_versions.get('sensor_records')
+
+    components.create_component({'name': 'Sensor Versão', 'type': 'Sensor'})
+    sensor = next(row for row in components.list_components() if row['name'] == 'Sensor Versão')
+    assert data_versions.get('components') == component_version + 1
+    assert data_versions.get('sensor_records') == sensor_version
+
+    records.bulk_create_sensor_records([{
+        'sensor_id': sensor['id'], 'soil_moisture': 40.0, 'soil_ph': 6.5,
+        'phosphorus_present': True, 'potassium_present': True
+    }])
+    assert data_versions.get('sensor_records') == sensor_version + 1
+
+    # A exclusão do sensor remove as leituras em cascata
+    components.delete_component(sensor['id'])
+    assert data_versions.get('components') == component_version + 2
+    assert data_versions.get('sensor_records') == sensor_version + 2
@@ -0,0 +1,113 @@
+import json
+import shutil
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from services import weather_service
+from services.weather_service import WeatherFetcher
+
+LOCAL_CLIMATE_FILE = Path(__file__).resolve().parents[2] / "climate.json"
+LATENCY = 0.2
+
+
+class FakeOpenWeather(BaseHTTPRequestHandler):
+    """Servidor local que imita a API do OpenWeather com latência fixa."""
+    requests_by_city = {}
+    failures_before_success = 0
+
+    def do_GET(self):
+        city = parse_qs(urlparse(self.path).query)["q"][0]
+        count = self.requests_by_city[city] = self.requests_by_city.get(city, 0) + 1
+        time.sleep(LATENCY)
+        if count <= self.failures_before_success:
+            self.send_response(503)
+            self.end_headers()
+            return
+        body = json.dumps({"main": {"temp": 20.0 + len(city), "humidity": 60}, "name": city}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api_url():
+    """Fixture que sobe a API falsa e retorna a URL."""
+    FakeOpenWeather.requests_by_city = {}
+    FakeOpenWeather.failures_before_success = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOpenWeather)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/weather"
+    server.shutdown()
+
+
+def test_fetch_many_runs_concurrently(api_url):
+    """Testa que N cidades custam aproximadamente uma latência."""
+    cities = [f"Cidade {i}" for i in range(8)]
+    fetcher = WeatherFetcher(api_key="teste", url=api_url, backoff=0)
+
+    start = time.perf_counter()
+    results = fetcher.fetch_many(cities)
+    elapsed = time.perf_counter() - start
+
+    assert set(results) == set(cities)
+    assert results["Cidade 1"] == {"temperature": 28.0, "air_humidity": 60, "rain_forecast": False}
+    assert elapsed < LATENCY * 3
+
+
+def test_fetch_retries_and_caches_by_city(api_url):
+    """Testa novas tentativas em erro 503 e o cache em memória por cidade."""
+    FakeOpenWeather.failures_before_success = 1
+    fetcher = WeatherFetcher(api_key="teste", url=api_url, backoff=0, ttl=60)
+
+    assert fetcher.fetch("Campinas") is not None
+    assert fetcher.fetch("Campinas") is not None
+    assert FakeOpenWeather.requests_by_city["Campinas"] == 2  # uma falha + um sucesso, depois cache
+
+
+def test_disk_cache_survives_new_fetcher(api_url, tmp_path):
+    """Testa o cache em disco usando o climate.json local como ponto de partida."""
+    cache_file = tmp_path / "climate.json"
+    shutil.copy(LOCAL_CLIMATE_FILE, cache_file)
+
+    first = WeatherFetcher(api_key="teste", url=api_url, cache_file=str(cache_file))
+    data = first.fetch("Piracicaba")
+
+    second = WeatherFetcher(api_key="teste", url="http://127.0.0.1:9/indisponivel", cache_file=str(cache_file))
+    assert second.fetch("Piracicaba") == data
+    assert FakeOpenWeather.requests_by_city["Piracicaba"] == 1
+
+
+def test_integration_fetches_only_the_saved_city(api_url, monkeypatch):
+    """A integração busca, grava e envia apenas a cidade principal, mesmo com vários municípios configurados."""
+    saved, sent = [], []
+
+    class FakeClimateService:
+        def __init__(self, session):
+            pass
+
+        def create_climate_data(self, data):
+            saved.append(data)
+            return {"id": "clima-1", **data}
+
+    monkeypatch.setattr(weather_service, "API_KEY", "teste")
+    monkeypatch.setattr(weather_service, "CITY", None)
+    monkeypatch.setattr(weather_service, "CITIES", ["Campinas", "Piracicaba", "Limeira"])
+    monkeypatch.setattr(weather_service, "_fetcher", WeatherFetcher(api_key="teste", url=api_url, backoff=0))
+    monkeypatch.setattr(weather_service, "ClimateService", FakeClimateService)
+    monkeypatch.setattr(weather_service, "send_to_serial", sent.append)
+
+    weather_service.run_weather_integration()
+
+    assert FakeOpenWeather.requests_by_city == {"Campinas": 1}
+    assert saved == [{"temperature": 28.0, "air_humidity": 60, "rain_forecast": False}]
+    assert json.loads(sent[0]) == saved[0]